@@ -5,6 +5,7 @@ import tkinter as tk
 import webbrowser
 
 import pystray
+from kiln_ai.datamodel.parallel_load import freeze_support
 from PIL import Image
 
 # Unused, but needed for pyinstaller to not miss this import
@@ -86,6 +87,8 @@ def close_splash():
 
 
 if __name__ == "__main__":
+    # Must be first: spawned workers for parallel loads re-run this entry point in the frozen app
+    freeze_support()
     # run the server in a thread, and shut down server when main thread exits
     # use_colors=False to disable colored logs, as windows doesn't support them
     config = server_config()
@@ -7,6 +7,8 @@ import kiln_ai.datamodel.strict_mode as datamodel_strict_mode
 import kiln_server.server as kiln_server
 import uvicorn
 from fastapi import FastAPI
+from kiln_ai.datamodel.model_cache_snapshot import start_model_cache_snapshot
+from kiln_ai.datamodel.model_cache_watcher import start_model_cache_watcher
 
 from app.desktop.log_config import log_config
 from app.desktop.studio_server.data_gen_api import connect_data_gen_api
@@ -24,7 +26,15 @@ async def lifespan(app: FastAPI):
     # Set datamodel strict mode on startup
     original_strict_mode = datamodel_strict_mode.strict_mode()
     datamodel_strict_mode.set_strict_mode(True)
+    # Optional file watcher for cache invalidation, if enabled in settings
+    model_cache_watcher = start_model_cache_watcher()
+    # Optional snapshot of the model cache, so restarts don't start cold. Saved periodically, and on shutdown.
+    model_cache_snapshot = start_model_cache_snapshot()
     yield
+    if model_cache_snapshot is not None:
+        model_cache_snapshot.stop()
+    if model_cache_watcher is not None:
+        model_cache_watcher.stop()
     # Reset datamodel strict mode on shutdown
     datamodel_strict_mode.set_strict_mode(original_strict_mode)
 
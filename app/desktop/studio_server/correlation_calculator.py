@@ -2,8 +2,6 @@ import math
 from dataclasses import dataclass
 from typing import List
 
-from scipy import stats
-
 
 @dataclass
 class CorrelationScore:
@@ -72,6 +70,8 @@ class CorrelationCalculator:
         return total_normalized_squared_error / len(self.scores)
 
     def calculate_spearman_correlation(self) -> float | None:
+        from scipy import stats
+
         if len(self.scores) < 2:
             # If there is only one pair, no correlation
             return None
@@ -86,6 +86,8 @@ class CorrelationCalculator:
         return correlation
 
     def calculate_pearson_correlation(self) -> float | None:
+        from scipy import stats
+
         if len(self.scores) < 2:
             # If there is only one pair,  no correlation
             return None
@@ -98,6 +100,8 @@ class CorrelationCalculator:
         return result.correlation
 
     def calculate_kendalltau_correlation(self) -> float | None:
+        from scipy import stats
+
         if len(self.scores) < 2:
             # If there is only one pair, no correlation
             return None
@@ -162,7 +162,7 @@ def connect_data_gen_api(app: FastAPI):
             ),
         )
 
-        run.save_to_file()
+        await run.save_to_file_async()
         return run
 
 
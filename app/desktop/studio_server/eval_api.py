@@ -15,7 +15,12 @@ from kiln_ai.datamodel import (
     TaskRun,
 )
 from kiln_ai.datamodel.basemodel import ID_TYPE
-from kiln_ai.datamodel.dataset_filters import DatasetFilterId, dataset_filter_from_id
+from kiln_ai.datamodel.blocking_io import blocking_handler, run_blocking
+from kiln_ai.datamodel.dataset_filters import (
+    DatasetFilterId,
+    dataset_filter_from_id,
+    filtered_run_ids,
+)
 from kiln_ai.datamodel.eval import (
     Eval,
     EvalConfig,
@@ -170,7 +175,7 @@ class UpdateEvalRequest(BaseModel):
 def dataset_ids_in_filter(task: Task, filter_id: DatasetFilterId) -> Set[ID_TYPE]:
     # Fetch all the dataset items IDs in a filter
     filter = dataset_filter_from_id(filter_id)
-    return {run.id for run in task.runs() if filter(run)}
+    return set(filtered_run_ids(task.path, filter))
 
 
 def human_score_from_task_run(
@@ -229,7 +234,8 @@ def count_human_evals(
 
 def connect_evals_api(app: FastAPI):
     @app.post("/api/projects/{project_id}/tasks/{task_id}/create_evaluator")
-    async def create_evaluator(
+    @blocking_handler
+    def create_evaluator(
         project_id: str,
         task_id: str,
         request: CreateEvaluatorRequest,
@@ -248,18 +254,19 @@ def connect_evals_api(app: FastAPI):
         return eval
 
     @app.get("/api/projects/{project_id}/tasks/{task_id}/task_run_configs")
-    async def get_task_run_configs(
-        project_id: str, task_id: str
-    ) -> list[TaskRunConfig]:
+    @blocking_handler
+    def get_task_run_configs(project_id: str, task_id: str) -> list[TaskRunConfig]:
         task = task_from_id(project_id, task_id)
         return task.run_configs()
 
     @app.get("/api/projects/{project_id}/tasks/{task_id}/eval/{eval_id}")
-    async def get_eval(project_id: str, task_id: str, eval_id: str) -> Eval:
+    @blocking_handler
+    def get_eval(project_id: str, task_id: str, eval_id: str) -> Eval:
         return eval_from_id(project_id, task_id, eval_id)
 
     @app.patch("/api/projects/{project_id}/tasks/{task_id}/eval/{eval_id}")
-    async def update_eval(
+    @blocking_handler
+    def update_eval(
         project_id: str, task_id: str, eval_id: str, request: UpdateEvalRequest
     ) -> Eval:
         eval = eval_from_id(project_id, task_id, eval_id)
@@ -269,17 +276,20 @@ def connect_evals_api(app: FastAPI):
         return eval
 
     @app.delete("/api/projects/{project_id}/tasks/{task_id}/eval/{eval_id}")
-    async def delete_eval(project_id: str, task_id: str, eval_id: str) -> None:
+    @blocking_handler
+    def delete_eval(project_id: str, task_id: str, eval_id: str) -> None:
         eval = eval_from_id(project_id, task_id, eval_id)
         eval.delete()
 
     @app.get("/api/projects/{project_id}/tasks/{task_id}/evals")
-    async def get_evals(project_id: str, task_id: str) -> list[Eval]:
+    @blocking_handler
+    def get_evals(project_id: str, task_id: str) -> list[Eval]:
         task = task_from_id(project_id, task_id)
         return task.evals()
 
     @app.get("/api/projects/{project_id}/tasks/{task_id}/eval/{eval_id}/eval_configs")
-    async def get_eval_configs(
+    @blocking_handler
+    def get_eval_configs(
         project_id: str, task_id: str, eval_id: str
     ) -> list[EvalConfig]:
         eval = eval_from_id(project_id, task_id, eval_id)
@@ -288,14 +298,16 @@ def connect_evals_api(app: FastAPI):
     @app.get(
         "/api/projects/{project_id}/tasks/{task_id}/eval/{eval_id}/eval_config/{eval_config_id}"
     )
-    async def get_eval_config(
+    @blocking_handler
+    def get_eval_config(
         project_id: str, task_id: str, eval_id: str, eval_config_id: str
     ) -> EvalConfig:
         eval_config = eval_config_from_id(project_id, task_id, eval_id, eval_config_id)
         return eval_config
 
     @app.post("/api/projects/{project_id}/tasks/{task_id}/task_run_config")
-    async def create_task_run_config(
+    @blocking_handler
+    def create_task_run_config(
         project_id: str,
         task_id: str,
         request: CreateTaskRunConfigRequest,
@@ -346,7 +358,8 @@ def connect_evals_api(app: FastAPI):
     @app.post(
         "/api/projects/{project_id}/tasks/{task_id}/eval/{eval_id}/create_eval_config"
     )
-    async def create_eval_config(
+    @blocking_handler
+    def create_eval_config(
         project_id: str,
         task_id: str,
         eval_id: str,
@@ -378,12 +391,15 @@ def connect_evals_api(app: FastAPI):
         run_config_ids: list[str] = Query([]),
         all_run_configs: bool = Query(False),
     ) -> StreamingResponse:
-        eval_config = eval_config_from_id(project_id, task_id, eval_id, eval_config_id)
+        eval_config = await run_blocking(
+            eval_config_from_id, project_id, task_id, eval_id, eval_config_id
+        )
 
         # Load the list of run configs to use. Two options:
         run_configs: list[TaskRunConfig] = []
         if all_run_configs:
-            run_configs = task_from_id(project_id, task_id).run_configs()
+            task = await run_blocking(task_from_id, project_id, task_id)
+            run_configs = await run_blocking(task.run_configs)
         else:
             if len(run_config_ids) == 0:
                 raise HTTPException(
@@ -406,7 +422,8 @@ def connect_evals_api(app: FastAPI):
     @app.post(
         "/api/projects/{project_id}/tasks/{task_id}/eval/{eval_id}/set_current_eval_config/{eval_config_id}"
     )
-    async def set_default_eval_config(
+    @blocking_handler
+    def set_default_eval_config(
         project_id: str,
         task_id: str,
         eval_id: str,
@@ -427,8 +444,8 @@ def connect_evals_api(app: FastAPI):
         task_id: str,
         eval_id: str,
     ) -> StreamingResponse:
-        eval = eval_from_id(project_id, task_id, eval_id)
-        eval_configs = eval.configs()
+        eval = await run_blocking(eval_from_id, project_id, task_id, eval_id)
+        eval_configs = await run_blocking(eval.configs)
         eval_runner = EvalRunner(
             eval_configs=eval_configs,
             run_configs=None,
@@ -440,7 +457,8 @@ def connect_evals_api(app: FastAPI):
     @app.get(
         "/api/projects/{project_id}/tasks/{task_id}/eval/{eval_id}/eval_config/{eval_config_id}/run_config/{run_config_id}/results"
     )
-    async def get_eval_run_results(
+    @blocking_handler
+    def get_eval_run_results(
         project_id: str,
         task_id: str,
         eval_id: str,
@@ -466,7 +484,8 @@ def connect_evals_api(app: FastAPI):
     @app.get(
         "/api/projects/{project_id}/tasks/{task_id}/eval/{eval_id}/eval_config/{eval_config_id}/score_summary"
     )
-    async def get_eval_config_score_summary(
+    @blocking_handler
+    def get_eval_config_score_summary(
         project_id: str,
         task_id: str,
         eval_id: str,
@@ -567,7 +586,8 @@ def connect_evals_api(app: FastAPI):
     @app.get(
         "/api/projects/{project_id}/tasks/{task_id}/eval/{eval_id}/eval_configs_score_summary"
     )
-    async def get_eval_configs_score_summary(
+    @blocking_handler
+    def get_eval_configs_score_summary(
         project_id: str,
         task_id: str,
         eval_id: str,
@@ -585,7 +605,9 @@ def connect_evals_api(app: FastAPI):
         # Build a set of all the dataset items IDs we expect to have scores for
         # Fetch all the dataset items in a filter, and return a map of dataset_id -> TaskRun
         filter = dataset_filter_from_id(eval.eval_configs_filter_id)
-        expected_dataset_items = {run.id: run for run in task.runs() if filter(run)}
+        expected_dataset_items = {
+            run.id: run for run in task.runs(readonly=True) if filter(run)
+        }
         expected_dataset_ids = set(expected_dataset_items.keys())
         if len(expected_dataset_ids) == 0:
             return EvalConfigCompareSummary(
@@ -24,6 +24,7 @@ from kiln_ai.datamodel import (
     FineTuneStatusType,
     Task,
 )
+from kiln_ai.datamodel.blocking_io import blocking_handler, run_blocking
 from kiln_ai.datamodel.dataset_filters import (
     DatasetFilterId,
 )
@@ -124,7 +125,8 @@ def finetune_from_id(project_id: str, task_id: str, finetune_id: str) -> Finetun
 
 def connect_fine_tune_api(app: FastAPI):
     @app.get("/api/projects/{project_id}/tasks/{task_id}/dataset_splits")
-    async def dataset_splits(project_id: str, task_id: str) -> list[DatasetSplit]:
+    @blocking_handler
+    def dataset_splits(project_id: str, task_id: str) -> list[DatasetSplit]:
         task = task_from_id(project_id, task_id)
         return task.dataset_splits()
 
@@ -132,8 +134,8 @@ def connect_fine_tune_api(app: FastAPI):
     async def finetunes(
         project_id: str, task_id: str, update_status: bool = False
     ) -> list[Finetune]:
-        task = task_from_id(project_id, task_id)
-        finetunes = task.finetunes()
+        task = await run_blocking(task_from_id, project_id, task_id)
+        finetunes = await run_blocking(task.finetunes)
 
         # Update the status of each finetune
         if update_status:
@@ -154,7 +156,9 @@ def connect_fine_tune_api(app: FastAPI):
     async def finetune(
         project_id: str, task_id: str, finetune_id: str
     ) -> FinetuneWithStatus:
-        finetune = finetune_from_id(project_id, task_id, finetune_id)
+        finetune = await run_blocking(
+            finetune_from_id, project_id, task_id, finetune_id
+        )
         if finetune.provider not in finetune_registry:
             raise HTTPException(
                 status_code=400,
@@ -165,7 +169,8 @@ def connect_fine_tune_api(app: FastAPI):
         return FinetuneWithStatus(finetune=finetune, status=status)
 
     @app.patch("/api/projects/{project_id}/tasks/{task_id}/finetunes/{finetune_id}")
-    async def update_finetune(
+    @blocking_handler
+    def update_finetune(
         project_id: str,
         task_id: str,
         finetune_id: str,
@@ -219,7 +224,8 @@ def connect_fine_tune_api(app: FastAPI):
         return finetune_adapter_class.available_parameters()
 
     @app.post("/api/projects/{project_id}/tasks/{task_id}/dataset_splits")
-    async def create_dataset_split(
+    @blocking_handler
+    def create_dataset_split(
         project_id: str, task_id: str, request: CreateDatasetSplitRequest
     ) -> DatasetSplit:
         task = task_from_id(project_id, task_id)
@@ -288,7 +294,8 @@ def connect_fine_tune_api(app: FastAPI):
         return finetune_model
 
     @app.get("/api/download_dataset_jsonl")
-    async def download_dataset_jsonl(
+    @blocking_handler
+    def download_dataset_jsonl(
         project_id: str,
         task_id: str,
         dataset_id: str,
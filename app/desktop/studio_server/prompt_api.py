@@ -1,6 +1,7 @@
 from fastapi import FastAPI, HTTPException
 from kiln_ai.adapters.prompt_builders import prompt_builder_from_id
 from kiln_ai.datamodel import PromptId
+from kiln_ai.datamodel.blocking_io import blocking_handler
 from kiln_server.task_api import task_from_id
 from pydantic import BaseModel
 
@@ -12,7 +13,8 @@ class PromptApiResponse(BaseModel):
 
 def connect_prompt_api(app: FastAPI):
     @app.get("/api/projects/{project_id}/task/{task_id}/gen_prompt/{prompt_id}")
-    async def generate_prompt(
+    @blocking_handler
+    def generate_prompt(
         project_id: str,
         task_id: str,
         prompt_id: PromptId,
@@ -4,8 +4,6 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
-import litellm
-import openai
 import requests
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
@@ -553,6 +551,8 @@ async def connect_gemini(key: str):
 
 
 async def connect_vertex(project_id: str, project_location: str):
+    import litellm
+
     try:
         await litellm.acompletion(
             model="vertex_ai/gemini-1.5-flash",
@@ -777,6 +777,8 @@ async def connect_azure_openai(key: str, endpoint: str):
 
 
 async def connect_bedrock(key_data: dict):
+    import litellm
+
     access_key = key_data.get("Access Key")
     secret_key = key_data.get("Secret Key")
     if (
@@ -997,6 +999,8 @@ def openai_compatible_providers() -> List[AvailableModels]:
 
 
 def openai_compatible_providers_load_cache() -> OpenAICompatibleProviderCache | None:
+    import openai
+
     provider_config = Config.shared().openai_compatible_providers
     if not provider_config or len(provider_config) == 0:
         return None
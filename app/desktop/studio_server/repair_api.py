@@ -2,6 +2,7 @@ from fastapi import FastAPI, HTTPException
 from kiln_ai.adapters.adapter_registry import adapter_for_task
 from kiln_ai.adapters.repair.repair_task import RepairTaskRun
 from kiln_ai.datamodel import TaskRun
+from kiln_ai.datamodel.blocking_io import blocking_handler
 from kiln_server.run_api import model_provider_from_string, task_and_run_from_id
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -69,7 +70,8 @@ def connect_repair_api(app: FastAPI):
         return repair_run
 
     @app.post("/api/projects/{project_id}/tasks/{task_id}/runs/{run_id}/repair")
-    async def post_repair_run(
+    @blocking_handler
+    def post_repair_run(
         project_id: str, task_id: str, run_id: str, input: RepairRunPost
     ) -> TaskRun:
         task, run = task_and_run_from_id(project_id, task_id, run_id)
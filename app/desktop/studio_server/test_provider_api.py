@@ -259,7 +259,7 @@ def mock_environ():
 
 
 @pytest.mark.asyncio
-@patch("app.desktop.studio_server.provider_api.litellm.acompletion")
+@patch("litellm.acompletion")
 async def test_connect_bedrock_success(mock_litellm_acompletion, mock_environ):
     mock_litellm_acompletion.side_effect = litellm.exceptions.BadRequestError(
         "msg", "model", "provider"
@@ -278,7 +278,7 @@ async def test_connect_bedrock_success(mock_litellm_acompletion, mock_environ):
 
 
 @pytest.mark.asyncio
-@patch("app.desktop.studio_server.provider_api.litellm.acompletion")
+@patch("litellm.acompletion")
 async def test_connect_bedrock_invalid_credentials(
     mock_litellm_acompletion, mock_environ
 ):
@@ -302,7 +302,7 @@ async def test_connect_bedrock_invalid_credentials(
 
 
 @pytest.mark.asyncio
-@patch("app.desktop.studio_server.provider_api.litellm.acompletion")
+@patch("litellm.acompletion")
 async def test_connect_bedrock_unknown_error(mock_litellm_acompletion, mock_environ):
     mock_litellm_acompletion.side_effect = Exception("Some unexpected error")
 
@@ -1912,7 +1912,7 @@ async def test_connect_huggingface_non_401_response(
 
 
 @pytest.mark.asyncio
-@patch("app.desktop.studio_server.provider_api.litellm.acompletion")
+@patch("litellm.acompletion")
 @patch("app.desktop.studio_server.provider_api.Config.shared")
 async def test_connect_vertex_success(mock_config_shared, mock_litellm_acompletion):
     # Setup
@@ -1938,7 +1938,7 @@ async def test_connect_vertex_success(mock_config_shared, mock_litellm_acompleti
 
 
 @pytest.mark.asyncio
-@patch("app.desktop.studio_server.provider_api.litellm.acompletion")
+@patch("litellm.acompletion")
 @patch("app.desktop.studio_server.provider_api.Config.shared")
 async def test_connect_vertex_failure(mock_config_shared, mock_litellm_acompletion):
     # Setup
@@ -39,6 +39,18 @@ def test_strict_mode(client):
     assert strict_mode()
 
 
+def test_lifespan_starts_and_stops_model_cache_watcher():
+    mock_watcher = MagicMock()
+    with patch(
+        "app.desktop.desktop_server.start_model_cache_watcher",
+        return_value=mock_watcher,
+    ) as mock_start:
+        with TestClient(make_app()):
+            mock_start.assert_called_once()
+            mock_watcher.stop.assert_not_called()
+    mock_watcher.stop.assert_called_once()
+
+
 def test_connect_ollama_success(client):
     with patch("requests.get") as mock_get:
         # Set up mock to return different values on consecutive calls
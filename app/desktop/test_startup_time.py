@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from kiln_ai.utils.import_time import measure_import_time
+
+# Budget for importing the desktop server and building the app, in seconds of total import time. Generous for slow CI machines, but well below the cost of importing the provider SDKs up front.
+DESKTOP_SERVER_IMPORT_BUDGET = 4.0
+
+# Heavy dependencies which must only be imported on first use (e.g. when connecting a provider, or running an eval)
+LAZY_MODULES = ["litellm", "openai", "together", "scipy"]
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+
+def test_desktop_server_import_time_budget():
+    report = measure_import_time(
+        "from app.desktop.desktop_server import make_app; make_app()",
+        cwd=REPO_ROOT,
+    )
+    print(f"\ndesktop_server.make_app()\n{report.summary()}")
+
+    lazy_imported = [m for m in LAZY_MODULES if m in report.modules]
+    assert lazy_imported == [], (
+        f"Starting the desktop server should not import {lazy_imported}. Import them on first use instead."
+    )
+    assert report.total_seconds < DESKTOP_SERVER_IMPORT_BUDGET, (
+        f"Desktop server startup over budget ({DESKTOP_SERVER_IMPORT_BUDGET}s)\n{report.summary()}"
+    )
@@ -44,6 +44,12 @@ def pytest_addoption(parser):
         default=False,
         help="run tests that use ollama server",
     )
+    parser.addoption(
+        "--runlarge",
+        action="store_true",
+        default=False,
+        help="run large benchmarks (writes up to hundreds of thousands of files)",
+    )
 
 
 def is_single_manual_test(config, items) -> bool:
@@ -83,3 +89,10 @@ def pytest_collection_modifyitems(config, items):
         for item in items:
             if "ollama" in item.keywords:
                 item.add_marker(skip_ollama)
+
+    # Mark large benchmarks as skipped unless --runlarge is passed
+    if not config.getoption("--runlarge"):
+        skip_large = pytest.mark.skip(reason="need --runlarge option to run")
+        for item in items:
+            if "large_benchmark" in item.keywords:
+                item.add_marker(skip_large)
@@ -105,7 +105,7 @@ class EvalRunner:
         already_run: Dict[ID_TYPE, Set[ID_TYPE]] = {}
         for eval_config in self.eval_configs:
             already_run[eval_config.id] = set()
-            for run in eval_config.runs(readonly=True):
+            for run in eval_config.iter_runs(readonly=True):
                 already_run[eval_config.id].add(run.dataset_id)
 
         return [
@@ -114,8 +114,7 @@ class EvalRunner:
                 eval_config=eval_config,
                 type="eval_config_eval",
             )
-            for task_run in self.task.runs(readonly=True)
-            if filter(task_run)
+            for task_run in self.task.iter_runs(readonly=True, filter=filter)
             for eval_config in self.eval_configs
             if task_run.id not in already_run[eval_config.id]
         ]
@@ -138,7 +137,7 @@ class EvalRunner:
             already_run[eval_config.id] = {}
             for run_config in self.run_configs or []:
                 already_run[eval_config.id][run_config.id] = set()
-            for run in eval_config.runs(readonly=True):
+            for run in eval_config.iter_runs(readonly=True):
                 if (
                     run.task_run_config_id is not None
                     and run.task_run_config_id in already_run[eval_config.id]
@@ -154,8 +153,7 @@ class EvalRunner:
                 type="task_run_eval",
                 eval_config=eval_config,
             )
-            for task_run in self.task.runs(readonly=True)
-            if filter(task_run)
+            for task_run in self.task.iter_runs(readonly=True, filter=filter)
             for eval_config in self.eval_configs
             for run_config in self.run_configs or []
             if task_run.id not in already_run[eval_config.id][run_config.id]
@@ -262,7 +260,7 @@ class EvalRunner:
                 output=task_output,
                 intermediate_outputs=intermediate_outputs,
             )
-            eval_run.save_to_file()
+            await eval_run.save_to_file_async()
 
             return True
         except Exception as e:
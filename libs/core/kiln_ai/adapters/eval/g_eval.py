@@ -1,7 +1,5 @@
 import math
-from typing import Dict, List, Tuple
-
-from litellm.types.utils import ChatCompletionTokenLogprob
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 from kiln_ai.adapters.adapter_registry import adapter_for_task
 from kiln_ai.adapters.eval.base_eval import BaseEval
@@ -11,6 +9,9 @@ from kiln_ai.datamodel import Project, Task, TaskRun
 from kiln_ai.datamodel.eval import EvalConfig, EvalConfigType, EvalScores
 from kiln_ai.datamodel.task import RunConfig
 
+if TYPE_CHECKING:
+    from litellm.types.utils import ChatCompletionTokenLogprob
+
 # all the tokens we score for, and their float scores.
 TOKEN_TO_SCORE_MAP: Dict[str, float] = {
     "1": 1.0,
@@ -281,7 +282,7 @@ The model produced the following output for the task:
         return start_offset, end_offset
 
     def rating_token_to_score(
-        self, token_logprob: ChatCompletionTokenLogprob
+        self, token_logprob: "ChatCompletionTokenLogprob"
     ) -> float | None:
         """
         Convert a rating token to a score using weighted average of top logprobs.
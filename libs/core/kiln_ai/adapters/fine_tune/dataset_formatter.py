@@ -406,7 +406,7 @@ class DatasetFormatter:
             / f"{self.dataset.name} -- split-{split_name} -- format-{format_type.value} -- {'cot' if include_cot else 'no-cot'}.jsonl"
         )
 
-        runs = self.task.runs()
+        runs = self.task.runs(readonly=True)
         runs_by_id = {run.id: run for run in runs}
 
         # Generate formatted output with UTF-8 encoding
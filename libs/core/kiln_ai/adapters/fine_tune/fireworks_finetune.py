@@ -1,8 +1,6 @@
 from typing import Tuple
 from uuid import uuid4
 
-import httpx
-
 from kiln_ai.adapters.fine_tune.base_finetune import (
     BaseFinetuneAdapter,
     FineTuneParameter,
@@ -36,6 +34,8 @@ class FireworksFinetune(BaseFinetuneAdapter):
         return status
 
     async def _status(self) -> Tuple[FineTuneStatus, str | None]:
+        import httpx
+
         try:
             api_key = Config.shared().fireworks_api_key
             account_id = Config.shared().fireworks_account_id
@@ -105,6 +105,8 @@ class FireworksFinetune(BaseFinetuneAdapter):
             ), None
 
     async def _start(self, dataset: DatasetSplit) -> None:
+        import httpx
+
         task = self.datamodel.parent_task()
         if not task:
             raise ValueError("Task is required to start a fine-tune")
@@ -176,6 +178,8 @@ class FireworksFinetune(BaseFinetuneAdapter):
     async def generate_and_upload_jsonl(
         self, dataset: DatasetSplit, split_name: str, task: Task, format: DatasetFormat
     ) -> str:
+        import httpx
+
         formatter = DatasetFormatter(
             dataset=dataset,
             system_message=self.datamodel.system_message,
@@ -283,6 +287,8 @@ class FireworksFinetune(BaseFinetuneAdapter):
         return {k: v for k, v in payload.items() if v is not None}
 
     async def _deploy(self) -> bool:
+        import httpx
+
         # Now we "deploy" the model using PEFT serverless.
         # A bit complicated: most fireworks deploys are server based.
         # However, a Lora can be serverless (PEFT).
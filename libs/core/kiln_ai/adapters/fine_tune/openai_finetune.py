@@ -1,7 +1,5 @@
 import time
-
-import openai
-from openai.types.fine_tuning import FineTuningJob
+from typing import TYPE_CHECKING, Any
 
 from kiln_ai.adapters.fine_tune.base_finetune import (
     BaseFinetuneAdapter,
@@ -13,9 +11,29 @@ from kiln_ai.adapters.fine_tune.dataset_formatter import DatasetFormat, DatasetF
 from kiln_ai.datamodel import DatasetSplit, StructuredOutputMode, Task
 from kiln_ai.utils.config import Config
 
-oai_client = openai.AsyncOpenAI(
-    api_key=Config.shared().open_ai_api_key or "",
-)
+if TYPE_CHECKING:
+    import openai
+
+
+def _oai_client() -> "openai.AsyncOpenAI":
+    """
+    The shared OpenAI client, created on first use so importing this module doesn't import the openai SDK. Also available as the module attribute `oai_client`.
+    """
+    client = globals().get("oai_client")
+    if client is None:
+        import openai
+
+        client = openai.AsyncOpenAI(
+            api_key=Config.shared().open_ai_api_key or "",
+        )
+        globals()["oai_client"] = client
+    return client
+
+
+def __getattr__(name: str) -> Any:
+    if name == "oai_client":
+        return _oai_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class OpenAIFinetune(BaseFinetuneAdapter):
@@ -43,9 +61,12 @@ class OpenAIFinetune(BaseFinetuneAdapter):
                 message="This fine-tune has not been started or has not been assigned a provider ID.",
             )
 
+        import openai
+        from openai.types.fine_tuning import FineTuningJob
+
         try:
             # Will raise an error if the job is not found, or for other issues
-            response = await oai_client.fine_tuning.jobs.retrieve(
+            response = await _oai_client().fine_tuning.jobs.retrieve(
                 self.datamodel.provider_id
             )
 
@@ -145,7 +166,7 @@ class OpenAIFinetune(BaseFinetuneAdapter):
             if k in ["n_epochs", "learning_rate_multiplier", "batch_size"]
         }
 
-        ft = await oai_client.fine_tuning.jobs.create(
+        ft = await _oai_client().fine_tuning.jobs.create(
             training_file=train_file_id,
             model=self.datamodel.base_model_id,
             validation_file=validation_file_id,
@@ -168,7 +189,7 @@ class OpenAIFinetune(BaseFinetuneAdapter):
         )
         path = formatter.dump_to_file(split_name, format, self.datamodel.data_strategy)
 
-        response = await oai_client.files.create(
+        response = await _oai_client().files.create(
             file=open(path, "rb"),
             purpose="fine-tune",
         )
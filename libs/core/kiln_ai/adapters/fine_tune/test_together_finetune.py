@@ -87,9 +87,7 @@ def together_finetune(finetune, mock_together_client, mock_api_key):
 
 @pytest.fixture
 def mock_together_client():
-    with patch(
-        "kiln_ai.adapters.fine_tune.together_finetune.Together"
-    ) as mock_together:
+    with patch("together.Together") as mock_together:
         mock_client = MagicMock()
         mock_together.return_value = mock_client
         yield mock_client
@@ -1,8 +1,5 @@
-from typing import Literal, Tuple
-
-from together import Together
-from together.types.files import FilePurpose
-from together.types.finetune import FinetuneJobStatus as TogetherFinetuneJobStatus
+import functools
+from typing import TYPE_CHECKING, Any, List, Tuple
 
 from kiln_ai.adapters.fine_tune.base_finetune import (
     BaseFinetuneAdapter,
@@ -15,24 +12,52 @@ from kiln_ai.datamodel import DatasetSplit, StructuredOutputMode, Task
 from kiln_ai.datamodel import Finetune as FinetuneModel
 from kiln_ai.utils.config import Config
 
-_pending_statuses = [
-    TogetherFinetuneJobStatus.STATUS_PENDING,
-    TogetherFinetuneJobStatus.STATUS_QUEUED,
-]
-_running_statuses = [
-    TogetherFinetuneJobStatus.STATUS_RUNNING,
-    TogetherFinetuneJobStatus.STATUS_COMPRESSING,
-    TogetherFinetuneJobStatus.STATUS_UPLOADING,
-]
-_completed_statuses = [TogetherFinetuneJobStatus.STATUS_COMPLETED]
-_failed_statuses = [
-    TogetherFinetuneJobStatus.STATUS_CANCELLED,
-    TogetherFinetuneJobStatus.STATUS_CANCEL_REQUESTED,
-    TogetherFinetuneJobStatus.STATUS_ERROR,
-    TogetherFinetuneJobStatus.STATUS_USER_ERROR,
+if TYPE_CHECKING:
+    from together.types.finetune import (
+        FinetuneJobStatus as TogetherFinetuneJobStatus,
+    )
+
+_STATUS_GROUP_NAMES = [
+    "_pending_statuses",
+    "_running_statuses",
+    "_completed_statuses",
+    "_failed_statuses",
 ]
 
 
+@functools.cache
+def _status_groups() -> Tuple[List["TogetherFinetuneJobStatus"], ...]:
+    """
+    Together job statuses: pending, running, completed and failed. Built on first use, as the together SDK is slow to import.
+    """
+    from together.types.finetune import FinetuneJobStatus as TogetherFinetuneJobStatus
+
+    return (
+        [
+            TogetherFinetuneJobStatus.STATUS_PENDING,
+            TogetherFinetuneJobStatus.STATUS_QUEUED,
+        ],
+        [
+            TogetherFinetuneJobStatus.STATUS_RUNNING,
+            TogetherFinetuneJobStatus.STATUS_COMPRESSING,
+            TogetherFinetuneJobStatus.STATUS_UPLOADING,
+        ],
+        [TogetherFinetuneJobStatus.STATUS_COMPLETED],
+        [
+            TogetherFinetuneJobStatus.STATUS_CANCELLED,
+            TogetherFinetuneJobStatus.STATUS_CANCEL_REQUESTED,
+            TogetherFinetuneJobStatus.STATUS_ERROR,
+            TogetherFinetuneJobStatus.STATUS_USER_ERROR,
+        ],
+    )
+
+
+def __getattr__(name: str) -> Any:
+    if name in _STATUS_GROUP_NAMES:
+        return _status_groups()[_STATUS_GROUP_NAMES.index(name)]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class TogetherFinetune(BaseFinetuneAdapter):
     """
     A fine-tuning adapter for Together.ai.
@@ -43,6 +68,8 @@ class TogetherFinetune(BaseFinetuneAdapter):
         api_key = Config.shared().together_api_key
         if not api_key:
             raise ValueError("Together.ai API key not set")
+        from together import Together
+
         self.client = Together(api_key=api_key)
 
     async def status(self) -> FineTuneStatus:
@@ -67,6 +94,12 @@ class TogetherFinetune(BaseFinetuneAdapter):
             together_finetune = self.client.fine_tuning.retrieve(id=fine_tuning_job_id)
 
             status = together_finetune.status
+            (
+                _pending_statuses,
+                _running_statuses,
+                _completed_statuses,
+                _failed_statuses,
+            ) = _status_groups()
             if status in _pending_statuses:
                 return FineTuneStatus(
                     status=FineTuneStatusType.pending,
@@ -240,6 +273,8 @@ class TogetherFinetune(BaseFinetuneAdapter):
         )
         path = formatter.dump_to_file(split_name, format, self.datamodel.data_strategy)
 
+        from together.types.files import FilePurpose
+
         try:
             together_file = self.client.files.upload(
                 file=path,
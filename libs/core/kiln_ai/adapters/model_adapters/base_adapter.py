@@ -30,6 +30,8 @@ class AdapterConfig:
     """
 
     allow_saving: bool = True
+    # Save runs in a worker thread, so concurrent invokes aren't blocked waiting on disk
+    save_in_thread: bool = True
     top_logprobs: int | None = None
     default_tags: list[str] | None = None
 
@@ -150,7 +152,10 @@ class BaseAdapter(metaclass=ABCMeta):
             and Config.shared().autosave_runs
             and self.task().path is not None
         ):
-            run.save_to_file()
+            if self.base_adapter_config.save_in_thread:
+                await run.save_to_file_async()
+            else:
+                run.save_to_file()
         else:
             # Clear the ID to indicate it's not persisted
             run.id = None
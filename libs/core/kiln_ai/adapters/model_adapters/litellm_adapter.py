@@ -1,8 +1,5 @@
 from typing import Any, Dict
 
-import litellm
-from litellm.types.utils import ChoiceLogprobs, Choices, ModelResponse
-
 import kiln_ai.datamodel as datamodel
 from kiln_ai.adapters.ml_model_list import (
     KilnModelProvider,
@@ -50,6 +47,10 @@ class LiteLlmAdapter(BaseAdapter):
         )
 
     async def _run(self, input: Dict | str) -> RunOutput:
+        # Imported on first use, as litellm is slow to import
+        import litellm
+        from litellm.types.utils import ChoiceLogprobs, Choices, ModelResponse
+
         provider = self.model_provider()
         if not provider.model_id:
             raise ValueError("Model ID is required for OpenAI compatible models")
@@ -1,8 +1,11 @@
+import asyncio
+import threading
 from unittest.mock import patch
 
 import pytest
 
 from kiln_ai.adapters.model_adapters.base_adapter import (
+    AdapterConfig,
     BaseAdapter,
     RunOutput,
 )
@@ -11,6 +14,7 @@ from kiln_ai.datamodel import (
     DataSourceType,
     Project,
     Task,
+    TaskRun,
 )
 from kiln_ai.datamodel.task import RunConfig
 from kiln_ai.utils.config import Config
@@ -227,3 +231,63 @@ async def test_autosave_true(test_task, adapter):
             output.source.properties["prompt_id"]
             == "simple_chain_of_thought_prompt_builder"
         )
+
+
+def saving_adapter(test_task, save_in_thread: bool) -> MockAdapter:
+    return MockAdapter(
+        run_config=RunConfig(
+            task=test_task,
+            model_name="phi_3_5",
+            model_provider_name="ollama",
+            prompt_id="simple_prompt_builder",
+        ),
+        config=AdapterConfig(save_in_thread=save_in_thread),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("save_in_thread", [True, False])
+async def test_save_in_thread_runs_off_event_loop(test_task, save_in_thread):
+    adapter = saving_adapter(test_task, save_in_thread)
+    loop_thread = threading.get_ident()
+    save_threads = []
+
+    def recording_save(self):
+        save_threads.append(threading.get_ident())
+
+    with (
+        patch("kiln_ai.utils.config.Config.shared") as mock_shared,
+        patch.object(TaskRun, "save_to_file", recording_save),
+    ):
+        mock_shared.return_value.autosave_runs = True
+        mock_shared.return_value.user_id = "test_user"
+        await adapter.invoke("Test input")
+
+    assert len(save_threads) == 1
+    assert (save_threads[0] != loop_thread) == save_in_thread
+
+
+@pytest.mark.asyncio
+async def test_save_in_thread_keeps_event_loop_running(test_task):
+    adapter = saving_adapter(test_task, save_in_thread=True)
+    save_started = threading.Event()
+    loop_ran = threading.Event()
+
+    def blocking_save(self):
+        # Only returns once the event loop has run while this save is blocked. Would time out if the save blocked the loop.
+        save_started.set()
+        assert loop_ran.wait(timeout=5)
+
+    async def run_on_loop_during_save():
+        await asyncio.to_thread(save_started.wait, 5)
+        loop_ran.set()
+
+    with (
+        patch("kiln_ai.utils.config.Config.shared") as mock_shared,
+        patch.object(TaskRun, "save_to_file", blocking_save),
+    ):
+        mock_shared.return_value.autosave_runs = True
+        mock_shared.return_value.user_id = "test_user"
+        await asyncio.gather(adapter.invoke("Test input"), run_on_loop_during_save())
+
+    assert loop_ran.is_set()
@@ -1,7 +1,5 @@
 from typing import Any, List
 
-import httpx
-import requests
 from pydantic import BaseModel, Field
 
 from kiln_ai.adapters.ml_model_list import ModelProviderName, built_in_models
@@ -29,6 +27,8 @@ async def ollama_online() -> bool:
     Returns:
         True if Ollama is available and responding, False otherwise
     """
+    import httpx
+
     try:
         httpx.get(ollama_base_url() + "/api/tags")
     except httpx.RequestError:
@@ -101,6 +101,8 @@ async def get_ollama_connection() -> OllamaConnection | None:
     """
     Gets the connection status for Ollama.
     """
+    import requests
+
     try:
         tags = requests.get(ollama_base_url() + "/api/tags", timeout=5).json()
 
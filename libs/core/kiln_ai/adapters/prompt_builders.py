@@ -1,3 +1,4 @@
+import heapq
 import json
 from abc import ABCMeta, abstractmethod
 from typing import Dict
@@ -156,35 +157,36 @@ class MultiShotPromptBuilder(BasePromptBuilder):
         return f"## Example {index + 1}\n\nInput: {example.input}\nOutput: {output.output}\n\n"
 
     def collect_examples(self) -> list[TaskRun]:
-        valid_examples: list[TaskRun] = []
-        runs = self.task.runs(readonly=True)
-
-        # first pass, we look for repaired outputs. These are the best examples.
-        for run in runs:
-            if len(valid_examples) >= self.__class__.example_count():
-                break
+        example_count = self.__class__.example_count()
+        # Repaired outputs are the best examples
+        repaired_examples: list[TaskRun] = []
+        # Then high quality outputs (rating based). Minimum is "high_quality" (4 star in star rating scale), best rated first.
+        # A min heap of the best example_count (rating, -index, run): ties keep the run order.
+        rated_examples: list[tuple[float, int, TaskRun]] = []
+
+        # One streaming pass over the runs, only keeping the candidates we could use
+        for index, run in enumerate(self.task.iter_runs(readonly=True)):
             if run.repaired_output is not None:
-                valid_examples.append(run)
-
-        # second pass, we look for high quality outputs (rating based)
-        # Minimum is "high_quality" (4 star in star rating scale), then sort by rating
-        # exclude repaired outputs as they were used above
-        runs_with_rating = [
+                if len(repaired_examples) < example_count:
+                    repaired_examples.append(run)
+            elif (
+                run.output.rating is not None
+                and run.output.rating.value is not None
+                and run.output.rating.is_high_quality()
+            ):
+                candidate = (run.output.rating.value, -index, run)
+                if len(rated_examples) < example_count:
+                    heapq.heappush(rated_examples, candidate)
+                elif candidate[:2] > rated_examples[0][:2]:
+                    heapq.heapreplace(rated_examples, candidate)
+
+        best_rated = [
             run
-            for run in runs
-            if run.output.rating is not None
-            and run.output.rating.value is not None
-            and run.output.rating.is_high_quality()
-            and run.repaired_output is None
+            for _, _, run in sorted(
+                rated_examples, key=lambda x: (x[0], x[1]), reverse=True
+            )
         ]
-        runs_with_rating.sort(
-            key=lambda x: (x.output.rating and x.output.rating.value) or 0, reverse=True
-        )
-        for run in runs_with_rating:
-            if len(valid_examples) >= self.__class__.example_count():
-                break
-            valid_examples.append(run)
-        return valid_examples
+        return (repaired_examples + best_rated)[:example_count]
 
 
 class FewShotPromptBuilder(MultiShotPromptBuilder):
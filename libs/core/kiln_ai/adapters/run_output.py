@@ -1,11 +1,12 @@
 from dataclasses import dataclass
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 
-from litellm.types.utils import ChoiceLogprobs
+if TYPE_CHECKING:
+    from litellm.types.utils import ChoiceLogprobs
 
 
 @dataclass
 class RunOutput:
     output: Dict | str
     intermediate_outputs: Dict[str, str] | None
-    output_logprobs: ChoiceLogprobs | None = None
+    output_logprobs: "ChoiceLogprobs | None" = None
@@ -1,17 +1,26 @@
-import json
 import os
 import re
 import shutil
+import stat
+import threading
+import time
 import uuid
 from abc import ABCMeta
 from builtins import classmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import (
+    Annotated,
     Any,
+    Callable,
     Dict,
+    Iterable,
+    Iterator,
     List,
     Optional,
+    Sequence,
+    Tuple,
     Type,
     TypeVar,
 )
@@ -20,6 +29,7 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    TypeAdapter,
     ValidationError,
     ValidationInfo,
     computed_field,
@@ -28,9 +38,17 @@ from pydantic import (
 from pydantic_core import ErrorDetails
 from typing_extensions import Self
 
+from kiln_ai.datamodel.blocking_io import run_blocking
+from kiln_ai.datamodel.json_codec import json_codec
 from kiln_ai.datamodel.model_cache import ModelCache
+from kiln_ai.datamodel.packed_storage import (
+    PACKED_FOLDER_NAME,
+    PackedStore,
+    packed_child_paths,
+)
 from kiln_ai.utils.config import Config
 from kiln_ai.utils.formatting import snake_case
+from kiln_ai.utils.json_projection import load_top_level_keys
 
 # ID is a 12 digit random integer string.
 # Should be unique per item, at least inside the context of a parent/child relationship.
@@ -62,6 +80,76 @@ SHORT_NAME_FIELD = Field(
 )
 
 
+def _write_file_atomic(path: Path, data: str) -> None:
+    # Write to a temp file in the same folder (same filesystem), then rename: readers never see a partial file
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _packed_store_for_save(path: Path) -> PackedStore | None:
+    # Existing files are saved in place (real files win over packed records), new children of a packed relationship go to its store
+    store = PackedStore.for_model_path(path)
+    if store is None or path.exists():
+        return None
+    return store
+
+
+def read_model_file(path: Path) -> Tuple[str, int, int]:
+    """
+    Read a model file. Returns the text, and the file's mtime and size (for cache validation).
+
+    Children in packed storage (see packed_storage.py) are read from their store, with the record version standing in for the mtime.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            # modified time of file for cache invalidation. From file descriptor so it's atomic w read.
+            file_stat = os.fstat(file.fileno())
+            return file.read(), file_stat.st_mtime_ns, file_stat.st_size
+    except (FileNotFoundError, NotADirectoryError):
+        store = PackedStore.for_model_path(path)
+        if store is None:
+            raise
+    data, record = store.read(path.parent.name)
+    return data.decode("utf-8"), record.version, record.length
+
+
+# Validators for single fields, for partial loads. Building a TypeAdapter is slow, so reuse them.
+_field_adapters: Dict[Tuple[type, str], TypeAdapter] = {}
+
+
+def _field_adapter(model_type: type[BaseModel], field_name: str) -> TypeAdapter:
+    key = (model_type, field_name)
+    adapter = _field_adapters.get(key)
+    if adapter is None:
+        field_info = model_type.model_fields[field_name]
+        annotation = field_info.annotation
+        if field_info.metadata:
+            # Keep constraints like max_length
+            annotation = Annotated[(annotation, *field_info.metadata)]  # type: ignore
+        adapter = TypeAdapter(annotation)
+        _field_adapters[key] = adapter
+    return adapter
+
+
+_max_schema_versions: Dict[type, int] = {}
+
+
+def _max_schema_version(model_type: Type["KilnBaseModel"]) -> int:
+    # max_schema_version is an instance method, build an instance once per class to call it
+    max_version = _max_schema_versions.get(model_type)
+    if max_version is None:
+        placeholders = {name: None for name in model_type.model_fields}
+        max_version = model_type.model_construct(**placeholders).max_schema_version()
+        _max_schema_versions[model_type] = max_version
+    return max_version
+
+
 def string_to_valid_name(name: str) -> str:
     # Replace any character not allowed by NAME_REGEX with an underscore
     valid_name = re.sub(r"[^A-Za-z0-9 _-]", "_", name)
@@ -91,6 +179,48 @@ class KilnBaseModel(BaseModel):
     created_by: str = Field(default_factory=lambda: Config.shared().user_id)
 
     _loaded_from_file: bool = False
+    # Set on instances shared through the model cache (see load_from_file readonly). Field assignment raises.
+    _readonly: bool = False
+    # Set on models with only some fields loaded (see load_partial). Can't be saved.
+    _partial: bool = False
+    # Dict fields loaded as only their keys by load_partial(keys_only=...). See field_keys.
+    _field_keys: Dict[str, List[str] | None] | None = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # "parent" is an in memory reference, not data, so readonly models can still cache it
+        if name[0] != "_" and name != "parent" and self._readonly:
+            raise ValueError(
+                f"Cannot set '{name}' on a readonly {self.__class__.__name__}. Load without readonly=True to get a copy you can edit."
+            )
+        super().__setattr__(name, value)
+
+    def _set_readonly(self, readonly: bool) -> None:
+        """Mark this model, and any Kiln models nested in its fields, as readonly (or not)."""
+        self._readonly = readonly
+        for field_name in self.__class__.model_fields:
+            if field_name == "parent":
+                continue
+            value = self.__dict__.get(field_name)
+            if isinstance(value, KilnBaseModel):
+                value._set_readonly(readonly)
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    if isinstance(item, KilnBaseModel):
+                        item._set_readonly(readonly)
+            elif isinstance(value, dict):
+                for item in value.values():
+                    if isinstance(item, KilnBaseModel):
+                        item._set_readonly(readonly)
+
+    def is_readonly(self) -> bool:
+        return self._readonly
+
+    def field_keys(self, name: str) -> List[str] | None:
+        """The keys of a dict field (None if it's not set). Works on partial models which loaded only its keys (see load_partial keys_only)."""
+        if self._field_keys is not None and name in self._field_keys:
+            return self._field_keys[name]
+        value = getattr(self, name)
+        return list(value) if isinstance(value, dict) else None
 
     @computed_field()
     def model_type(self) -> str:
@@ -120,12 +250,18 @@ class KilnBaseModel(BaseModel):
         return cls.load_from_file(path)
 
     @classmethod
-    def load_from_file(cls: Type[T], path: Path | str, readonly: bool = False) -> T:
+    def load_from_file(
+        cls: Type[T],
+        path: Path | str,
+        readonly: bool = False,
+        mtime_ns: int | None = None,
+    ) -> T:
         """Load a model instance from a specific file path.
 
         Args:
             path (Path): Path to the model file
-            readonly (bool): If True, the model will be returned in readonly mode (cached instance, not a copy, not safe to mutate)
+            readonly (bool): If True, return the shared cached instance instead of a private copy. Much faster, but the model is frozen: assigning a field raises. Only assignment is blocked: nested lists/dicts are shared with the cache and not frozen, so don't mutate them either.
+            mtime_ns (int, optional): The current mtime of the file if already known (e.g. from a directory scan). Used to validate the cache without another stat call.
 
         Returns:
             T: Instance of the model
@@ -136,19 +272,46 @@ class KilnBaseModel(BaseModel):
         """
         if isinstance(path, str):
             path = Path(path)
-        cached_model = ModelCache.shared().get_model(path, cls, readonly=readonly)
+        cached_model = cls._load_from_cache(path, readonly, mtime_ns)
         if cached_model is not None:
             return cached_model
-        with open(path, "r", encoding="utf-8") as file:
-            # modified time of file for cache invalidation. From file descriptor so it's atomic w read.
-            mtime_ns = os.fstat(file.fileno()).st_mtime_ns
-            file_data = file.read()
-            parsed_json = json.loads(file_data)
-            m = cls.model_validate(parsed_json, context={"loading_from_file": True})
-            if not isinstance(m, cls):
-                raise ValueError(f"Loaded model is not of type {cls.__name__}")
-            m._loaded_from_file = True
-            file_data = None
+        return cls._load_uncached(path, readonly)
+
+    @classmethod
+    async def load_from_file_async(
+        cls: Type[T],
+        path: Path | str,
+        readonly: bool = False,
+        mtime_ns: int | None = None,
+    ) -> T:
+        """load_from_file, run on the datamodel thread pool (see blocking_io.py)."""
+        return await run_blocking(cls.load_from_file, path, readonly, mtime_ns)
+
+    @classmethod
+    def _load_from_cache(
+        cls: Type[T], path: Path, readonly: bool, mtime_ns: int | None = None
+    ) -> T | None:
+        cached_model = ModelCache.shared().get_model(
+            path, cls, readonly=readonly, mtime_ns=mtime_ns
+        )
+        if cached_model is not None and not readonly:
+            # A deep copy of the frozen cached instance, make it editable
+            cached_model._set_readonly(False)
+        return cached_model
+
+    @classmethod
+    def _load_uncached(cls: Type[T], path: Path, readonly: bool) -> T:
+        text, mtime_ns, size = read_model_file(path)
+        m = cls._model_from_text(path, text)
+        return cls._add_to_cache(path, m, mtime_ns, size, readonly)
+
+    @classmethod
+    def _model_from_text(cls: Type[T], path: Path, text: str) -> T:
+        """Decode and validate the contents of a model file, with the codec selected in settings (see json_codec.py). Safe to call from other threads/processes."""
+        m, model_type = json_codec().validate(cls, text)
+        if not isinstance(m, cls):
+            raise ValueError(f"Loaded model is not of type {cls.__name__}")
+        m._loaded_from_file = True
         m.path = path
         if m.v > m.max_schema_version():
             raise ValueError(
@@ -156,13 +319,146 @@ class KilnBaseModel(BaseModel):
                 f"Class: {m.__class__.__name__}, id: {getattr(m, 'id', None)}, path: {path}, "
                 f"version: {m.v}, max version: {m.max_schema_version()}"
             )
-        if parsed_json["model_type"] != cls.type_name():
+        if model_type != cls.type_name():
             raise ValueError(
-                f"Cannot load from file because the model type is incorrect. Expected {cls.type_name()}, got {parsed_json['model_type']}. "
+                f"Cannot load from file because the model type is incorrect. Expected {cls.type_name()}, got {model_type}. "
                 f"Class: {m.__class__.__name__}, id: {getattr(m, 'id', None)}, path: {path}, "
                 f"version: {m.v}, max version: {m.max_schema_version()}"
             )
-        ModelCache.shared().set_model(path, m, mtime_ns)
+        return m
+
+    @classmethod
+    def _add_to_cache(
+        cls: Type[T], path: Path, m: T, mtime_ns: int, size: int, readonly: bool
+    ) -> T:
+        # Cached instances are shared with readonly readers, so frozen. The freshly parsed instance isn't shared yet: readonly callers share it with the cache, other callers keep it as is and we cache a copy (instead of freezing it, copying it, then thawing the copy).
+        cached = m if readonly else m.model_copy(deep=True)
+        cached._set_readonly(True)
+        if not ModelCache.shared().set_model(path, cached, mtime_ns, size) and readonly:
+            # Not cached, so not shared: the caller owns it
+            m._set_readonly(False)
+        return m
+
+    @classmethod
+    def load_fields(
+        cls,
+        path: Path | str,
+        fields: Sequence[str],
+        mtime_ns: int | None = None,
+        keys_only: Sequence[str] = (),
+    ) -> Dict[str, Any]:
+        """Load only some top-level fields of a model file. Much faster than a full load when the file has large fields you don't need (e.g. a task run's intermediate_outputs).
+
+        Only the requested keys are decoded and validated (per field: model level validators don't run). Results are cached separately from full models.
+
+        Args:
+            path (Path): Path to the model file
+            fields (Sequence[str]): Names of the fields to load
+            mtime_ns (int, optional): The current mtime of the file if already known, see load_from_file.
+            keys_only (Sequence[str], optional): Dict fields to load only the keys of, unvalidated (None if the field is null or missing). For checking what a large field holds without loading it (e.g. does a run have reasoning in intermediate_outputs).
+
+        Returns:
+            Dict[str, Any]: Field name to validated value. Missing fields get their default, or are omitted if required. Shared with the cache: don't mutate.
+
+        Raises:
+            ValueError: If a field doesn't exist, or the file is not of the expected type or version
+            FileNotFoundError: If the file does not exist
+        """
+        if isinstance(path, str):
+            path = Path(path)
+        field_names = tuple(sorted(set(fields)))
+        key_field_names = tuple(sorted(set(keys_only) - set(field_names)))
+        for name in field_names + key_field_names:
+            if name not in cls.model_fields:
+                raise ValueError(f"{cls.__name__} has no field '{name}'")
+        model_cache = ModelCache.shared()
+        cache_key = field_names + tuple(f"{name}.keys()" for name in key_field_names)
+        cached_values = model_cache.get_fields(path, cls, cache_key, mtime_ns)
+        if cached_values is not None:
+            return cached_values
+
+        text, file_mtime_ns, _ = read_model_file(path)
+        raw_values = load_top_level_keys(
+            text, field_names + ("v", "model_type"), keys_only=key_field_names
+        )
+        if raw_values.get("model_type") != cls.type_name():
+            raise ValueError(
+                f"Cannot load from file because the model type is incorrect. Expected {cls.type_name()}, got {raw_values.get('model_type')}. "
+                f"Class: {cls.__name__}, path: {path}"
+            )
+        max_version = _max_schema_version(cls)
+        if raw_values.get("v", 1) > max_version:
+            raise ValueError(
+                f"Cannot load from file because the schema version is higher than the current version. Upgrade kiln to the latest version. "
+                f"Class: {cls.__name__}, path: {path}, version: {raw_values.get('v')}, max version: {max_version}"
+            )
+
+        values: Dict[str, Any] = {}
+        for name in field_names:
+            field_info = cls.model_fields[name]
+            if name in raw_values:
+                value = _field_adapter(cls, name).validate_python(
+                    raw_values[name], context={"loading_from_file": True}
+                )
+            elif not field_info.is_required():
+                value = field_info.get_default(call_default_factory=True)
+            else:
+                continue
+            if isinstance(value, KilnBaseModel):
+                value._loaded_from_file = True
+            values[name] = value
+        for name in key_field_names:
+            values[name] = raw_values.get(name)
+        if "path" in field_names:
+            # Not stored in the file
+            values["path"] = path
+
+        if model_cache.set_fields(path, cls, cache_key, values, file_mtime_ns):
+            # Shared with other readers
+            for value in values.values():
+                if isinstance(value, KilnBaseModel):
+                    value._set_readonly(True)
+        return values
+
+    @classmethod
+    def load_partial(
+        cls: Type[T],
+        path: Path | str,
+        fields: Sequence[str],
+        mtime_ns: int | None = None,
+        keys_only: Sequence[str] = (),
+    ) -> T:
+        """Load a readonly model with only some fields set, for code which expects a model (e.g. dataset filters). See load_fields.
+
+        Accessing a field which wasn't loaded raises AttributeError. Fields in keys_only aren't set either, read their keys with field_keys. Partial models can't be saved. If the full model is already cached, returns that instead (readonly).
+        """
+        if isinstance(path, str):
+            path = Path(path)
+        # If the full model is already cached, that's faster, and has every field
+        cached_model = ModelCache.shared().get_model(
+            path, cls, readonly=True, mtime_ns=mtime_ns
+        )
+        if cached_model is not None:
+            return cached_model
+        values = dict(
+            cls.load_fields(path, fields, mtime_ns=mtime_ns, keys_only=keys_only)
+        )
+        field_keys = {
+            name: values.pop(name) for name in keys_only if name not in fields
+        }
+        values["path"] = path
+        # No validation: the fields are already validated, and model validators would need fields we didn't load.
+        # Placeholders for the other fields: model_construct would otherwise call every default factory (slow). Removed so accessing them raises.
+        placeholders = {name: None for name in cls.model_fields if name not in values}
+        m = cls.model_construct(
+            _fields_set=set(values.keys()), **values, **placeholders
+        )
+        for name in placeholders:
+            del m.__dict__[name]
+        m._loaded_from_file = True
+        m._partial = True
+        m._readonly = True
+        m._field_keys = field_keys
         return m
 
     def loaded_from_file(self, info: ValidationInfo | None = None) -> bool:
@@ -184,37 +480,195 @@ class KilnBaseModel(BaseModel):
             return True
         return False
 
+    async def save_to_file_async(self) -> None:
+        """Save the model instance to a file, from async code.
+
+        The write runs on the datamodel thread pool (see blocking_io.py), so the event loop keeps serving other tasks (like in-flight model calls) while waiting on disk.
+
+        Raises:
+            ValueError: If the path is not set
+        """
+        await run_blocking(self.save_to_file)
+
     def save_to_file(self) -> None:
         """Save the model instance to a file.
 
         Raises:
             ValueError: If the path is not set
         """
+        if self._partial:
+            raise ValueError(
+                f"Cannot save a partially loaded model. Load it with load_from_file to edit it. Class: {self.__class__.__name__}, path: {self.path}"
+            )
         path = self.build_path()
         if path is None:
             raise ValueError(
                 f"Cannot save to file because 'path' is not set. Class: {self.__class__.__name__}, "
                 f"id: {getattr(self, 'id', None)}, path: {path}"
             )
-        path.parent.mkdir(parents=True, exist_ok=True)
-        json_data = self.model_dump_json(indent=2, exclude={"path"})
-        with open(path, "w", encoding="utf-8") as file:
-            file.write(json_data)
+        store = _packed_store_for_save(path)
+        if store is not None:
+            store.write(
+                path.parent.name, self.model_dump_json(exclude={"path"}).encode("utf-8")
+            )
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            json_data = self.model_dump_json(indent=2, exclude={"path"})
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(json_data)
+        self._did_save(path)
+
+    def _did_save(self, path: Path) -> None:
+        """Bookkeeping after this model was written to path. Subclasses extend this to keep indexes in sync."""
         # save the path so even if something like name changes, the file doesn't move
-        self.path = path
+        # Note: the assignment also re-runs model validators (validate_assignment). Readonly models can't be edited, so don't need it.
+        if not self._readonly:
+            self.path = path
         # We could save, but invalidating will trigger load on next use.
         # This ensures everything in cache is loaded from disk, and the cache perfectly reflects what's on disk
         ModelCache.shared().invalidate(path)
 
+    @classmethod
+    def _did_save_many(
+        cls, models: Sequence[Self], paths: Sequence[Path]
+    ) -> List[Exception | None]:
+        """Bookkeeping after save_many wrote a batch of models of this type. Override to batch index updates.
+
+        Returns the error for each model, or None if successful.
+        """
+        errors: List[Exception | None] = []
+        for model, path in zip(models, paths):
+            try:
+                model._did_save(path)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+    @staticmethod
+    def save_many(
+        models: Sequence["KilnBaseModel"], max_workers: int | None = None
+    ) -> List[Exception | None]:
+        """Save many models at once, much faster than calling save_to_file on each.
+
+        Folders are created once per unique folder, and files are written by a bounded thread pool. Each file is written to a temporary file next to it, then renamed into place, so a failed or interrupted save never leaves a partially written model file.
+
+        A failure saving one model doesn't stop the others from being saved.
+
+        Args:
+            models: The models to save. May be of different types.
+            max_workers: Maximum number of writer threads. Defaults to the ThreadPoolExecutor default.
+
+        Returns:
+            A list the same length as models: None where the model was saved, or the exception which prevented it from being saved.
+        """
+        errors: List[Exception | None] = [None] * len(models)
+        pending: List[Tuple[int, Path, str]] = []
+        packed: Dict[PackedStore, List[Tuple[int, Path, bytes]]] = {}
+        # Serialize in the calling thread: pydantic holds the GIL while serializing, so threads wouldn't help
+        for i, model in enumerate(models):
+            try:
+                if model._partial:
+                    raise ValueError(
+                        f"Cannot save a partially loaded model. Load it with load_from_file to edit it. Class: {model.__class__.__name__}, path: {model.path}"
+                    )
+                path = model.build_path()
+                if path is None:
+                    raise ValueError(
+                        f"Cannot save to file because 'path' is not set. Class: {model.__class__.__name__}, "
+                        f"id: {getattr(model, 'id', None)}, path: {path}"
+                    )
+                store = _packed_store_for_save(path)
+                if store is not None:
+                    packed_data = model.model_dump_json(exclude={"path"})
+                    packed.setdefault(store, []).append(
+                        (i, path, packed_data.encode("utf-8"))
+                    )
+                else:
+                    json_data = model.model_dump_json(indent=2, exclude={"path"})
+                    pending.append((i, path, json_data))
+            except Exception as e:
+                errors[i] = e
+
+        # Create each folder once, instead of once per model
+        folder_errors: Dict[Path, Exception] = {}
+        for folder in sorted({path.parent for _, path, _ in pending}):
+            try:
+                folder.mkdir(parents=True, exist_ok=True)
+            except Exception as e:
+                folder_errors[folder] = e
+        writes: List[Tuple[int, Path, str]] = []
+        for i, path, json_data in pending:
+            if path.parent in folder_errors:
+                errors[i] = folder_errors[path.parent]
+            else:
+                writes.append((i, path, json_data))
+
+        saved: List[Tuple[int, Path]] = []
+        # Packed children: one append per store
+        for store, items in packed.items():
+            try:
+                store.write_many([(path.parent.name, data) for _, path, data in items])
+                saved.extend((i, path) for i, path, _ in items)
+            except Exception as e:
+                for i, _, _ in items:
+                    errors[i] = e
+
+        if writes:
+            # File IO releases the GIL, so writes overlap (matters most on network and cloud synced drives)
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="kiln_save"
+            ) as executor:
+                futures = [
+                    executor.submit(_write_file_atomic, path, json_data)
+                    for _, path, json_data in writes
+                ]
+                for (i, path, _), future in zip(writes, futures):
+                    error = future.exception()
+                    if error is None:
+                        saved.append((i, path))
+                    elif isinstance(error, Exception):
+                        errors[i] = error
+                    else:
+                        raise error
+
+        # Update paths, the cache and indexes. Grouped by type so subclasses can batch their index updates.
+        by_type: Dict[type, List[Tuple[int, Path]]] = {}
+        for i, path in saved:
+            by_type.setdefault(type(models[i]), []).append((i, path))
+        for model_type, group in by_type.items():
+            try:
+                group_errors = model_type._did_save_many(
+                    [models[i] for i, _ in group], [path for _, path in group]
+                )
+            except Exception as e:
+                group_errors = [e] * len(group)
+            for (i, _), error in zip(group, group_errors):
+                errors[i] = error
+        return errors
+
+    async def delete_async(self) -> None:
+        """delete, run on the datamodel thread pool (see blocking_io.py)."""
+        await run_blocking(self.delete)
+
     def delete(self) -> None:
         if self.path is None:
             raise ValueError("Cannot delete model because path is not set")
-        dir_path = self.path.parent if self.path.is_file() else self.path
-        if dir_path is None:
-            raise ValueError("Cannot delete model because path is not set")
-        shutil.rmtree(dir_path)
-        ModelCache.shared().invalidate(self.path)
-        self.path = None
+        store = PackedStore.for_model_path(self.path)
+        # Also remove a packed copy, or it would reappear once the file is gone
+        deleted_packed = store is not None and store.delete(self.path.parent.name)
+        if self.path.exists() or not deleted_packed:
+            dir_path = self.path.parent if self.path.is_file() else self.path
+            if dir_path is None:
+                raise ValueError("Cannot delete model because path is not set")
+            shutil.rmtree(dir_path)
+        self._did_delete(self.path)
+
+    def _did_delete(self, path: Path) -> None:
+        """Bookkeeping after delete removed this model from path. Subclasses extend this to keep indexes in sync (and _did_delete_many for batches)."""
+        ModelCache.shared().invalidate(path)
+        if not self._readonly:
+            self.path = None
 
     def build_path(self) -> Path | None:
         if self.path is not None:
@@ -226,6 +680,23 @@ class KilnBaseModel(BaseModel):
         return 1
 
 
+class _ParentAttribute:
+    """
+    Descriptor for KilnParentedModel.parent, lazy loading the parent on read.
+
+    Only runs for the "parent" attribute. A __getattribute__ override would run (in Python) on every attribute access of every child model. The value itself is still the pydantic field, stored in the instance __dict__.
+    """
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        if instance is None:
+            # No class attribute, like any pydantic field. Subclasses then inherit the field definition instead of taking this as its default.
+            raise AttributeError("parent")
+        return instance.load_parent()
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__["parent"] = value
+
+
 class KilnParentedModel(KilnBaseModel, metaclass=ABCMeta):
     """Base model for Kiln models that have a parent-child relationship. This base class is for child models.
 
@@ -240,38 +711,35 @@ class KilnParentedModel(KilnBaseModel, metaclass=ABCMeta):
     # We don't persist the parent reference to disk. See the accessors below for how we make it a clean api (parent accessor will lazy load from disk)
     parent: Optional[KilnBaseModel] = Field(default=None, exclude=True)
 
-    def __getattribute__(self, name: str) -> Any:
-        if name == "parent":
-            return self.load_parent()
-        return super().__getattribute__(name)
-
     def cached_parent(self) -> Optional[KilnBaseModel]:
-        return object.__getattribute__(self, "parent")
+        return self.__dict__.get("parent")
 
     def load_parent(self) -> Optional[KilnBaseModel]:
         """Get the parent model instance, loading it from disk if necessary.
 
+        Parents loaded from disk are the shared readonly instance from the model cache: many children of one parent (e.g. the runs of a task) share one parent, instead of each getting a copy. Load the parent yourself to edit it.
+
         Returns:
             Optional[KilnBaseModel]: The parent model instance or None if not set
         """
-        cached_parent = self.cached_parent()
+        cached_parent = self.__dict__.get("parent")
         if cached_parent is not None:
             return cached_parent
 
         # lazy load parent from path
-        if self.path is None:
+        path = self.path
+        if path is None:
             return None
         # Note: this only works with base_filename. If we every support custom names, we need to change this.
-        parent_path = (
-            self.path.parent.parent.parent
-            / self.__class__.parent_type().base_filename()
-        )
-        if parent_path is None:
-            return None
-        if not parent_path.exists():
+        parent_type = self.__class__.parent_type()
+        parent_path = path.parent.parent.parent / parent_type.base_filename()
+        try:
+            loaded_parent = parent_type.load_from_file(parent_path, readonly=True)
+        except (FileNotFoundError, NotADirectoryError):
             return None
-        loaded_parent = self.__class__.parent_type().load_from_file(parent_path)
-        self.parent = loaded_parent
+        if not self._readonly:
+            # Don't attach a parent to a shared cached instance (copies of it would deep copy the parent too). For those, the readonly parent load is a cache hit.
+            self.__dict__["parent"] = loaded_parent
         return loaded_parent
 
     # Dynamically implemented by KilnParentModel method injection
@@ -331,74 +799,473 @@ class KilnParentedModel(KilnBaseModel, metaclass=ABCMeta):
 
     @classmethod
     def iterate_children_paths_of_parent_path(cls: Type[PT], parent_path: Path | None):
-        if parent_path is None:
-            # children are disk based. If not saved, they don't exist
-            return []
+        for child_file, _ in cls._iterate_children_paths_with_mtime(parent_path):
+            yield child_file
 
+    @classmethod
+    def _relationship_folder(cls, parent_path: Path) -> Path:
         # Determine the parent folder
         if parent_path.is_file():
             parent_folder = parent_path.parent
         else:
             parent_folder = parent_path
 
-        parent = cls.parent_type().load_from_file(parent_path)
+        # Ignore type error: this is abstract base class, but children must implement relationship_name
+        return parent_folder / Path(cls.relationship_name())  # type: ignore
+
+    @classmethod
+    def _iterate_children_paths_with_mtime(cls: Type[PT], parent_path: Path | None):
+        """
+        Yields (child_file, mtime_ns) for each child. The mtime comes from the stat we need anyway to check the file exists, and lets the cache validate without a second stat per file.
+        """
+        if parent_path is None:
+            # children are disk based. If not saved, they don't exist
+            return
+
+        parent = cls.parent_type().load_from_file(parent_path, readonly=True)
         if parent is None:
             raise ValueError("Parent must be set to load children")
 
-        # Ignore type error: this is abstract base class, but children must implement relationship_name
-        relationship_folder = parent_folder / Path(cls.relationship_name())  # type: ignore
+        relationship_folder = cls._relationship_folder(parent_path)
 
         if not relationship_folder.exists() or not relationship_folder.is_dir():
-            return []
+            return
 
         # Collect all /relationship/{id}/{base_filename.kiln} files in the relationship folder
         # manual code instead of glob for performance (5x speedup over glob)
 
         base_filename = cls.base_filename()
+        # Children in packed storage. Real files win over packed records, so skip dirnames also found on disk.
+        packed_children = {
+            child_file.parent.name: (child_file, record.version)
+            for child_file, record in packed_child_paths(
+                relationship_folder, base_filename
+            )
+        }
         # Iterate through immediate subdirectories using scandir for better performance
         # Benchmark: scandir is 10x faster than glob, so worth the extra code
+        # Listed before yielding, so callers stopping early (iter_children_of_parent_path) don't leave the directory handle open
         with os.scandir(relationship_folder) as entries:
-            for entry in entries:
-                if not entry.is_dir():
-                    continue
-
-                child_file = Path(entry.path) / base_filename
-                if child_file.is_file():
-                    yield child_file
+            child_dirs = [
+                (entry.name, entry.path)
+                for entry in entries
+                if entry.is_dir() and not is_leftover_folder_name(entry.name)
+            ]
+        for name, dir_path in child_dirs:
+            child_file = Path(dir_path) / base_filename
+            try:
+                child_stat = os.stat(child_file)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            if stat.S_ISREG(child_stat.st_mode):
+                packed_children.pop(name, None)
+                yield child_file, child_stat.st_mtime_ns
+        yield from packed_children.values()
 
     @classmethod
     def all_children_of_parent_path(
         cls: Type[PT], parent_path: Path | None, readonly: bool = False
     ) -> list[PT]:
-        children = []
-        for child_path in cls.iterate_children_paths_of_parent_path(parent_path):
-            item = cls.load_from_file(child_path, readonly=readonly)
-            children.append(item)
-        return children
+        # inline import to avoid circular import
+        from kiln_ai.datamodel.parallel_load import load_models
+
+        # Large cold folders load in parallel, see parallel_load.py
+        child_paths = list(cls._iterate_children_paths_with_mtime(parent_path))
+        return load_models(cls, child_paths, readonly=readonly)
+
+    @classmethod
+    async def all_children_of_parent_path_async(
+        cls: Type[PT], parent_path: Path | None, readonly: bool = False
+    ) -> list[PT]:
+        """all_children_of_parent_path, run on the datamodel thread pool (see blocking_io.py)."""
+        return await run_blocking(
+            cls.all_children_of_parent_path, parent_path, readonly
+        )
+
+    @classmethod
+    def iter_children_of_parent_path(
+        cls: Type[PT],
+        parent_path: Path | None,
+        readonly: bool = False,
+        filter: Callable[[PT], bool] | None = None,
+        limit: int | None = None,
+    ) -> Iterator[PT]:
+        """
+        Stream the children of a parent, instead of loading them all into a list. Children are loaded in bounded batches as the caller iterates, and nothing more is loaded once the caller stops.
+
+        Args:
+            parent_path: Path to the parent model file or folder
+            readonly: As in load_from_file
+            filter: Only yield children for which this returns True
+            limit: Stop after yielding this many children
+        """
+        # inline import to avoid circular import
+        from kiln_ai.datamodel.parallel_load import iter_models
+
+        if limit is not None and limit <= 0:
+            return
+        count = 0
+        for child in iter_models(
+            cls, cls._iterate_children_paths_with_mtime(parent_path), readonly=readonly
+        ):
+            if filter is not None and not filter(child):
+                continue
+            yield child
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    @classmethod
+    def _child_paths_from_dirnames(cls, relationship_folder: Path) -> Dict[str, Path]:
+        # Child folders are named "{id} - {name}" (see build_child_dirname). Just a scandir, no file reads.
+        child_paths: Dict[str, Path] = {}
+        if not relationship_folder.is_dir():
+            return child_paths
+        base_filename = cls.base_filename()
+        for child_file, _ in packed_child_paths(relationship_folder, base_filename):
+            child_paths[child_file.parent.name.split(" - ", 1)[0]] = child_file
+        with os.scandir(relationship_folder) as entries:
+            for entry in entries:
+                if (
+                    entry.is_dir()
+                    and entry.name != PACKED_FOLDER_NAME
+                    and not is_leftover_folder_name(entry.name)
+                ):
+                    child_id = entry.name.split(" - ", 1)[0]
+                    child_paths[child_id] = Path(entry.path) / base_filename
+        return child_paths
+
+    @classmethod
+    def _load_child_if_id_matches(
+        cls: Type[PT], child_path: Path, id: str
+    ) -> PT | None:
+        try:
+            child = cls.load_from_file(child_path, readonly=True)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if child.id != id:
+            return None
+        return cls.load_from_file(child_path)
 
     @classmethod
     def from_id_and_parent_path(
         cls: Type[PT], id: str, parent_path: Path | None
     ) -> PT | None:
         """
-        Fast search by ID using the cache. Avoids the model_copy overhead on all but the exact match.
+        Find a child by ID.
 
-        Uses cache so still slow on first load.
+        Uses an ID -> path index built from the child folder names, so a lookup is usually a single file load. The in-file ID is the source of truth: we verify it, and fall back to checking every child if the index is stale or a folder name doesn't match its ID.
         """
         if parent_path is None:
             return None
 
-        # Note: we're using the in-file ID. We could make this faster using the path-ID if this becomes perf bottleneck, but it's better to have 1 source of truth.
-        for child_path in cls.iterate_children_paths_of_parent_path(parent_path):
-            child_id = ModelCache.shared().get_model_id(child_path, cls)
-            if child_id == id:
-                return cls.load_from_file(child_path)
-            if child_id is None:
-                child = cls.load_from_file(child_path)
-                if child.id == id:
+        model_cache = ModelCache.shared()
+        relationship_folder = cls._relationship_folder(parent_path)
+        if model_cache.has_child_index(relationship_folder):
+            child_path = model_cache.child_path_for_id(relationship_folder, id)
+            if child_path is not None:
+                child = cls._load_child_if_id_matches(child_path, id)
+                if child is not None:
                     return child
+
+        # Not indexed, or index is stale (new/moved children). Rebuild from the folder names and retry.
+        child_paths = cls._child_paths_from_dirnames(relationship_folder)
+        model_cache.set_child_index(relationship_folder, child_paths)
+        child_path = child_paths.get(id)
+        if child_path is not None:
+            child = cls._load_child_if_id_matches(child_path, id)
+            if child is not None:
+                return child
+
+        # Slow path: folder names which don't match the in-file ID (e.g. hand edited files). Check every child's in-file ID.
+        for child_path, mtime_ns in cls._iterate_children_paths_with_mtime(parent_path):
+            child_id = model_cache.get_model_id(child_path, cls, mtime_ns)
+            if child_id is None:
+                child_id = cls.load_from_file(
+                    child_path, readonly=True, mtime_ns=mtime_ns
+                ).id
+            if child_id == id:
+                model_cache.set_child_path(relationship_folder, id, child_path)
+                return cls.load_from_file(child_path, mtime_ns=mtime_ns)
         return None
 
+    @classmethod
+    async def from_id_and_parent_path_async(
+        cls: Type[PT], id: str, parent_path: Path | None
+    ) -> PT | None:
+        """from_id_and_parent_path, run on the datamodel thread pool (see blocking_io.py)."""
+        return await run_blocking(cls.from_id_and_parent_path, id, parent_path)
+
+    @classmethod
+    def from_ids_and_parent_path(
+        cls: Type[PT],
+        ids: Sequence[str],
+        parent_path: Path | None,
+        readonly: bool = False,
+    ) -> Dict[str, PT]:
+        """
+        Find many children by ID. Like from_id_and_parent_path, but all IDs are resolved with at most one scan of the child folder names (none if the ID index is cached), and the matches load in parallel.
+
+        Returns a dict of ID -> child. IDs which weren't found are left out.
+        """
+        if parent_path is None:
+            return {}
+        model_cache = ModelCache.shared()
+        relationship_folder = cls._relationship_folder(parent_path)
+        wanted = set(ids)
+        found: Dict[str, PT] = {}
+        if model_cache.has_child_index(relationship_folder):
+            found.update(
+                cls._load_indexed_children(relationship_folder, wanted, readonly)
+            )
+
+        if len(found) < len(wanted):
+            # Not indexed, or index is stale. Rebuild from the folder names and retry the rest.
+            model_cache.set_child_index(
+                relationship_folder, cls._child_paths_from_dirnames(relationship_folder)
+            )
+            found.update(
+                cls._load_indexed_children(
+                    relationship_folder, wanted - found.keys(), readonly
+                )
+            )
+
+        if len(found) < len(wanted):
+            # Slow path: folder names which don't match the in-file ID. One pass over every child's in-file ID.
+            for child_path, mtime_ns in cls._iterate_children_paths_with_mtime(
+                parent_path
+            ):
+                child_id = model_cache.get_model_id(child_path, cls, mtime_ns)
+                if child_id is None:
+                    child_id = cls.load_from_file(
+                        child_path, readonly=True, mtime_ns=mtime_ns
+                    ).id
+                if child_id in wanted and child_id not in found:
+                    model_cache.set_child_path(
+                        relationship_folder, child_id, child_path
+                    )
+                    found[child_id] = cls.load_from_file(
+                        child_path, readonly=readonly, mtime_ns=mtime_ns
+                    )
+        return found
+
+    @classmethod
+    def _load_indexed_children(
+        cls: Type[PT], relationship_folder: Path, ids: Iterable[str], readonly: bool
+    ) -> Dict[str, PT]:
+        # Load the children the ID index has a path for, keeping those whose in-file ID matches
+        # inline import to avoid circular import
+        from kiln_ai.datamodel.parallel_load import load_models
+
+        model_cache = ModelCache.shared()
+        candidates: List[Tuple[str, Path]] = []
+        for id in ids:
+            child_path = model_cache.child_path_for_id(relationship_folder, id)
+            if child_path is not None:
+                candidates.append((id, child_path))
+
+        try:
+            children: List[PT | None] = list(
+                load_models(cls, [(path, None) for _, path in candidates], readonly)
+            )
+        except (FileNotFoundError, NotADirectoryError):
+            # Some were removed since indexed, load one at a time
+            children = []
+            for _, child_path in candidates:
+                try:
+                    children.append(cls.load_from_file(child_path, readonly=readonly))
+                except (FileNotFoundError, NotADirectoryError):
+                    children.append(None)
+
+        return {
+            id: child
+            for (id, _), child in zip(candidates, children)
+            if child is not None and child.id == id
+        }
+
+    @classmethod
+    def delete_many(cls, models: Sequence[PT]) -> List[Exception | None]:
+        """
+        Delete many children at once, much faster than calling delete() on each.
+
+        Each child's folder is renamed into a trash folder next to its relationship folder (a metadata-only move), then the trash is removed from disk in a background thread. Packed children are removed from their store with one index write per store.
+
+        A failure deleting one model doesn't stop the others from being deleted.
+
+        Returns:
+            A list the same length as models: None where the model was deleted, or the exception which prevented it from being deleted.
+        """
+        errors: List[Exception | None] = [None] * len(models)
+        paths: List[Path] = []
+        indexes: List[int] = []
+        for i, model in enumerate(models):
+            if model.path is None:
+                errors[i] = ValueError("Cannot delete model because path is not set")
+            else:
+                paths.append(model.path)
+                indexes.append(i)
+
+        # Remove packed copies first, or they would reappear once the files are gone
+        by_store: Dict[PackedStore, List[int]] = {}
+        for j, path in enumerate(paths):
+            store = PackedStore.for_model_path(path)
+            if store is not None:
+                by_store.setdefault(store, []).append(j)
+        deleted_packed = set()
+        for store, group in by_store.items():
+            try:
+                results = store.delete_many([paths[j].parent.name for j in group])
+            except Exception as e:
+                for j in group:
+                    errors[indexes[j]] = e
+                continue
+            deleted_packed.update(j for j, deleted in zip(group, results) if deleted)
+
+        trash_folders: Dict[Path, Path] = {}
+        deleted: List[int] = []
+        for j, path in enumerate(paths):
+            i = indexes[j]
+            if errors[i] is not None:
+                continue
+            if j in deleted_packed and not path.exists():
+                deleted.append(j)
+                continue
+            dir_path = path.parent if path.is_file() else path
+            try:
+                # Trash lives next to the relationship folder, so it's on the same filesystem and never listed as a child
+                container = dir_path.parent.parent
+                trash_folder = trash_folders.get(container)
+                if trash_folder is None:
+                    trash_folder = (
+                        container / f"{TRASH_FOLDER_PREFIX}{uuid.uuid4().hex}"
+                    )
+                    trash_folder.mkdir()
+                    trash_folders[container] = trash_folder
+                try:
+                    os.rename(dir_path, trash_folder / dir_path.name)
+                except OSError:
+                    # Can't move it (open files on Windows, etc). Delete in place.
+                    shutil.rmtree(dir_path)
+                deleted.append(j)
+            except Exception as e:
+                errors[i] = e
+
+        if trash_folders:
+            _delete_in_background(list(trash_folders.values()))
+
+        cls._did_delete_many(
+            [models[indexes[j]] for j in deleted], [paths[j] for j in deleted]
+        )
+        return errors
+
+    @classmethod
+    def _did_delete_many(cls, models: Sequence[Self], paths: Sequence[Path]) -> None:
+        """Bookkeeping after delete_many removed a batch of models. Override to batch index updates."""
+        model_cache = ModelCache.shared()
+        for model, path in zip(models, paths):
+            model_cache.invalidate(path)
+            if model.id is not None:
+                model_cache.remove_child_path(path.parent.parent, model.id)
+            if not model._readonly:
+                model.path = None
+
+    def _did_save(self, path: Path) -> None:
+        super()._did_save(path)
+        if self.id is not None:
+            ModelCache.shared().set_child_path(path.parent.parent, self.id, path)
+
+    def _did_delete(self, path: Path) -> None:
+        super()._did_delete(path)
+        if self.id is not None:
+            ModelCache.shared().remove_child_path(path.parent.parent, self.id)
+
+
+# Folders of deleted children waiting for background removal, see KilnParentedModel.delete_many
+TRASH_FOLDER_PREFIX = ".kiln_trash_"
+# Folders of models being saved, see _save_staged
+STAGING_FOLDER_PREFIX = ".kiln_staging_"
+
+# Leftover folders untouched for this long are from a process which exited mid-delete or mid-save, not ones in use. Adding or removing entries updates a folder's mtime, so folders in use stay fresh.
+STALE_LEFTOVER_SECONDS = 60 * 60
+
+# Container folder -> time of its last sweep for leftovers, see _sweep_stale_leftovers
+_last_leftover_sweeps: Dict[Path, float] = {}
+_leftover_sweeps_lock = threading.Lock()
+
+
+def is_leftover_folder_name(name: str) -> bool:
+    """Trash and staging folders. They sit beside model folders, but are never models: child scans skip them."""
+    return name.startswith((TRASH_FOLDER_PREFIX, STAGING_FOLDER_PREFIX))
+
+
+def _claim_leftover_sweep(container: Path, prefix: str) -> bool:
+    # Sweeps scan the container, so each container is swept at most once per STALE_LEFTOVER_SECONDS
+    now = time.time()
+    with _leftover_sweeps_lock:
+        key = container / prefix
+        last_sweep = _last_leftover_sweeps.get(key)
+        if last_sweep is not None and now - last_sweep < STALE_LEFTOVER_SECONDS:
+            return False
+        _last_leftover_sweeps[key] = now
+    return True
+
+
+def _sweep_stale_leftovers(container: Path, prefix: str) -> None:
+    """
+    Remove folders starting with prefix left behind by earlier processes, e.g. trash from a process which exited mid-delete. Folders modified in the last STALE_LEFTOVER_SECONDS are skipped: other threads or processes may still be using them.
+
+    Scans the container, so each container is swept at most once per STALE_LEFTOVER_SECONDS.
+    """
+    if _claim_leftover_sweep(container, prefix):
+        _remove_stale_leftovers(container, prefix)
+
+
+def _remove_stale_leftovers(container: Path, prefix: str) -> None:
+    now = time.time()
+    try:
+        with os.scandir(container) as entries:
+            leftovers = [
+                entry
+                for entry in entries
+                if entry.name.startswith(prefix) and entry.is_dir(follow_symlinks=False)
+            ]
+    except OSError:
+        return
+    for leftover in leftovers:
+        try:
+            if (
+                now - leftover.stat(follow_symlinks=False).st_mtime
+                < STALE_LEFTOVER_SECONDS
+            ):
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(leftover.path, ignore_errors=True)
+
+
+def _delete_in_background(trash_folders: List[Path]) -> None:
+    def remove() -> None:
+        for trash_folder in trash_folders:
+            shutil.rmtree(trash_folder, ignore_errors=True)
+        for container in {folder.parent for folder in trash_folders}:
+            _sweep_stale_leftovers(container, TRASH_FOLDER_PREFIX)
+
+    threading.Thread(target=remove, name="kiln_trash", daemon=True).start()
+
+
+def _sweep_stale_leftovers_in_background(container: Path, prefix: str) -> None:
+    if _claim_leftover_sweep(container, prefix):
+        threading.Thread(
+            target=_remove_stale_leftovers,
+            args=(container, prefix),
+            name="kiln_trash",
+            daemon=True,
+        ).start()
+
+
+# Installed after class creation, so pydantic still sees "parent" as a regular field
+KilnParentedModel.parent = _ParentAttribute()  # type: ignore[assignment]
+
 
 # Parent create methods for all child relationships
 # You must pass in parent_of in the subclass definition, defining the child relationships
@@ -406,7 +1273,7 @@ class KilnParentModel(KilnBaseModel, metaclass=ABCMeta):
     """Base model for Kiln models that can have child models.
 
     This class provides functionality for managing collections of child models and their persistence.
-    Child relationships must be defined using the parent_of parameter in the class definition.
+    Child relationships must be defined using the parent_of parameter in the class definition. Each relationship gets three accessors: a method named after the relationship returning a list of children (e.g. `runs()`), a streaming `iter_` variant (e.g. `iter_runs()`), and an `_async` variant which loads on the datamodel thread pool (e.g. `await runs_async()`).
 
     Args:
         parent_of (Dict[str, Type[KilnParentedModel]]): Mapping of relationship names to child model types
@@ -423,6 +1290,29 @@ class KilnParentModel(KilnBaseModel, metaclass=ABCMeta):
         child_method.__annotations__ = {"return": List[child_class]}
         setattr(cls, relationship_name, child_method)
 
+        def iter_child_method(
+            self,
+            readonly: bool = False,
+            filter: Callable[[Any], bool] | None = None,
+            limit: int | None = None,
+        ) -> Iterator[child_class]:
+            return child_class.iter_children_of_parent_path(
+                self.path, readonly=readonly, filter=filter, limit=limit
+            )
+
+        iter_child_method.__name__ = f"iter_{relationship_name}"
+        iter_child_method.__annotations__ = {"return": Iterator[child_class]}
+        setattr(cls, f"iter_{relationship_name}", iter_child_method)
+
+        async def async_child_method(self, readonly: bool = False) -> list[child_class]:
+            return await child_class.all_children_of_parent_path_async(
+                self.path, readonly=readonly
+            )
+
+        async_child_method.__name__ = f"{relationship_name}_async"
+        async_child_method.__annotations__ = {"return": List[child_class]}
+        setattr(cls, f"{relationship_name}_async", async_child_method)
+
     @classmethod
     def _create_parent_methods(
         cls, targetCls: Type[KilnParentedModel], relationship_name: str
@@ -455,13 +1345,17 @@ class KilnParentModel(KilnBaseModel, metaclass=ABCMeta):
         data: Dict[str, Any],
         path: Path | None = None,
         parent: KilnBaseModel | None = None,
+        parallel: bool = False,
     ):
         """Validate and save a model instance along with all its nested child relationships.
 
+        Everything is validated first, in one pass, so nothing is written if any model is invalid. The tree is then written to a staging folder and moved into place with a rename: a new folder appears all at once, never half written.
+
         Args:
             data (Dict[str, Any]): Model data including child relationships
             path (Path, optional): Path where the model should be saved
             parent (KilnBaseModel, optional): Parent model instance for parented models
+            parallel (bool): Write the staged files with a thread pool. Faster for large child lists, especially on slow or network drives.
 
         Returns:
             KilnParentModel: The validated and saved model instance
@@ -469,11 +1363,9 @@ class KilnParentModel(KilnBaseModel, metaclass=ABCMeta):
         Raises:
             ValidationError: If validation fails for the model or any of its children
         """
-        # Validate first, then save. Don't want error half way through, and partly persisted
-        # TODO P2: save to tmp dir, then move atomically. But need to merge directories so later.
-        cls._validate_nested(data, save=False, path=path, parent=parent)
-        instance = cls._validate_nested(data, save=True, path=path, parent=parent)
-        return instance
+        return cls._validate_nested(
+            data, save=True, path=path, parent=parent, parallel=parallel
+        )
 
     @classmethod
     def _validate_nested(
@@ -482,9 +1374,14 @@ class KilnParentModel(KilnBaseModel, metaclass=ABCMeta):
         save: bool = False,
         parent: KilnBaseModel | None = None,
         path: Path | None = None,
+        parallel: bool = False,
+        validated: List[KilnBaseModel] | None = None,
     ):
         # Collect all validation errors so we can report them all at once
         validation_errors = []
+        # Every valid model in the tree, parents before their children
+        if validated is None:
+            validated = []
 
         try:
             instance = cls.model_validate(data)
@@ -492,8 +1389,7 @@ class KilnParentModel(KilnBaseModel, metaclass=ABCMeta):
                 instance.path = path
             if parent is not None and isinstance(instance, KilnParentedModel):
                 instance.parent = parent
-            if save:
-                instance.save_to_file()
+            validated.append(instance)
         except ValidationError as e:
             instance = None
             for suberror in e.errors():
@@ -509,7 +1405,7 @@ class KilnParentModel(KilnBaseModel, metaclass=ABCMeta):
                 for value_index, value in enumerate(value_list):
                     try:
                         if issubclass(parent_type, KilnParentModel):
-                            kwargs = {"data": value, "save": save}
+                            kwargs = {"data": value, "validated": validated}
                             if instance is not None:
                                 kwargs["parent"] = instance
                             parent_type._validate_nested(**kwargs)
@@ -518,8 +1414,7 @@ class KilnParentModel(KilnBaseModel, metaclass=ABCMeta):
                             subinstance = parent_type.model_validate(value)
                             if instance is not None:
                                 subinstance.parent = instance
-                            if save:
-                                subinstance.save_to_file()
+                            validated.append(subinstance)
                         else:
                             raise ValueError(
                                 f"Invalid type {parent_type}. Should be KilnBaseModel based."
@@ -536,6 +1431,9 @@ class KilnParentModel(KilnBaseModel, metaclass=ABCMeta):
                 input_type="json",
             )
 
+        if save:
+            _save_staged(validated, parallel=parallel)
+
         return instance
 
     @classmethod
@@ -551,3 +1449,103 @@ class KilnParentModel(KilnBaseModel, metaclass=ABCMeta):
         elif isinstance(orig_loc, list):
             new_loc.extend(orig_loc)
         error["loc"] = tuple(new_loc)
+
+
+def _merge_staged_folder(staged_folder: Path, folder: Path) -> None:
+    # Move each staged entry into place. Folders which already exist are merged into, everything else is a single rename.
+    with os.scandir(staged_folder) as entries:
+        for entry in entries:
+            target = folder / entry.name
+            if entry.is_dir() and target.is_dir():
+                _merge_staged_folder(Path(entry.path), target)
+            else:
+                os.replace(entry.path, target)
+
+
+def _save_staged(models: Sequence[KilnBaseModel], parallel: bool = False) -> None:
+    """
+    Save a validated tree of new models (root first, then its descendants): written to a hidden staging folder, then moved into place.
+
+    A new root folder is moved into place with a single rename, so it appears complete or not at all. If the root folder already exists (e.g. saving over an existing model), the staged files and child folders are moved in one at a time.
+    """
+    if len(models) == 0:
+        return
+    paths: List[Path] = []
+    for model in models:
+        path = model.build_path()
+        if path is None:
+            raise ValueError(
+                f"Cannot save to file because 'path' is not set. Class: {model.__class__.__name__}, "
+                f"id: {getattr(model, 'id', None)}, path: {path}"
+            )
+        paths.append(path)
+
+    root_folder = paths[0].parent
+    staged: List[Tuple[KilnBaseModel, Path]] = []
+    # New children of packed relationships (and anything saved outside the root folder) are saved after the move
+    direct: List[KilnBaseModel] = []
+    for model, path in zip(models, paths):
+        if path.is_relative_to(root_folder) and _packed_store_for_save(path) is None:
+            staged.append((model, path))
+        else:
+            direct.append(model)
+
+    # Same filesystem as the destination, so moves are renames. Nested one level down (and child scans skip the prefix), so child scans of the parent folder don't see the staged root.
+    staging_container = root_folder if root_folder.is_dir() else root_folder.parent
+    staging_folder = staging_container / f"{STAGING_FOLDER_PREFIX}{uuid.uuid4().hex}"
+    staged_root = staging_folder / root_folder.name
+    # Serialize in the calling thread: pydantic holds the GIL while serializing, so threads wouldn't help
+    writes = [
+        (
+            staged_root / path.relative_to(root_folder),
+            model.model_dump_json(indent=2, exclude={"path"}),
+        )
+        for model, path in staged
+    ]
+
+    def write_file(write: Tuple[Path, str]) -> None:
+        with open(write[0], "w", encoding="utf-8") as file:
+            file.write(write[1])
+
+    try:
+        for folder in sorted({staged_path.parent for staged_path, _ in writes}):
+            folder.mkdir(parents=True, exist_ok=True)
+        if parallel and len(writes) > 1:
+            # File IO releases the GIL, so writes overlap
+            with ThreadPoolExecutor(thread_name_prefix="kiln_save") as executor:
+                list(executor.map(write_file, writes))
+        else:
+            for write in writes:
+                write_file(write)
+
+        moved = False
+        if not root_folder.exists():
+            try:
+                os.rename(staged_root, root_folder)
+                moved = True
+            except OSError:
+                # Created since we checked, merge into it instead
+                pass
+        if not moved:
+            _merge_staged_folder(staged_root, root_folder)
+    finally:
+        shutil.rmtree(staging_folder, ignore_errors=True)
+        # Staging folders left behind by a process which exited mid-save
+        _sweep_stale_leftovers_in_background(staging_container, STAGING_FOLDER_PREFIX)
+
+    # Update paths, the cache and indexes. Grouped by type so subclasses can batch their index updates.
+    by_type: Dict[type, List[Tuple[KilnBaseModel, Path]]] = {}
+    for model, path in staged:
+        by_type.setdefault(type(model), []).append((model, path))
+    errors: List[Exception | None] = []
+    for model_type, group in by_type.items():
+        errors.extend(
+            model_type._did_save_many(
+                [model for model, _ in group], [path for _, path in group]
+            )
+        )
+    if len(direct) > 0:
+        errors.extend(KilnBaseModel.save_many(direct))
+    for error in errors:
+        if error is not None:
+            raise error
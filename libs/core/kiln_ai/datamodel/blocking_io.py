@@ -0,0 +1,74 @@
+"""
+A dedicated thread pool for blocking datamodel work, so async code (the API servers) never blocks its event loop on it.
+
+Loading, validating and saving models is synchronous: disk I/O, JSON decoding and pydantic validation. Called from an `async def` FastAPI handler, a slow listing stalls every other request on the loop, including streaming progress updates. Instead:
+
+ - `run_blocking(func, ...)` runs a function on the pool and awaits the result.
+ - `blocking_handler` wraps a synchronous FastAPI handler into an async one which runs on the pool. Use it for handlers which only do datamodel work.
+ - The models have `_async` variants of their load/save/child accessors (e.g. `await task.runs_async()`), which run on the same pool.
+
+The pool is bounded (see `DEFAULT_MAX_WORKERS`), so a burst of requests queues instead of starting unbounded threads all contending for the disk and the GIL. It's separate from the event loop's default executor and FastAPI's threadpool, so datamodel work can't starve those either.
+"""
+
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, TypeVar
+
+from typing_extensions import ParamSpec
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Same as the ThreadPoolExecutor default, but fixed up front so it's the bound for the life of the process
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def datamodel_executor() -> ThreadPoolExecutor:
+    """
+    The shared thread pool for blocking datamodel work. Created on first use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="kiln_datamodel"
+            )
+        return _executor
+
+
+async def run_blocking(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    """
+    Run a blocking function on the datamodel thread pool, and await its result. Context variables are copied to the worker thread.
+    """
+    # Imported here, as asyncio is slow to import and sync users of the datamodel never need it
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(datamodel_executor(), call)
+
+
+def blocking_handler(func: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    """
+    Decorator turning a synchronous function into an async one which runs on the datamodel thread pool.
+
+    The signature (parameters and return annotation) is preserved, so FastAPI handlers keep their request parsing and response models:
+
+        @app.get("/api/projects/{project_id}/tasks")
+        @blocking_handler
+        def get_tasks(project_id: str) -> List[Task]:
+            ...
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> R:
+        return await run_blocking(func, *args, **kwargs)
+
+    return wrapper
@@ -1,9 +1,13 @@
 from enum import Enum
-from typing import Annotated, Protocol
+from pathlib import Path
+from typing import Annotated, Dict, List, Protocol
 
 from pydantic import AfterValidator
 
+from kiln_ai.datamodel.basemodel import ID_TYPE
 from kiln_ai.datamodel.task_run import TaskRun
+from kiln_ai.datamodel.task_run_index import TaskRunIndex, TaskRunIndexQuery
+from kiln_ai.utils.exhaustive_error import raise_exhaustive_enum_error
 
 
 class DatasetFilter(Protocol):
@@ -52,6 +56,9 @@ class TagFilter:
     A filter that returns True if the task has a tag matching the given tag.
     """
 
+    # The task run fields this filter reads, see filter_fields
+    fields = ["tags"]
+
     def __init__(self, tag: str):
         self.tag = tag
 
@@ -75,6 +82,58 @@ static_dataset_filters = {
     StaticDatasetFilters.THINKING_MODEL_HIGH_RATED: ThinkingModelHighRatedFilter,
 }
 
+# The task run fields each static filter reads, see filter_fields
+static_dataset_filter_fields: Dict[DatasetFilter, List[str]] = {
+    AllDatasetFilter: [],
+    HighRatingDatasetFilter: ["output", "repaired_output"],
+    ThinkingModelDatasetFilter: ["intermediate_outputs"],
+    ThinkingModelHighRatedFilter: [
+        "intermediate_outputs",
+        "output",
+        "repaired_output",
+    ],
+}
+
+
+def filter_fields(filter: DatasetFilter) -> List[str] | None:
+    """
+    The task run fields a filter reads, or None if unknown (custom filters). Known fields let us run the filter on partial loads.
+    """
+    fields = getattr(filter, "fields", None)
+    if isinstance(fields, list):
+        return fields
+    return static_dataset_filter_fields.get(filter)
+
+
+def filtered_run_ids(task_path: Path | None, filter: DatasetFilter) -> List[ID_TYPE]:
+    """
+    The IDs of the runs of a task which match a filter.
+
+    Tag filters are resolved with the run index's tag index, without loading any runs. Otherwise only loads the fields the filter needs (see KilnBaseModel.load_partial), skipping large fields like intermediate_outputs where we can.
+    """
+    if isinstance(filter, TagFilter):
+        if task_path is None:
+            return []
+        return TaskRunIndex.for_task_path(task_path).run_ids_with_tag(filter.tag)
+
+    fields = filter_fields(filter)
+    if fields is None:
+        runs = TaskRun.iter_children_of_parent_path(
+            task_path, readonly=True, filter=filter
+        )
+        return [run.id for run in runs]
+
+    fields = ["id", *fields]
+    return [
+        run.id
+        for run in (
+            TaskRun.load_partial(path, fields, mtime_ns=mtime_ns)
+            for path, mtime_ns in TaskRun._iterate_children_paths_with_mtime(task_path)
+        )
+        if filter(run)
+    ]
+
+
 DatasetFilterId = Annotated[
     str,
     AfterValidator(lambda v: _check_dataset_filter_id(v)),
@@ -112,3 +171,28 @@ def dataset_filter_from_id(id: DatasetFilterId) -> DatasetFilter:
         return static_dataset_filters[id]
 
     raise ValueError(f"Invalid dataset filter ID: {id}")
+
+
+def add_dataset_filter_to_query(query: TaskRunIndexQuery, id: DatasetFilterId) -> None:
+    """
+    Narrow a run index query to the runs matching a dataset filter, so the filter can be applied in the index instead of loading runs. Combined with the query's existing conditions (AND).
+    """
+    if id.startswith("tag::") and len(id) > 5:
+        query.tags.append(id[5:])
+        return
+
+    if id not in static_dataset_filters:
+        raise ValueError(f"Invalid dataset filter ID: {id}")
+    static_filter = StaticDatasetFilters(id)
+    match static_filter:
+        case StaticDatasetFilters.ALL:
+            pass
+        case StaticDatasetFilters.HIGH_RATING:
+            query.high_quality = True
+        case StaticDatasetFilters.THINKING_MODEL:
+            query.has_thinking = True
+        case StaticDatasetFilters.THINKING_MODEL_HIGH_RATED:
+            query.high_quality = True
+            query.has_thinking = True
+        case _:
+            raise_exhaustive_enum_error(static_filter)
@@ -13,6 +13,7 @@ from kiln_ai.datamodel.dataset_filters import (
     DatasetFilter,
     DatasetFilterId,
     dataset_filter_from_id,
+    filtered_run_ids,
 )
 
 if TYPE_CHECKING:
@@ -120,10 +121,7 @@ class DatasetSplit(KilnParentedModel):
         splits: list[DatasetSplitDefinition],
         filter: DatasetFilter,
     ) -> dict[str, list[str]]:
-        valid_ids = []
-        for task_run in task.runs():
-            if filter(task_run):
-                valid_ids.append(task_run.id)
+        valid_ids = filtered_run_ids(task.path, filter)
 
         # Shuffle and split by split percentage
         random.shuffle(valid_ids)
@@ -161,10 +159,12 @@ class DatasetSplit(KilnParentedModel):
         if parent is None:
             raise ValueError("DatasetSplit has no parent task")
 
-        runs = parent.runs(readonly=True)
-        all_ids = set(run.id for run in runs)
-        all_ids_in_splits = set()
+        missing = set()
         for ids in self.split_contents.values():
-            all_ids_in_splits.update(ids)
-        missing = all_ids_in_splits - all_ids
+            missing.update(ids)
+        # Stream the runs, stopping as soon as every ID in the splits was found
+        for run in parent.iter_runs(readonly=True):
+            missing.discard(run.id)
+            if not missing:
+                break
         return len(missing)
@@ -1,6 +1,6 @@
 import json
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Union
 
 from pydantic import BaseModel, Field, model_validator
 from typing_extensions import Self
@@ -220,6 +220,14 @@ class EvalConfig(KilnParentedModel, KilnParentModel, parent_of={"runs": EvalRun}
     def runs(self, readonly: bool = False) -> list[EvalRun]:
         return super().runs(readonly=readonly)  # type: ignore
 
+    def iter_runs(
+        self,
+        readonly: bool = False,
+        filter: Callable[[EvalRun], bool] | None = None,
+        limit: int | None = None,
+    ) -> Iterator[EvalRun]:
+        return super().iter_runs(readonly=readonly, filter=filter, limit=limit)  # type: ignore
+
     @model_validator(mode="after")
     def validate_properties(self) -> Self:
         if (
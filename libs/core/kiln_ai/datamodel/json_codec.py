@@ -0,0 +1,112 @@
+"""
+JSON codecs for loading model files.
+
+Loading a model file is decode, then validate. The codec decides how:
+ - "stdlib" (default): `json.loads` to a dict, then `model_validate`.
+ - "pydantic": `model_validate_json` on the file text. pydantic-core parses and validates in one pass, without building an intermediate dict.
+ - "orjson": `orjson.loads` to a dict, then `model_validate`. Optional: orjson must be installed separately.
+
+Saving always uses pydantic's `model_dump_json`, whichever codec is selected. It's already implemented in Rust, and files stay byte identical no matter which codec is used.
+
+Select with the `json_codec` setting.
+"""
+
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar, Dict, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from kiln_ai.utils.config import Config
+from kiln_ai.utils.json_projection import load_top_level_keys
+
+M = TypeVar("M", bound=BaseModel)
+
+DEFAULT_JSON_CODEC = "stdlib"
+LOAD_CONTEXT = {"loading_from_file": True}
+
+# model_dump_json writes computed fields (model_type) last, so it's normally at the very end of the file
+_MODEL_TYPE_AT_END = re.compile(r'"model_type"\s*:\s*"([^"\\]*)"\s*}\s*$')
+
+
+class JsonCodec(ABC):
+    """
+    Decodes and validates model files.
+    """
+
+    name: ClassVar[str]
+
+    @abstractmethod
+    def loads(self, text: str) -> Any:
+        pass
+
+    def validate(self, model_type: Type[M], text: str) -> Tuple[M, Any]:
+        """
+        Validate the text of a model file. Returns the model, and the file's `model_type` value (to check it's the expected type).
+        """
+        parsed = self.loads(text)
+        model = model_type.model_validate(parsed, context=LOAD_CONTEXT)
+        return model, parsed.get("model_type")
+
+
+class StdlibJsonCodec(JsonCodec):
+    name = "stdlib"
+
+    def loads(self, text: str) -> Any:
+        return json.loads(text)
+
+
+class PydanticJsonCodec(StdlibJsonCodec):
+    name = "pydantic"
+
+    def validate(self, model_type: Type[M], text: str) -> Tuple[M, Any]:
+        model = model_type.model_validate_json(text, context=LOAD_CONTEXT)
+        # model_type isn't a field (it's computed), so it isn't validated. Read it from the text: usually at the end, otherwise a scan.
+        match = _MODEL_TYPE_AT_END.search(text, max(len(text) - 256, 0))
+        if match is not None:
+            return model, match.group(1)
+        return model, load_top_level_keys(text, ["model_type"]).get("model_type")
+
+
+class OrjsonJsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError as e:
+            raise ValueError(
+                "The orjson JSON codec requires the orjson package. Install it, or change the json_codec setting."
+            ) from e
+        self._loads = orjson.loads
+
+    def loads(self, text: str) -> Any:
+        return self._loads(text)
+
+
+JSON_CODECS: Dict[str, Type[JsonCodec]] = {
+    codec.name: codec for codec in (StdlibJsonCodec, PydanticJsonCodec, OrjsonJsonCodec)
+}
+_codec_instances: Dict[str, JsonCodec] = {}
+
+
+def json_codec_by_name(name: str) -> JsonCodec:
+    codec = _codec_instances.get(name)
+    if codec is None:
+        codec_class = JSON_CODECS.get(name)
+        if codec_class is None:
+            raise ValueError(
+                f"Invalid json_codec setting: {name}. Options: {', '.join(JSON_CODECS)}"
+            )
+        codec = codec_class()
+        _codec_instances[name] = codec
+    return codec
+
+
+def json_codec() -> JsonCodec:
+    """
+    The codec selected in settings.
+    """
+    name = Config.shared().get_value("json_codec")
+    return json_codec_by_name(name if isinstance(name, str) else DEFAULT_JSON_CODEC)
@@ -2,9 +2,6 @@ import json
 import re
 from typing import Annotated, Dict
 
-import jsonschema
-import jsonschema.exceptions
-import jsonschema.validators
 from pydantic import AfterValidator
 
 JsonObjectSchema = Annotated[
@@ -43,6 +40,9 @@ def validate_schema(instance: Dict, schema_str: str) -> None:
         jsonschema.exceptions.ValidationError: If validation fails
         ValueError: If the schema is invalid
     """
+    # Imported on first use, to keep `import kiln_ai.datamodel` fast
+    import jsonschema
+
     try:
         schema = schema_from_json_str(schema_str)
         v = jsonschema.Draft202012Validator(schema)
@@ -65,6 +65,8 @@ def schema_from_json_str(v: str) -> Dict:
     Raises:
         ValueError: If the input is not a valid JSON schema object with required properties
     """
+    import jsonschema
+
     try:
         parsed = json.loads(v)
         jsonschema.Draft202012Validator.check_schema(parsed)
@@ -10,25 +10,92 @@ Keeping this really simple. Our goal is to really be "disk-backed" data model, s
  - Use path as the cache key
  - Cache always populated from a disk read, so we know it refects what's on disk. Even if we had a memory-constructed version, we don't cache that.
  - Cache the parsed model, not the raw file contents. Parsing and validating is what's expensive. >99% speedup when measured.
+ - Cached Kiln models are frozen (assignment raises, but nested lists/dicts aren't frozen). Readonly reads share them, other reads get a deep copy.
+ - Optionally, a file watcher (see model_cache_watcher.py) invalidates entries as files change, letting reads skip the mtime check.
+ - Optionally bounded (entries, approximate bytes, entries per model type) with LRU eviction, so long running servers don't grow forever. Unbounded by default.
+ - Separately caches partial loads (see KilnBaseModel.load_fields), keyed by path and the set of fields loaded. Invalidated along with the path.
+ - Children in packed storage (see packed_storage.py) are keyed by their usual path, validated with the record version instead of the file mtime.
+ - Optionally, a snapshot on disk (see model_cache_snapshot.py) restores entries after a restart. Restored on misses, only if the file's mtime and size still match.
+ - Also keeps a child ID -> path index per relationship folder, built from child folder names (`{id} - {name}`). It's only a hint: callers check the in-file ID of what they load, so it works even when model caching is disabled.
 """
 
 import os
 import sys
+import threading
 import warnings
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Type, TypeVar
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, TypeVar
 
 from pydantic import BaseModel
 
+from kiln_ai.datamodel.packed_storage import packed_file_state
+
+if TYPE_CHECKING:
+    from kiln_ai.datamodel.model_cache_snapshot import ModelCacheSnapshot
+    from kiln_ai.datamodel.model_cache_watcher import ModelCacheWatcher
+
 T = TypeVar("T", bound=BaseModel)
 
 
+class ModelCacheStats(BaseModel):
+    """Counters and current size of the model cache."""
+
+    hits: int = 0
+    misses: int = 0
+    stale_invalidations: int = 0
+    evictions: int = 0
+    snapshot_restores: int = 0
+    entries: int = 0
+    approximate_bytes: int = 0
+    entries_by_type: Dict[str, int] = {}
+    max_entries: int | None = None
+    max_bytes: int | None = None
+    max_entries_per_type: Dict[str, int] = {}
+
+
 class ModelCache:
+    """
+    LRU cache of parsed models, keyed by file path.
+
+    Optionally bounded by entry count, by approximate size in bytes, and by entry count per model type (keyed by class name, e.g. "TaskRun"). Size is approximated with the size of the file the model was loaded from. When any limit is exceeded, the least recently used entries are evicted.
+    """
+
     _shared_instance = None
 
-    def __init__(self):
-        # Store both the model and the modified time of the cached file contents
-        self.model_cache: Dict[Path, Tuple[BaseModel, int]] = {}
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        max_entries_per_type: Dict[str, int] | None = None,
+    ):
+        # Store both the model and the modified time of the cached file contents. Ordered by recency of use (most recent last).
+        self.model_cache: OrderedDict[Path, Tuple[BaseModel, int]] = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entries_per_type = max_entries_per_type or {}
+        self._entry_sizes: Dict[Path, int] = {}
+        self._total_bytes = 0
+        # Per type LRU ordering, so per-type eviction doesn't need to scan the whole cache
+        self._type_entries: Dict[str, OrderedDict[Path, None]] = {}
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._stale_invalidations = 0
+        self._evictions = 0
+        self._snapshot_restores = 0
+        # Incremented on every change to the cached models, so the snapshot writer can skip unchanged caches
+        self._generation = 0
+        # path -> {(model type, fields): (field values, mtime)}. Partial loads, see get_fields.
+        self._field_cache: OrderedDict[
+            Path, Dict[Tuple[str, Tuple[str, ...]], Tuple[Dict[str, Any], int]]
+        ] = OrderedDict()
+        # relationship folder -> {child id: child file path}. See child_path_for_id.
+        self._child_paths: Dict[Path, Dict[str, Path]] = {}
+        # Optional file watcher. Reads of files it covers skip the stat, as it invalidates changed files for us.
+        self.watcher: Optional["ModelCacheWatcher"] = None
+        # Optional snapshot on disk. Misses are restored from it if the file is unchanged.
+        self.snapshot: Optional["ModelCacheSnapshot"] = None
         self._enabled = self._check_timestamp_granularity()
         if not self._enabled:
             warnings.warn(
@@ -39,35 +106,104 @@ class ModelCache:
     @classmethod
     def shared(cls):
         if cls._shared_instance is None:
-            cls._shared_instance = cls()
+            cls._shared_instance = cls(**cls._limits_from_config())
         return cls._shared_instance
 
-    def _is_cache_valid(self, path: Path, cached_mtime_ns: int) -> bool:
-        try:
-            current_mtime_ns = path.stat().st_mtime_ns
-        except Exception:
-            return False
+    @classmethod
+    def _limits_from_config(cls) -> dict:
+        # inline import to avoid circular import
+        from kiln_ai.utils.config import Config
+
+        config = Config.shared()
+        max_entries = config.get_value("model_cache_max_entries")
+        max_bytes = config.get_value("model_cache_max_bytes")
+        per_type = config.get_value("model_cache_max_entries_per_type")
+        return {
+            "max_entries": max_entries if isinstance(max_entries, int) else None,
+            "max_bytes": max_bytes if isinstance(max_bytes, int) else None,
+            "max_entries_per_type": per_type if isinstance(per_type, dict) else None,
+        }
+
+    def _is_cache_valid(
+        self, path: Path, cached_mtime_ns: int, current_mtime_ns: int | None = None
+    ) -> bool:
+        # Callers which already have a fresh stat result (e.g. from a directory scan) pass it in, saving a syscall per file
+        if current_mtime_ns is None:
+            try:
+                current_mtime_ns = path.stat().st_mtime_ns
+            except Exception:
+                # Children in packed storage have no file of their own, their record version stands in for the mtime
+                packed_state = packed_file_state(path)
+                if packed_state is None:
+                    return False
+                current_mtime_ns = packed_state[0]
         return cached_mtime_ns == current_mtime_ns
 
-    def _get_model(self, path: Path, model_type: Type[T]) -> Optional[T]:
-        if path not in self.model_cache:
+    def _get_model(
+        self, path: Path, model_type: Type[T], mtime_ns: int | None = None
+    ) -> Optional[T]:
+        with self._lock:
+            entry = self.model_cache.get(path)
+            if entry is None:
+                return self._restore_from_snapshot(path, model_type)
+            model, cached_mtime_ns = entry
+            watched = (
+                mtime_ns is None
+                and self.watcher is not None
+                and self.watcher.covers(path)
+            )
+            if not watched and not self._is_cache_valid(
+                path, cached_mtime_ns, mtime_ns
+            ):
+                self._stale_invalidations += 1
+                self._misses += 1
+                self.invalidate(path)
+                return None
+
+            if not isinstance(model, model_type):
+                self.invalidate(path)
+                raise ValueError(
+                    f"Model at {path} is not of type {model_type.__name__}"
+                )
+            self._hits += 1
+            self.model_cache.move_to_end(path)
+            self._type_entries[model.__class__.__name__].move_to_end(path)
+            return model
+
+    def _restore_from_snapshot(self, path: Path, model_type: Type[T]) -> Optional[T]:
+        snapshot_entry = self.snapshot.take(path) if self.snapshot else None
+        if snapshot_entry is None:
+            self._misses += 1
             return None
-        model, cached_mtime_ns = self.model_cache[path]
-        if not self._is_cache_valid(path, cached_mtime_ns):
-            self.invalidate(path)
+        model, mtime_ns, size_bytes = snapshot_entry
+        if not isinstance(model, model_type) or not self.set_model(
+            path, model, mtime_ns, size_bytes
+        ):
+            self._misses += 1
             return None
-
-        if not isinstance(model, model_type):
-            self.invalidate(path)
-            raise ValueError(f"Model at {path} is not of type {model_type.__name__}")
+        self._hits += 1
+        self._snapshot_restores += 1
         return model
 
     def get_model(
-        self, path: Path, model_type: Type[T], readonly: bool = False
+        self,
+        path: Path,
+        model_type: Type[T],
+        readonly: bool = False,
+        mtime_ns: int | None = None,
     ) -> Optional[T]:
+        """
+        Get a model from the cache, if present and not stale.
+
+        Args:
+            path: The path of the file the model was loaded from
+            model_type: The expected type of the model
+            readonly: Return the shared cached instance instead of a copy. Kiln models are frozen while cached, so assigning a field raises.
+            mtime_ns: The current mtime of the file, if the caller already has it (e.g. from a directory scan). Otherwise we stat the file.
+        """
         # We return a copy by default, so in-memory edits don't impact the cache until they are saved
         # Benchmark shows about 2x slower, but much more foolproof
-        model = self._get_model(path, model_type)
+        model = self._get_model(path, model_type, mtime_ns)
         if model:
             if readonly:
                 return model
@@ -75,26 +211,268 @@ class ModelCache:
                 return model.model_copy(deep=True)
         return None
 
-    def get_model_id(self, path: Path, model_type: Type[T]) -> Optional[str]:
-        model = self._get_model(path, model_type)
+    def get_fields(
+        self,
+        path: Path,
+        model_type: Type[BaseModel],
+        fields: Tuple[str, ...],
+        mtime_ns: int | None = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the values from a partial load of a file (see KilnBaseModel.load_fields), if present and not stale. Shared, don't mutate.
+        """
+        with self._lock:
+            entries = self._field_cache.get(path)
+            entry = entries.get((model_type.__name__, fields)) if entries else None
+            if entry is None:
+                return None
+            values, cached_mtime_ns = entry
+            watched = (
+                mtime_ns is None
+                and self.watcher is not None
+                and self.watcher.covers(path)
+            )
+            if not watched and not self._is_cache_valid(
+                path, cached_mtime_ns, mtime_ns
+            ):
+                self.invalidate(path)
+                return None
+            self._field_cache.move_to_end(path)
+            return values
+
+    def set_fields(
+        self,
+        path: Path,
+        model_type: Type[BaseModel],
+        fields: Tuple[str, ...],
+        values: Dict[str, Any],
+        mtime_ns: int,
+    ) -> bool:
+        """
+        Cache the values from a partial load of a file. Returns True if cached, False if caching is disabled.
+        """
+        if not self._enabled:
+            return False
+        with self._lock:
+            if self._changed_since_read(path, mtime_ns):
+                return False
+            entries = self._field_cache.setdefault(path, {})
+            # Drop entries from an older version of the file
+            for key in [k for k, (_, m) in entries.items() if m != mtime_ns]:
+                del entries[key]
+            entries[(model_type.__name__, fields)] = (values, mtime_ns)
+            self._field_cache.move_to_end(path)
+            # Partial loads are small, but still bound them by the entry limit
+            while self.max_entries is not None and len(self._field_cache) > max(
+                self.max_entries, 0
+            ):
+                self._field_cache.popitem(last=False)
+        return True
+
+    def get_model_id(
+        self, path: Path, model_type: Type[T], mtime_ns: int | None = None
+    ) -> Optional[str]:
+        model = self._get_model(path, model_type, mtime_ns)
         if model and hasattr(model, "id"):
             id = model.id  # type: ignore
             if isinstance(id, str):
                 return id
         return None
 
-    def set_model(self, path: Path, model: BaseModel, mtime_ns: int):
+    def set_model(
+        self, path: Path, model: BaseModel, mtime_ns: int, size_bytes: int = 0
+    ) -> bool:
+        """
+        Add a model to the cache. Returns True if the model was cached, False if caching is disabled.
+
+        Once cached, the instance is shared with readonly readers and must not be mutated.
+
+        Args:
+            path: The path of the file the model was loaded from
+            model: The parsed model
+            mtime_ns: The modified time of the file when it was read, for cache invalidation
+            size_bytes: The approximate size of the model, used for the max_bytes limit. We use the file size.
+        """
         # disable caching if the filesystem doesn't support fine-grained timestamps
         if not self._enabled:
-            return
-        self.model_cache[path] = (model, mtime_ns)
+            return False
+        with self._lock:
+            self.invalidate(path)
+            if self._changed_since_read(path, mtime_ns):
+                return False
+            self._generation += 1
+            self.model_cache[path] = (model, mtime_ns)
+            self._entry_sizes[path] = size_bytes
+            self._total_bytes += size_bytes
+            type_name = model.__class__.__name__
+            self._type_entries.setdefault(type_name, OrderedDict())[path] = None
+            self._evict(type_name)
+        return True
+
+    def _changed_since_read(self, path: Path, mtime_ns: int) -> bool:
+        """
+        For files the watcher covers: True if the file changed since it was read at mtime_ns.
+
+        Reads of watched files skip the stat, trusting the watcher to invalidate changes. But a change (and its invalidation) can land between a reader reading the file and caching it. Caching that stale model would never be corrected, so re-check before caching. Unwatched files are checked on every read anyway.
+        """
+        if self.watcher is None or not self.watcher.covers(path):
+            return False
+        if self._is_cache_valid(path, mtime_ns):
+            return False
+        self._stale_invalidations += 1
+        return True
+
+    def _evict(self, type_name: str):
+        type_limit = self.max_entries_per_type.get(type_name)
+        if type_limit is not None:
+            type_entries = self._type_entries[type_name]
+            while len(type_entries) > max(type_limit, 0):
+                self._evict_path(next(iter(type_entries)))
+        while self.max_entries is not None and len(self.model_cache) > max(
+            self.max_entries, 0
+        ):
+            self._evict_path(next(iter(self.model_cache)))
+        while self.max_bytes is not None and self._total_bytes > self.max_bytes:
+            if len(self.model_cache) == 0:
+                break
+            self._evict_path(next(iter(self.model_cache)))
+
+    def _evict_path(self, path: Path):
+        self._evictions += 1
+        self.invalidate(path)
 
     def invalidate(self, path: Path):
-        if path in self.model_cache:
-            del self.model_cache[path]
+        with self._lock:
+            self._field_cache.pop(path, None)
+            entry = self.model_cache.pop(path, None)
+            if entry is None:
+                return
+            self._generation += 1
+            self._total_bytes -= self._entry_sizes.pop(path, 0)
+            type_entries = self._type_entries.get(entry[0].__class__.__name__)
+            if type_entries is not None:
+                type_entries.pop(path, None)
+
+    def invalidate_under(self, folder: Path):
+        """
+        Invalidate all entries for files in a folder (recursively).
+        """
+        prefix = str(folder).rstrip(os.sep) + os.sep
+        with self._lock:
+            paths = [p for p in self.model_cache if str(p).startswith(prefix)]
+            paths += [p for p in self._field_cache if str(p).startswith(prefix)]
+            for path in paths:
+                self.invalidate(path)
+
+    def cached_entries(self) -> List[Tuple[Path, int]]:
+        """
+        Snapshot of the cached paths and their cached mtimes.
+        """
+        with self._lock:
+            entries = [
+                (path, mtime_ns) for path, (_, mtime_ns) in self.model_cache.items()
+            ]
+            for path, field_entries in self._field_cache.items():
+                entries.extend(
+                    (path, mtime_ns) for _, mtime_ns in field_entries.values()
+                )
+            return entries
+
+    def snapshot_entries(self) -> List[Tuple[Path, BaseModel, int, int]]:
+        """
+        The cached (path, model, mtime_ns, size_bytes) entries, for writing a snapshot. The models are shared: don't mutate.
+        """
+        with self._lock:
+            return [
+                (path, model, mtime_ns, self._entry_sizes.get(path, 0))
+                for path, (model, mtime_ns) in self.model_cache.items()
+            ]
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def child_path_for_id(self, relationship_folder: Path, id: str) -> Optional[Path]:
+        """
+        Look up the path of a child by ID, in the index for its relationship folder. A hint: the file may have been moved, deleted or edited since.
+        """
+        with self._lock:
+            child_paths = self._child_paths.get(relationship_folder)
+            if child_paths is None:
+                return None
+            return child_paths.get(id)
+
+    def has_child_index(self, relationship_folder: Path) -> bool:
+        with self._lock:
+            return relationship_folder in self._child_paths
+
+    def set_child_index(
+        self, relationship_folder: Path, child_paths: Dict[str, Path]
+    ) -> None:
+        """
+        Replace the child ID index for a relationship folder.
+        """
+        with self._lock:
+            self._child_paths[relationship_folder] = child_paths
+
+    def set_child_path(self, relationship_folder: Path, id: str, path: Path) -> None:
+        """
+        Record a child's path in the index for its relationship folder. No-op if that folder isn't indexed yet: the first lookup builds the full index.
+        """
+        with self._lock:
+            child_paths = self._child_paths.get(relationship_folder)
+            if child_paths is not None:
+                child_paths[id] = path
+
+    def remove_child_path(self, relationship_folder: Path, id: str) -> None:
+        with self._lock:
+            child_paths = self._child_paths.get(relationship_folder)
+            if child_paths is not None:
+                child_paths.pop(id, None)
+
+    def set_watcher(self, watcher: Optional["ModelCacheWatcher"]):
+        self.watcher = watcher
+
+    def set_snapshot(self, snapshot: Optional["ModelCacheSnapshot"]):
+        self.snapshot = snapshot
 
     def clear(self):
-        self.model_cache.clear()
+        with self._lock:
+            self.model_cache.clear()
+            self._field_cache.clear()
+            self._child_paths.clear()
+            self._entry_sizes.clear()
+            self._type_entries.clear()
+            self._total_bytes = 0
+            self._generation += 1
+
+    def stats(self) -> ModelCacheStats:
+        with self._lock:
+            return ModelCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                stale_invalidations=self._stale_invalidations,
+                evictions=self._evictions,
+                snapshot_restores=self._snapshot_restores,
+                entries=len(self.model_cache),
+                approximate_bytes=self._total_bytes,
+                entries_by_type={
+                    type_name: len(paths)
+                    for type_name, paths in self._type_entries.items()
+                    if len(paths) > 0
+                },
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+                max_entries_per_type=dict(self.max_entries_per_type),
+            )
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._stale_invalidations = 0
+            self._evictions = 0
+            self._snapshot_restores = 0
 
     def _check_timestamp_granularity(self) -> bool:
         """Check if filesystem supports fine-grained timestamps (microseconds or better)."""
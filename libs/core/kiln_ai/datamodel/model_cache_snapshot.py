@@ -0,0 +1,307 @@
+"""
+Optional on-disk snapshot of the model cache, so a restart doesn't start cold.
+
+The first visit to each task's dataset page after a restart otherwise pays the full parse and validate cost for every run. With a snapshot, parsed models are pickled to disk (in the background, and at shutdown), and restored on demand after a restart.
+
+ - Entries are keyed by path, with the mtime and size of the file they were loaded from. An entry is only restored if the file still has the same mtime and size (or packed record version and length, see packed_storage.py). Anything else falls through to a normal load from disk.
+ - Loaded lazily: nothing is read until the first cache miss. Entries are moved into the cache as they are asked for, not all at once.
+ - Entries are grouped by model class, along with a fingerprint of the class's schema. A snapshot from a different snapshot format, Kiln or Python version is discarded, as are groups for classes whose schema changed. Corrupt snapshots are discarded (and deleted) with a warning.
+ - Written atomically (temp file and rename), so a crash mid-write leaves the previous snapshot.
+ - Pickle: only ever load snapshots this app wrote, from the user's own settings folder.
+
+Enable with the `model_cache_snapshot` setting.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import pickle
+import sys
+import threading
+import uuid
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as package_version
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Type
+
+from pydantic import VERSION as PYDANTIC_VERSION
+from pydantic import BaseModel
+
+from kiln_ai.datamodel.model_cache import ModelCache
+from kiln_ai.datamodel.packed_storage import packed_file_state
+from kiln_ai.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_FILENAME = "model_cache.snapshot"
+DEFAULT_SAVE_INTERVAL_SECONDS = 300.0
+
+# path -> (model, mtime_ns, size_bytes)
+SnapshotEntries = Dict[Path, Tuple[BaseModel, int, int]]
+
+_fingerprints: Dict[Type[BaseModel], str] = {}
+
+
+def _kiln_version() -> str:
+    try:
+        return package_version("kiln_ai")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _class_key(model_type: Type[BaseModel]) -> str:
+    return f"{model_type.__module__}:{model_type.__qualname__}"
+
+
+def _class_for_key(key: str) -> Type[BaseModel] | None:
+    module_name, _, qualname = key.partition(":")
+    try:
+        value: Any = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            value = getattr(value, name)
+    except (ImportError, AttributeError):
+        return None
+    if isinstance(value, type) and issubclass(value, BaseModel):
+        return value
+    return None
+
+
+def schema_fingerprint(model_type: Type[BaseModel]) -> str:
+    """
+    Hash of a model class's JSON schema (including nested models). Changes when fields are added, removed or retyped.
+    """
+    fingerprint = _fingerprints.get(model_type)
+    if fingerprint is None:
+        try:
+            schema = json.dumps(model_type.model_json_schema(), sort_keys=True)
+        except Exception:
+            # Some field types have no JSON schema. Fall back to the top level fields.
+            schema = repr(
+                sorted(
+                    (name, repr(field.annotation))
+                    for name, field in model_type.model_fields.items()
+                )
+            )
+        fingerprint = hashlib.sha256(schema.encode("utf-8")).hexdigest()
+        _fingerprints[model_type] = fingerprint
+    return fingerprint
+
+
+def _header() -> Dict[str, Any]:
+    return {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "kiln_version": _kiln_version(),
+        "python_version": list(sys.version_info[:2]),
+        "pydantic_version": PYDANTIC_VERSION,
+    }
+
+
+def _current_state(path: Path) -> Tuple[int, int] | None:
+    """The (mtime_ns, size) of a file, or the (version, size) of a packed child. None if neither exists."""
+    try:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return packed_file_state(path)
+
+
+def _detached(model: BaseModel) -> BaseModel:
+    # Parent references are in memory only: don't pickle the whole tree above every child
+    if model.__dict__.get("parent") is None:
+        return model
+    detached = model.model_copy()
+    detached.__dict__["parent"] = None
+    return detached
+
+
+def default_snapshot_path() -> Path:
+    return Path(Config.settings_dir()) / "cache" / SNAPSHOT_FILENAME
+
+
+class ModelCacheSnapshot:
+    """
+    Snapshot file for a ModelCache. Attach with start() (or ModelCache.set_snapshot) and the cache restores entries from it on misses.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        model_cache: ModelCache | None = None,
+        save_interval_seconds: float = DEFAULT_SAVE_INTERVAL_SECONDS,
+    ):
+        self.path = path
+        self.model_cache = model_cache or ModelCache.shared()
+        self.save_interval_seconds = save_interval_seconds
+        # Entries loaded from disk, not yet restored into the cache. None until loaded.
+        self._pending: SnapshotEntries | None = None
+        self._lock = threading.Lock()
+        # Only one save at a time (background thread and shutdown)
+        self._save_lock = threading.Lock()
+        self._saved_generation: int | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _discard(self, reason: str) -> None:
+        logger.warning(f"Discarding model cache snapshot {self.path}: {reason}")
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def load(self) -> SnapshotEntries:
+        """
+        Read the snapshot file. Returns the entries which could be used, dropping anything from other versions. Never raises: a bad snapshot is discarded.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                header = pickle.load(f)
+                if header != _header():
+                    self._discard(f"written by another version ({header})")
+                    return {}
+                groups: Dict[str, Tuple[str, bytes]] = pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self._discard(f"unreadable ({e!r})")
+            return {}
+
+        entries: SnapshotEntries = {}
+        for class_key, (fingerprint, data) in groups.items():
+            model_type = _class_for_key(class_key)
+            if model_type is None or schema_fingerprint(model_type) != fingerprint:
+                logger.info(
+                    f"Skipping model cache snapshot entries for {class_key}: model changed"
+                )
+                continue
+            try:
+                group: List[Tuple[Path, BaseModel, int, int]] = pickle.loads(data)
+            except Exception as e:
+                logger.warning(
+                    f"Skipping unreadable model cache snapshot entries for {class_key}: {e!r}"
+                )
+                continue
+            for path, model, mtime_ns, size in group:
+                entries[path] = (model, mtime_ns, size)
+        return entries
+
+    def take(self, path: Path) -> Tuple[BaseModel, int, int] | None:
+        """
+        Remove and return the snapshot entry for a path, if it still matches the file on disk. Loads the snapshot file on first use.
+
+        Returns:
+            (model, mtime_ns, size_bytes) or None
+        """
+        with self._lock:
+            if self._pending is None:
+                self._pending = self.load()
+            entry = self._pending.pop(path, None)
+        if entry is None:
+            return None
+        _, mtime_ns, size = entry
+        if _current_state(path) != (mtime_ns, size):
+            return None
+        return entry
+
+    def save(self) -> int:
+        """
+        Write the current cache contents to the snapshot file, along with loaded snapshot entries not yet restored (if still valid). Returns the number of entries written.
+        """
+        with self._save_lock:
+            generation = self.model_cache.generation()
+            entries = self.model_cache.snapshot_entries()
+            with self._lock:
+                pending = dict(self._pending or {})
+            cached_paths = {path for path, _, _, _ in entries}
+            for path, (model, mtime_ns, size) in pending.items():
+                if path not in cached_paths and _current_state(path) == (
+                    mtime_ns,
+                    size,
+                ):
+                    entries.append((path, model, mtime_ns, size))
+
+            by_class: Dict[Type[BaseModel], List[Tuple[Path, BaseModel, int, int]]] = {}
+            for path, model, mtime_ns, size in entries:
+                by_class.setdefault(model.__class__, []).append(
+                    (path, _detached(model), mtime_ns, size)
+                )
+            groups: Dict[str, Tuple[str, bytes]] = {}
+            for model_type, group in by_class.items():
+                try:
+                    data = pickle.dumps(group, protocol=pickle.HIGHEST_PROTOCOL)
+                except Exception as e:
+                    logger.warning(
+                        f"Can't snapshot cached {model_type.__name__} models: {e!r}"
+                    )
+                    continue
+                groups[_class_key(model_type)] = (schema_fingerprint(model_type), data)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.parent / f".{self.path.name}.{uuid.uuid4().hex}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(_header(), f, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(groups, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            self._saved_generation = generation
+            return sum(len(group) for group in by_class.values())
+
+    def save_if_changed(self) -> bool:
+        """Save, unless the cache is unchanged since the last save. Returns True if saved."""
+        if self._saved_generation == self.model_cache.generation():
+            return False
+        self.save()
+        return True
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Attach to the cache, and start saving in the background."""
+        self.model_cache.set_snapshot(self)
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=self.__class__.__name__, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, save: bool = True) -> None:
+        """Stop the background writer, and (by default) write a final snapshot."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+        if save:
+            try:
+                self.save_if_changed()
+            except Exception:
+                logger.warning("Failed to save model cache snapshot", exc_info=True)
+        if self.model_cache.snapshot is self:
+            self.model_cache.set_snapshot(None)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.save_interval_seconds):
+            try:
+                self.save_if_changed()
+            except Exception:
+                logger.warning("Failed to save model cache snapshot", exc_info=True)
+
+
+def start_model_cache_snapshot() -> ModelCacheSnapshot | None:
+    """
+    Attach a snapshot to the shared cache and start the background writer, if enabled in settings. Call stop() at shutdown to write a final snapshot.
+    """
+    if Config.shared().get_value("model_cache_snapshot") is not True:
+        return None
+    model_cache = ModelCache.shared()
+    if not model_cache._enabled:
+        # Nothing would be cached, so nothing to snapshot
+        return None
+    snapshot = ModelCacheSnapshot(default_snapshot_path(), model_cache)
+    snapshot.start()
+    return snapshot
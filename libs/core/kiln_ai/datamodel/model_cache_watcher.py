@@ -0,0 +1,312 @@
+"""
+Optional file watchers which invalidate ModelCache entries as files change.
+
+By default the cache stats a file on every read to check it's not stale. With a watcher running, reads of files under the watched folders skip that stat, and the watcher invalidates entries when files change (including external changes like a `git pull` into a project folder).
+
+Two backends:
+ - inotify: Linux only, event driven, via ctypes (no extra dependencies).
+ - polling: portable. A background thread periodically stats the cached files under the watched folders.
+
+Enable with the `model_cache_watcher` setting: "off" (default), "auto" (inotify if available, else polling), "inotify" or "polling".
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List
+
+from kiln_ai.datamodel.model_cache import ModelCache
+from kiln_ai.datamodel.packed_storage import (
+    INDEX_FILENAME,
+    PACKED_FOLDER_NAME,
+    PackedStore,
+)
+from kiln_ai.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ModelCacheWatcher(ABC):
+    """
+    Base class for watchers. Watches a set of root folders, and invalidates cache entries for files under them when they change.
+    """
+
+    def __init__(self, roots: List[Path], model_cache: ModelCache | None = None):
+        self.model_cache = model_cache or ModelCache.shared()
+        self.roots = [os.path.abspath(root) for root in roots]
+        self._root_prefixes = tuple(root.rstrip(os.sep) + os.sep for root in self.roots)
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def covers(self, path: Path) -> bool:
+        """
+        True if changes to this path are reported by this watcher, so the cache can skip checking it.
+        """
+        if not self.running():
+            return False
+        return str(path).startswith(self._root_prefixes)
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self._setup()
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=self.__class__.__name__, daemon=True
+        )
+        self._thread.start()
+        self.model_cache.set_watcher(self)
+
+    def stop(self) -> None:
+        if self.model_cache.watcher is self:
+            self.model_cache.set_watcher(None)
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+        self._teardown()
+
+    def _setup(self) -> None:
+        pass
+
+    def _teardown(self) -> None:
+        pass
+
+    @abstractmethod
+    def _run(self) -> None:
+        pass
+
+
+class PollingModelCacheWatcher(ModelCacheWatcher):
+    """
+    Portable watcher: stats the cached files under the roots every `interval` seconds, off the request path.
+    """
+
+    def __init__(
+        self,
+        roots: List[Path],
+        model_cache: ModelCache | None = None,
+        interval: float = 2.0,
+    ):
+        super().__init__(roots, model_cache)
+        self.interval = interval
+
+    def poll_once(self) -> None:
+        for path, cached_mtime_ns in self.model_cache.cached_entries():
+            if not str(path).startswith(self._root_prefixes):
+                continue
+            if not self.model_cache._is_cache_valid(path, cached_mtime_ns):
+                self.model_cache.invalidate(path)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("Error polling model cache files")
+
+
+# inotify constants, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def inotify_available() -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        return hasattr(libc, "inotify_init1")
+    except OSError:
+        return False
+
+
+class InotifyModelCacheWatcher(ModelCacheWatcher):
+    """
+    Linux watcher using inotify. Adds a watch for every folder under the roots (inotify isn't recursive), and watches new folders as they are created.
+    """
+
+    def __init__(self, roots: List[Path], model_cache: ModelCache | None = None):
+        super().__init__(roots, model_cache)
+        self._fd: int | None = None
+        self._watch_paths: Dict[int, str] = {}
+        self._libc = None
+
+    def _setup(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        self._fd = fd
+        try:
+            for root in self.roots:
+                self._add_watch_recursive(root)
+        except Exception:
+            self._teardown()
+            raise
+
+    def _teardown(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = None
+        self._watch_paths.clear()
+
+    def _add_watch(self, folder: str) -> None:
+        if self._libc is None or self._fd is None:
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                # Removed before we could watch it, nothing to do
+                return
+            # Usually ENOSPC: hit fs.inotify.max_user_watches
+            raise OSError(err, f"inotify_add_watch failed: {os.strerror(err)}")
+        self._watch_paths[wd] = folder
+
+    def _add_watch_recursive(self, folder: str) -> None:
+        for dirpath, _, _ in os.walk(folder):
+            self._add_watch(dirpath)
+
+    def _run(self) -> None:
+        fd = self._fd
+        if fd is None:
+            return
+        while not self._stop_event.is_set():
+            # Timeout so stop() is noticed promptly
+            readable, _, _ = select.select([fd], [], [], 0.5)
+            if not readable:
+                continue
+            try:
+                data = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError:
+                # fd closed by stop()
+                return
+            try:
+                self._handle_events(data)
+            except Exception:
+                logger.exception("Error handling inotify events")
+
+    def _handle_events(self, data: bytes) -> None:
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + name_len].rstrip(b"\0")
+            offset += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                # Lost events: we can't know what changed, drop everything we watch
+                for root in self.roots:
+                    self.model_cache.invalidate_under(Path(root))
+                continue
+
+            folder = self._watch_paths.get(wd)
+            if folder is None:
+                continue
+            if mask & IN_IGNORED:
+                # Watch removed (folder deleted)
+                self._watch_paths.pop(wd, None)
+                continue
+
+            path = os.path.join(folder, os.fsdecode(name)) if name else folder
+            if os.path.basename(folder) == PACKED_FOLDER_NAME:
+                if name == INDEX_FILENAME.encode():
+                    self._handle_packed_index_change(Path(folder).parent)
+            elif mask & IN_ISDIR or not name:
+                self.model_cache.invalidate_under(Path(path))
+                if mask & (IN_CREATE | IN_MOVED_TO) and name:
+                    self._add_watch_recursive(path)
+            else:
+                self.model_cache.invalidate(Path(path))
+
+    def _handle_packed_index_change(self, relationship_folder: Path) -> None:
+        # Packed children are cached by their own paths, which have no file to watch. Invalidate the ones the new index lines touch.
+        store = PackedStore.for_relationship_folder(relationship_folder)
+        if store is not None:
+            changed = store.refresh()
+            if changed is not None:
+                for dirname in changed:
+                    self.model_cache.invalidate(
+                        relationship_folder / dirname / store.base_filename
+                    )
+                return
+        # Store removed, or its index replaced: we can't tell what changed
+        self.model_cache.invalidate_under(relationship_folder)
+
+
+def model_cache_watcher_from_config() -> ModelCacheWatcher | None:
+    """
+    Build (but don't start) the watcher selected by the `model_cache_watcher` setting, watching all project folders. Returns None if disabled.
+    """
+    mode = Config.shared().get_value("model_cache_watcher")
+    if not isinstance(mode, str) or mode == "off":
+        return None
+
+    roots: List[Path] = []
+    project_paths = Config.shared().projects or []
+    for project_path in project_paths:
+        project_folder = Path(project_path).parent
+        if project_folder.is_dir():
+            roots.append(project_folder)
+
+    if mode == "inotify" or (mode == "auto" and inotify_available()):
+        return InotifyModelCacheWatcher(roots)
+    if mode in ("polling", "auto"):
+        return PollingModelCacheWatcher(roots)
+    raise ValueError(f"Invalid model_cache_watcher setting: {mode}")
+
+
+def start_model_cache_watcher() -> ModelCacheWatcher | None:
+    """
+    Start the watcher selected in settings. Falls back to polling if inotify can't be started (for example, too many folders for the inotify watch limit).
+    """
+    watcher = model_cache_watcher_from_config()
+    if watcher is None:
+        return None
+    try:
+        watcher.start()
+    except OSError as e:
+        if not isinstance(watcher, InotifyModelCacheWatcher):
+            raise
+        logger.warning(f"Could not start inotify watcher, falling back to polling: {e}")
+        watcher = PollingModelCacheWatcher([Path(root) for root in watcher.roots])
+        watcher.start()
+    return watcher
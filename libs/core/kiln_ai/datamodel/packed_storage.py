@@ -0,0 +1,509 @@
+"""
+Optional packed storage for large child relationships (e.g. a task with 100k+ runs).
+
+The default layout is one folder and one file per child (`runs/{id} - {name}/task_run.kiln`). It's easy to read, diff and use with git, but huge relationships mean huge numbers of inodes: scans, copies, backups and deletes get very slow.
+
+A packed relationship keeps its children in a few large files, in a hidden folder inside the relationship folder (`runs/.kiln_packed/`):
+ - Segment files (`segment-000001.seg`): child JSON records, appended one after another. Read through mmap.
+ - An offset index (`index.log`): one line per write, `{dirname}\\t{segment}\\t{offset}\\t{length}`. Append only, the last line for a dirname wins. Deletes are a line with segment -1.
+ - `meta.json`: format version, and the filename of the children (e.g. `task_run.kiln`).
+
+Children keep their usual paths, even though the folder doesn't exist on disk. Everything keyed on paths (the model cache, child ID index, run index) works unchanged. The datamodel falls back to the packed store when a child file doesn't exist, so real files always win (e.g. a child added by a `git pull` after packing).
+
+Edits and deletes leave dead bytes in the segments. They are compacted away automatically once they outweigh the live data (see `compact`).
+
+Packed storage is opt-in per relationship: convert with `pack_relationship` and back to folders with `unpack_relationship`. Folder mode remains the default. Only one process should write to a packed relationship at a time.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+if TYPE_CHECKING:
+    from kiln_ai.datamodel.basemodel import KilnParentedModel
+
+PACKED_FOLDER_NAME = ".kiln_packed"
+PACKED_FORMAT_VERSION = 1
+INDEX_FILENAME = "index.log"
+META_FILENAME = "meta.json"
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+# Don't compact for small amounts of dead data, rewriting isn't free
+COMPACT_MIN_DEAD_BYTES = 16 * 1024 * 1024
+PACK_BATCH_SIZE = 1000
+
+
+class PackedRecord(NamedTuple):
+    segment: int
+    offset: int
+    length: int
+
+    @property
+    def version(self) -> int:
+        # Unique per write (segments are append only, and segment numbers are never reused), so it stands in for a file mtime in cache validation
+        return (self.segment << 40) + self.offset
+
+
+def _segment_filename(segment: int) -> str:
+    return f"segment-{segment:06d}.seg"
+
+
+class PackedStore:
+    """
+    The packed children of one relationship folder. Use `PackedStore.for_relationship_folder()` to get an instance.
+    """
+
+    _instances: Dict[Path, "PackedStore"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, relationship_folder: Path, base_filename: str):
+        self.relationship_folder = relationship_folder
+        self.base_filename = base_filename
+        self.store_folder = relationship_folder / PACKED_FOLDER_NAME
+        self.index_path = self.store_folder / INDEX_FILENAME
+        self._lock = threading.RLock()
+        self._records: Dict[str, PackedRecord] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        # Identity and read position of the index file, to replay only new lines on refresh
+        self._index_id: Tuple[int, int] | None = None
+        self._index_offset = 0
+        self._last_segment = 0
+        self._live_bytes = 0
+        self._dead_bytes = 0
+
+    @classmethod
+    def for_relationship_folder(cls, folder: Path) -> Optional["PackedStore"]:
+        """
+        Get the packed store for a relationship folder, or None if the relationship isn't packed.
+        """
+        store_folder = folder / PACKED_FOLDER_NAME
+        # Checked every call (not cached) so conversions by other processes are noticed. Only called when a file is missing, and on scans and saves.
+        if not os.path.isdir(store_folder):
+            with cls._instances_lock:
+                cls._instances.pop(folder, None)
+            return None
+        with cls._instances_lock:
+            store = cls._instances.get(folder)
+            if store is None:
+                try:
+                    with open(store_folder / META_FILENAME, "r", encoding="utf-8") as f:
+                        meta = json.load(f)
+                except FileNotFoundError:
+                    # Still being created
+                    return None
+                if meta.get("v", 1) > PACKED_FORMAT_VERSION:
+                    raise ValueError(
+                        f"Packed storage at {store_folder} is a newer format. Upgrade kiln to the latest version."
+                    )
+                store = cls(folder, meta["base_filename"])
+                cls._instances[folder] = store
+            return store
+
+    @classmethod
+    def for_model_path(cls, path: Path) -> Optional["PackedStore"]:
+        """
+        Get the packed store which would hold this child path (relationship/{dirname}/{base_filename}), or None.
+        """
+        store = cls.for_relationship_folder(path.parent.parent)
+        if store is None or store.base_filename != path.name:
+            return None
+        return store
+
+    @classmethod
+    def create(cls, relationship_folder: Path, base_filename: str) -> "PackedStore":
+        existing = cls.for_relationship_folder(relationship_folder)
+        if existing is not None:
+            if existing.base_filename != base_filename:
+                raise ValueError(
+                    f"Packed storage at {relationship_folder} holds {existing.base_filename}, not {base_filename}"
+                )
+            return existing
+        store_folder = relationship_folder / PACKED_FOLDER_NAME
+        store_folder.mkdir(parents=True, exist_ok=True)
+        (store_folder / INDEX_FILENAME).touch()
+        # meta last: its presence marks the store as ready
+        meta = {"v": PACKED_FORMAT_VERSION, "base_filename": base_filename}
+        (store_folder / META_FILENAME).write_text(json.dumps(meta), encoding="utf-8")
+        store = cls.for_relationship_folder(relationship_folder)
+        if store is None:
+            raise ValueError(f"Failed to create packed storage at {store_folder}")
+        return store
+
+    def _close_maps(self) -> None:
+        for segment_map in self._maps.values():
+            segment_map.close()
+        self._maps.clear()
+
+    def _reset(self) -> None:
+        self._close_maps()
+        self._records = {}
+        self._index_id = None
+        self._index_offset = 0
+        self._live_bytes = 0
+        self._dead_bytes = 0
+        self._last_segment = 0
+        if self.store_folder.is_dir():
+            for name in os.listdir(self.store_folder):
+                if name.startswith("segment-") and name.endswith(".seg"):
+                    self._last_segment = max(self._last_segment, int(name[8:14]))
+
+    def _apply_line(self, line: str) -> str:
+        dirname, segment, offset, length = line.split("\t")
+        old = self._records.pop(dirname, None)
+        if old is not None:
+            self._live_bytes -= old.length
+            self._dead_bytes += old.length
+        segment_number = int(segment)
+        if segment_number >= 0:
+            record = PackedRecord(segment_number, int(offset), int(length))
+            self._records[dirname] = record
+            self._live_bytes += record.length
+            self._last_segment = max(self._last_segment, segment_number)
+        return dirname
+
+    def refresh(self) -> List[str] | None:
+        """
+        Catch up with writes to the index (by us or another process). Only new lines are read, unless the index was replaced (compacted).
+
+        Returns the dirnames of children changed since the last refresh, or None if everything was reloaded.
+        """
+        with self._lock:
+            try:
+                index_stat = os.stat(self.index_path)
+            except FileNotFoundError:
+                self._reset()
+                return None
+            changed: List[str] | None = []
+            index_id = (index_stat.st_dev, index_stat.st_ino)
+            if index_id != self._index_id or index_stat.st_size < self._index_offset:
+                self._reset()
+                self._index_id = index_id
+                changed = None
+            if index_stat.st_size == self._index_offset:
+                return changed
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_offset)
+                data = f.read()
+            # Ignore a trailing partial line (a write in progress, or a crash mid write)
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].decode("utf-8").splitlines():
+                if line:
+                    dirname = self._apply_line(line)
+                    if changed is not None:
+                        changed.append(dirname)
+            self._index_offset += end
+            return changed
+
+    def record(self, dirname: str) -> PackedRecord | None:
+        with self._lock:
+            self.refresh()
+            return self._records.get(dirname)
+
+    def entries(self) -> Dict[str, PackedRecord]:
+        """
+        All live records, by child dirname.
+        """
+        with self._lock:
+            self.refresh()
+            return dict(self._records)
+
+    def read(self, dirname: str) -> Tuple[bytes, PackedRecord]:
+        """
+        Read a child's JSON.
+
+        Raises:
+            FileNotFoundError: If the child isn't in the store
+        """
+        with self._lock:
+            record = self.record(dirname)
+            if record is None:
+                raise FileNotFoundError(
+                    f"{dirname}/{self.base_filename} not found in packed storage at {self.store_folder}"
+                )
+            return self._read_record(record), record
+
+    def _read_record(self, record: PackedRecord) -> bytes:
+        with self._lock:
+            end = record.offset + record.length
+            segment_map = self._maps.get(record.segment)
+            if segment_map is None or len(segment_map) < end:
+                # Not mapped yet, or the segment grew since we mapped it
+                if segment_map is not None:
+                    segment_map.close()
+                segment_path = self.store_folder / _segment_filename(record.segment)
+                with open(segment_path, "rb") as f:
+                    segment_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[record.segment] = segment_map
+            return segment_map[record.offset : end]
+
+    def _append_index(self, lines: List[str]) -> None:
+        with open(self.index_path, "a", encoding="utf-8", newline="\n") as f:
+            f.write("".join(lines))
+
+    def write_many(self, items: Sequence[Tuple[str, bytes]]) -> None:
+        """
+        Append (dirname, json) records. Replaces any existing record for the same dirname.
+        """
+        if not items:
+            return
+        with self._lock:
+            self.refresh()
+            lines: List[str] = []
+            segment = max(self._last_segment, 1)
+            segment_file = open(self.store_folder / _segment_filename(segment), "ab")
+            try:
+                offset = segment_file.tell()
+                for dirname, data in items:
+                    if offset > 0 and offset + len(data) > SEGMENT_MAX_BYTES:
+                        segment_file.close()
+                        segment += 1
+                        segment_file = open(
+                            self.store_folder / _segment_filename(segment), "ab"
+                        )
+                        offset = 0
+                    # Newline between records: not needed for reads, but keeps segments greppable
+                    segment_file.write(data + b"\n")
+                    lines.append(f"{dirname}\t{segment}\t{offset}\t{len(data)}\n")
+                    offset += len(data) + 1
+            finally:
+                segment_file.close()
+            # Data first, then the index: a crash between the two leaves unreferenced bytes, never a bad index entry
+            self._append_index(lines)
+            self.refresh()
+            self._maybe_compact()
+
+    def write(self, dirname: str, data: bytes) -> None:
+        self.write_many([(dirname, data)])
+
+    def delete(self, dirname: str) -> bool:
+        """
+        Remove a child. Returns False if it wasn't in the store.
+        """
+        return self.delete_many([dirname])[0]
+
+    def delete_many(self, dirnames: Sequence[str]) -> List[bool]:
+        """
+        Remove children, with a single index write. Returns whether each was in the store.
+        """
+        with self._lock:
+            self.refresh()
+            deleted = [dirname in self._records for dirname in dirnames]
+            lines = [
+                f"{dirname}\t-1\t0\t0\n"
+                for dirname in dict.fromkeys(dirnames)
+                if dirname in self._records
+            ]
+            if lines:
+                self._append_index(lines)
+                self.refresh()
+                self._maybe_compact()
+            return deleted
+
+    def dead_bytes(self) -> int:
+        """
+        Bytes in segments used by edited or deleted records, reclaimed by compact().
+        """
+        with self._lock:
+            self.refresh()
+            return self._dead_bytes
+
+    def _maybe_compact(self) -> None:
+        if self._dead_bytes > COMPACT_MIN_DEAD_BYTES and (
+            self._dead_bytes > self._live_bytes
+        ):
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Rewrite the live records into new segments, and drop the old ones. Record versions change, so cached copies of these children are reloaded on next use.
+        """
+        with self._lock:
+            self.refresh()
+            old_segments = [
+                name
+                for name in os.listdir(self.store_folder)
+                if name.startswith("segment-") and name.endswith(".seg")
+            ]
+            # In file order, so reads during the rewrite are sequential
+            records = sorted(
+                self._records.items(),
+                key=lambda item: (item[1].segment, item[1].offset),
+            )
+            segment = self._last_segment + 1
+            segment_file = open(self.store_folder / _segment_filename(segment), "wb")
+            lines: List[str] = []
+            try:
+                offset = 0
+                for dirname, record in records:
+                    data = self._read_record(record)
+                    if offset > 0 and offset + len(data) > SEGMENT_MAX_BYTES:
+                        segment_file.close()
+                        segment += 1
+                        segment_file = open(
+                            self.store_folder / _segment_filename(segment), "wb"
+                        )
+                        offset = 0
+                    segment_file.write(data + b"\n")
+                    lines.append(f"{dirname}\t{segment}\t{offset}\t{len(data)}\n")
+                    offset += len(data) + 1
+            finally:
+                segment_file.close()
+
+            tmp_index_path = self.index_path.with_name(INDEX_FILENAME + ".tmp")
+            with open(tmp_index_path, "w", encoding="utf-8", newline="\n") as f:
+                f.write("".join(lines))
+            os.replace(tmp_index_path, self.index_path)
+            self._close_maps()
+            for name in old_segments:
+                try:
+                    os.remove(self.store_folder / name)
+                except OSError:
+                    # Windows won't remove files another process has mapped. Unreferenced, so harmless: removed by a later compaction.
+                    pass
+            self.refresh()
+
+    def destroy(self) -> None:
+        """
+        Delete the store and everything in it.
+        """
+        with self._lock:
+            self._close_maps()
+            shutil.rmtree(self.store_folder, ignore_errors=True)
+            self._reset()
+        with PackedStore._instances_lock:
+            if PackedStore._instances.get(self.relationship_folder) is self:
+                del PackedStore._instances[self.relationship_folder]
+
+
+def packed_child_paths(
+    relationship_folder: Path, base_filename: str
+) -> Iterator[Tuple[Path, PackedRecord]]:
+    """
+    Yields (child path, record) for each packed child in a relationship folder. Nothing if it isn't packed.
+    """
+    store = PackedStore.for_relationship_folder(relationship_folder)
+    if store is None or store.base_filename != base_filename:
+        return
+    for dirname, record in store.entries().items():
+        yield relationship_folder / dirname / base_filename, record
+
+
+def packed_file_state(path: Path) -> Tuple[int, int] | None:
+    """
+    The (version, size) of a packed child, standing in for a file's (mtime_ns, size). None if the path isn't a packed child.
+    """
+    store = PackedStore.for_model_path(path)
+    if store is None:
+        return None
+    record = store.record(path.parent.name)
+    if record is None:
+        return None
+    return record.version, record.length
+
+
+def pack_relationship(child_type: Type["KilnParentedModel"], parent_path: Path) -> int:
+    """
+    Convert a relationship from the folder layout to packed storage. Child paths don't change.
+
+    Child files are moved into the store, and their folders removed if nothing else is in them. Only for children without children of their own (packed children have no real folder to hold them).
+
+    Returns the number of children packed.
+    """
+    # inline import to avoid circular import
+    from kiln_ai.datamodel.basemodel import KilnParentModel, is_leftover_folder_name
+    from kiln_ai.datamodel.model_cache import ModelCache
+
+    if issubclass(child_type, KilnParentModel):
+        raise ValueError(
+            f"{child_type.__name__} has children of its own, so it can't use packed storage"
+        )
+    relationship_folder = child_type._relationship_folder(parent_path)
+    base_filename = child_type.base_filename()
+    store = PackedStore.create(relationship_folder, base_filename)
+
+    child_files: List[Path] = []
+    with os.scandir(relationship_folder) as entries:
+        for entry in entries:
+            if (
+                entry.name == PACKED_FOLDER_NAME
+                or not entry.is_dir()
+                or is_leftover_folder_name(entry.name)
+            ):
+                continue
+            child_file = Path(entry.path) / base_filename
+            if child_file.is_file():
+                child_files.append(child_file)
+
+    for start in range(0, len(child_files), PACK_BATCH_SIZE):
+        batch = child_files[start : start + PACK_BATCH_SIZE]
+        items = []
+        for child_file in batch:
+            # Compact JSON: pretty printing is for humans reading files, not segments
+            data = json.loads(child_file.read_text(encoding="utf-8"))
+            items.append(
+                (
+                    child_file.parent.name,
+                    json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(
+                        "utf-8"
+                    ),
+                )
+            )
+        store.write_many(items)
+        # Only remove files once they're safely in the store
+        for child_file in batch:
+            child_file.unlink()
+            try:
+                child_file.parent.rmdir()
+            except OSError:
+                # Other files in the folder, keep it
+                pass
+
+    ModelCache.shared().invalidate_under(relationship_folder)
+    return len(child_files)
+
+
+def unpack_relationship(
+    child_type: Type["KilnParentedModel"], parent_path: Path
+) -> int:
+    """
+    Convert a packed relationship back to the default folder layout (one folder and file per child). Child paths don't change.
+
+    Returns the number of children written to folders.
+    """
+    # inline import to avoid circular import
+    from kiln_ai.datamodel.model_cache import ModelCache
+
+    relationship_folder = child_type._relationship_folder(parent_path)
+    store = PackedStore.for_relationship_folder(relationship_folder)
+    if store is None:
+        return 0
+    count = 0
+    for dirname in store.entries():
+        child_file = relationship_folder / dirname / store.base_filename
+        if child_file.exists():
+            # Real files win over packed records, so this one was already the live copy
+            continue
+        data, _ = store.read(dirname)
+        child_file.parent.mkdir(parents=True, exist_ok=True)
+        # Same formatting as save_to_file
+        child_file.write_text(
+            json.dumps(json.loads(data), indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        count += 1
+    store.destroy()
+    ModelCache.shared().invalidate_under(relationship_folder)
+    return count
@@ -0,0 +1,194 @@
+"""
+Parallel loading of many model files, for cold cache loads of large folders (e.g. a task with 100k runs).
+
+Loading a model is: read the file, decode the JSON, then validate with pydantic. Done one at a time that's one core, mostly waiting on disk or the GIL.
+
+ - Small batches (below `parallel_load_threshold` uncached files) load serially: pool overhead isn't worth it.
+ - Medium batches read in a thread pool (file IO releases the GIL), and decode and validate in the calling thread.
+ - Very large batches (above `parallel_load_process_threshold`) read, decode and validate in a process pool. Workers send back the validated models, which is much cheaper to unpickle than to validate.
+
+Process pools use spawn. In a frozen app (e.g. the PyInstaller desktop build), spawned workers re-run the app's entry point unless it calls `freeze_support()` first, so frozen apps which haven't called it fall back to threads.
+
+Results are always added to the ModelCache in the calling process, exactly as `load_from_file` would.
+
+`iter_models` streams the same loads in batches, for callers which make one pass and don't need every model in memory at once.
+"""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from kiln_ai.datamodel.basemodel import read_model_file
+from kiln_ai.utils.config import Config
+
+if TYPE_CHECKING:
+    from kiln_ai.datamodel.basemodel import KilnBaseModel
+
+T = TypeVar("T", bound="KilnBaseModel")
+
+DEFAULT_THREAD_THRESHOLD = 256
+DEFAULT_PROCESS_THRESHOLD = 20000
+# Large enough for the thread pool to kick in on cold folders
+DEFAULT_STREAM_BATCH_SIZE = 1024
+# First streamed batch. Batches double up to the batch size, so callers stopping early don't wait on a big batch.
+FIRST_STREAM_BATCH_SIZE = 16
+
+
+# Set by freeze_support(). Frozen apps only use process pools once it's been called.
+_freeze_support_enabled = False
+
+
+def freeze_support() -> None:
+    """
+    Call multiprocessing.freeze_support() and allow process pools in a frozen app. Must be called first thing in the app's main.
+    """
+    global _freeze_support_enabled
+    multiprocessing.freeze_support()
+    _freeze_support_enabled = True
+
+
+def process_pool_available() -> bool:
+    """
+    False in a frozen app which hasn't called freeze_support(): spawned workers would start the app again instead of loading.
+    """
+    return _freeze_support_enabled or not getattr(sys, "frozen", False)
+
+
+def _config_int(name: str, default: int) -> int:
+    value = Config.shared().get_value(name)
+    return value if isinstance(value, int) else default
+
+
+def parallel_load_settings() -> Tuple[int, int, int]:
+    """
+    Returns (thread threshold, process threshold, worker count) from settings.
+    """
+    thread_threshold = _config_int("parallel_load_threshold", DEFAULT_THREAD_THRESHOLD)
+    process_threshold = _config_int(
+        "parallel_load_process_threshold", DEFAULT_PROCESS_THRESHOLD
+    )
+    workers = _config_int("parallel_load_workers", os.cpu_count() or 1)
+    return thread_threshold, process_threshold, max(workers, 1)
+
+
+def _load_in_worker(cls: Type[T], path: Path) -> Tuple[T, int, int]:
+    # Runs in a worker process
+    text, mtime_ns, size = read_model_file(path)
+    return cls._model_from_text(path, text), mtime_ns, size
+
+
+def load_models(
+    cls: Type[T],
+    paths: Sequence[Tuple[Path, int | None]],
+    readonly: bool = False,
+) -> List[T]:
+    """
+    Load many model files of the same type, in order. Cached files come from the cache, the rest are loaded in parallel if there are enough of them.
+
+    Args:
+        cls: The model type to load
+        paths: (path, mtime_ns) pairs. The mtime is optional, and used to validate the cache without a stat (see load_from_file).
+        readonly: As in load_from_file
+    """
+    thread_threshold, process_threshold, workers = parallel_load_settings()
+    if len(paths) < thread_threshold:
+        return [
+            cls.load_from_file(path, readonly=readonly, mtime_ns=mtime_ns)
+            for path, mtime_ns in paths
+        ]
+
+    results: List[Any] = [None] * len(paths)
+    misses: List[int] = []
+    for i, (path, mtime_ns) in enumerate(paths):
+        cached_model = cls._load_from_cache(path, readonly, mtime_ns)
+        if cached_model is None:
+            misses.append(i)
+        else:
+            results[i] = cached_model
+
+    miss_paths = [paths[i][0] for i in misses]
+    if len(misses) < thread_threshold or workers == 1:
+        loaded = [cls._load_uncached(path, readonly) for path in miss_paths]
+    elif len(misses) >= process_threshold and process_pool_available():
+        loaded = _load_with_processes(cls, miss_paths, readonly, workers)
+    else:
+        loaded = _load_with_threads(cls, miss_paths, readonly, workers)
+
+    for i, model in zip(misses, loaded):
+        results[i] = model
+    return results
+
+
+def iter_models(
+    cls: Type[T],
+    paths: Iterable[Tuple[Path, int | None]],
+    readonly: bool = False,
+    batch_size: int = DEFAULT_STREAM_BATCH_SIZE,
+) -> Iterator[T]:
+    """
+    Load many model files of the same type, in order, yielding them as they load. Memory is bounded by the batch size: paths are consumed lazily, and each batch is loaded with load_models.
+
+    Args:
+        cls: The model type to load
+        paths: (path, mtime_ns) pairs, as in load_models. Can be a generator.
+        readonly: As in load_from_file
+        batch_size: Maximum number of models loaded at once.
+    """
+    batch: List[Tuple[Path, int | None]] = []
+    batch_limit = min(FIRST_STREAM_BATCH_SIZE, batch_size)
+    for path in paths:
+        batch.append(path)
+        if len(batch) >= batch_limit:
+            yield from load_models(cls, batch, readonly=readonly)
+            batch = []
+            batch_limit = min(batch_limit * 2, batch_size)
+    if batch:
+        yield from load_models(cls, batch, readonly=readonly)
+
+
+def _load_with_threads(
+    cls: Type[T], paths: List[Path], readonly: bool, workers: int
+) -> List[T]:
+    loaded = []
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="kiln_load"
+    ) as executor:
+        # map preserves order, and re-raises the first error in order (same as a serial load)
+        for path, (text, mtime_ns, size) in zip(
+            paths, executor.map(read_model_file, paths)
+        ):
+            model = cls._model_from_text(path, text)
+            loaded.append(cls._add_to_cache(path, model, mtime_ns, size, readonly))
+    return loaded
+
+
+def _load_with_processes(
+    cls: Type[T], paths: List[Path], readonly: bool, workers: int
+) -> List[T]:
+    loaded = []
+    # spawn, not fork: the server has other threads running, forking them isn't safe
+    context = multiprocessing.get_context("spawn")
+    # Big chunks: per-item IPC would cost more than the validation we're moving
+    chunksize = max(len(paths) // (workers * 4), 1)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        for path, (model, mtime_ns, size) in zip(
+            paths,
+            executor.map(
+                _load_in_worker, [cls] * len(paths), paths, chunksize=chunksize
+            ),
+        ):
+            loaded.append(cls._add_to_cache(path, model, mtime_ns, size, readonly))
+    return loaded
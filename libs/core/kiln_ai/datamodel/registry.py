@@ -1,31 +1,145 @@
-from kiln_ai.datamodel import Project
+"""
+Find projects (and their tasks) by ID.
+
+Projects are listed by path in the `projects` setting, so finding one by ID means loading project files until the ID matches. That's on the path of nearly every API request, so the ProjectRegistry remembers project ID -> path, and (project ID, task ID) -> task path. A lookup is then a dict lookup and one (cached) file load.
+
+Paths are only hints. The loaded model's ID is the source of truth: if it doesn't match (file replaced, task deleted, etc.) we fall back to searching. Both maps are cleared when the `projects` setting changes.
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from kiln_ai.datamodel import Project, Task
 from kiln_ai.utils.config import Config
 
 
-def all_projects() -> list[Project]:
-    project_paths = Config.shared().projects
-    if project_paths is None:
-        return []
-    projects = []
-    for project_path in project_paths:
-        try:
-            projects.append(Project.load_from_file(project_path))
-        except Exception:
-            # deleted files are possible continue with the rest
-            continue
-    return projects
+class ProjectRegistry:
+    _shared_instance = None
 
+    def __init__(self):
+        self._lock = threading.Lock()
+        # The `projects` setting the maps below were built from
+        self._project_list: Tuple[str, ...] | None = None
+        self._project_paths: Dict[str, str] = {}
+        self._task_paths: Dict[Tuple[str, str], Path] = {}
 
-def project_from_id(project_id: str) -> Project | None:
-    project_paths = Config.shared().projects
-    if project_paths is not None:
-        for project_path in project_paths:
+    @classmethod
+    def shared(cls):
+        if cls._shared_instance is None:
+            cls._shared_instance = cls()
+        return cls._shared_instance
+
+    def clear(self) -> None:
+        with self._lock:
+            self._project_list = None
+            self._project_paths.clear()
+            self._task_paths.clear()
+
+    def _current_project_paths(self) -> List[str]:
+        """The `projects` setting. Clears the maps if it changed since they were built."""
+        project_paths = Config.shared().projects
+        if not isinstance(project_paths, list):
+            project_paths = []
+        project_list = tuple(project_paths)
+        with self._lock:
+            if project_list != self._project_list:
+                self._project_list = project_list
+                self._project_paths.clear()
+                self._task_paths.clear()
+        return project_paths
+
+    def _remember_project(self, project: Project, project_path: str) -> None:
+        if project.id is not None:
+            with self._lock:
+                self._project_paths[project.id] = project_path
+
+    def all_projects(self) -> list[Project]:
+        projects = []
+        for project_path in self._current_project_paths():
             try:
                 project = Project.load_from_file(project_path)
+            except Exception:
+                # deleted files are possible continue with the rest
+                continue
+            self._remember_project(project, project_path)
+            projects.append(project)
+        return projects
+
+    def project_from_id(self, project_id: str) -> Project | None:
+        project_paths = self._current_project_paths()
+        with self._lock:
+            known_path = self._project_paths.get(project_id)
+        if known_path is not None:
+            try:
+                project = Project.load_from_file(known_path)
                 if project.id == project_id:
                     return project
+            except Exception:
+                pass
+            with self._lock:
+                self._project_paths.pop(project_id, None)
+
+        # Not known, or moved. Check every project.
+        for project_path in project_paths:
+            if project_path == known_path:
+                continue
+            try:
+                project = Project.load_from_file(project_path)
             except Exception:
                 # deleted files are possible continue with the rest
                 continue
+            self._remember_project(project, project_path)
+            if project.id == project_id:
+                return project
+        return None
+
+    def cached_task(self, project_id: str, task_id: str) -> Task | None:
+        """
+        The task, if we know its path from a previous lookup and it's still there. None otherwise: find it through its project, then call remember_task.
+        """
+        self._current_project_paths()
+        with self._lock:
+            task_path = self._task_paths.get((project_id, task_id))
+        if task_path is None:
+            return None
+        try:
+            task = Task.load_from_file(task_path)
+            if task.id == task_id:
+                return task
+        except Exception:
+            pass
+        with self._lock:
+            self._task_paths.pop((project_id, task_id), None)
+        return None
+
+    def remember_task(self, project_id: str, task: Task) -> None:
+        if task.id is None or task.path is None:
+            return
+        self._current_project_paths()
+        with self._lock:
+            self._task_paths[(project_id, task.id)] = task.path
+
+    def task_from_id(self, project_id: str, task_id: str) -> Task | None:
+        task = self.cached_task(project_id, task_id)
+        if task is not None:
+            return task
+        project = self.project_from_id(project_id)
+        if project is None:
+            return None
+        task = Task.from_id_and_parent_path(task_id, project.path)
+        if task is not None:
+            self.remember_task(project_id, task)
+        return task
+
+
+def all_projects() -> list[Project]:
+    return ProjectRegistry.shared().all_projects()
+
+
+def project_from_id(project_id: str) -> Project | None:
+    return ProjectRegistry.shared().project_from_id(project_id)
+
 
-    return None
+def task_from_id(project_id: str, task_id: str) -> Task | None:
+    return ProjectRegistry.shared().task_from_id(project_id, task_id)
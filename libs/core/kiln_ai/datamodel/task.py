@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Dict, List, Union
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Union
 
 from pydantic import BaseModel, Field
 
@@ -159,6 +159,17 @@ class Task(
     def runs(self, readonly: bool = False) -> list[TaskRun]:
         return super().runs(readonly=readonly)  # type: ignore
 
+    def iter_runs(
+        self,
+        readonly: bool = False,
+        filter: Callable[[TaskRun], bool] | None = None,
+        limit: int | None = None,
+    ) -> Iterator[TaskRun]:
+        return super().iter_runs(readonly=readonly, filter=filter, limit=limit)  # type: ignore
+
+    async def runs_async(self, readonly: bool = False) -> list[TaskRun]:
+        return await super().runs_async(readonly=readonly)  # type: ignore
+
     def dataset_splits(self, readonly: bool = False) -> list[DatasetSplit]:
         return super().dataset_splits(readonly=readonly)  # type: ignore
 
@@ -1,9 +1,7 @@
 import json
 from enum import Enum
-from typing import TYPE_CHECKING, Dict, List, Type, Union
+from typing import TYPE_CHECKING, ClassVar, Dict, List, Type, Union
 
-import jsonschema
-import jsonschema.exceptions
 from pydantic import BaseModel, Field, ValidationInfo, model_validator
 from typing_extensions import Self
 
@@ -202,7 +200,8 @@ class DataSource(BaseModel):
         description="Properties describing the data source. For synthetic things like model. For human, the human's name.",
     )
 
-    _data_source_properties = [
+    # ClassVar, not a private attribute: private attribute defaults are deep copied for every instance
+    _data_source_properties: ClassVar[List[DataSourceProperty]] = [
         DataSourceProperty(
             name="created_by",
             type=str,
@@ -307,6 +306,8 @@ class TaskOutput(KilnBaseModel):
     def validate_output_format(self, task: "Task") -> Self:
         # validate output
         if task.output_json_schema is not None:
+            import jsonschema.exceptions
+
             try:
                 validate_schema(json.loads(self.output), task.output_json_schema)
             except json.JSONDecodeError:
@@ -1,8 +1,7 @@
 import json
-from typing import TYPE_CHECKING, Dict, List, Union
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple, Union
 
-import jsonschema
-import jsonschema.exceptions
 from pydantic import Field, ValidationInfo, model_validator
 from typing_extensions import Self
 
@@ -52,12 +51,11 @@ class TaskRun(KilnParentedModel):
         """
         Does this run have thinking data that we can use to train a thinking model?
         """
-        if self.intermediate_outputs is None:
+        # Only needs the keys, so it works on partial loads of just the keys (see load_partial keys_only)
+        keys = self.field_keys("intermediate_outputs")
+        if keys is None:
             return False
-        return (
-            "chain_of_thought" in self.intermediate_outputs
-            or "reasoning" in self.intermediate_outputs
-        )
+        return "chain_of_thought" in keys or "reasoning" in keys
 
     # Workaround to return typed parent without importing Task
     def parent_task(self) -> Union["Task", None]:
@@ -65,6 +63,66 @@ class TaskRun(KilnParentedModel):
             return None
         return self.parent  # type: ignore
 
+    def _did_save(self, path: Path) -> None:
+        super()._did_save(path)
+        # inline import to avoid circular import
+        from kiln_ai.datamodel.task_run_index import TaskRunIndex
+
+        index = TaskRunIndex.existing_for_run_path(path)
+        if index is not None:
+            index.update_run(path, self)
+
+    @classmethod
+    def _did_save_many(
+        cls, models: Sequence[Self], paths: Sequence[Path]
+    ) -> List[Exception | None]:
+        # inline import to avoid circular import
+        from kiln_ai.datamodel.task_run_index import TaskRunIndex
+
+        errors: List[Exception | None] = []
+        for run, path in zip(models, paths):
+            try:
+                # Bookkeeping from the base classes, but not the index update in our _did_save: done below, batched
+                super(TaskRun, run)._did_save(path)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+
+        # One index transaction per task, not one per run. Runs are grouped by their runs folder.
+        runs_by_folder: Dict[Path, List[Tuple[Path, TaskRun]]] = {}
+        for run, path, error in zip(models, paths, errors):
+            if error is None:
+                runs_by_folder.setdefault(path.parent.parent, []).append((path, run))
+        for saved_runs in runs_by_folder.values():
+            index = TaskRunIndex.existing_for_run_path(saved_runs[0][0])
+            if index is not None:
+                index.update_runs(saved_runs)
+        return errors
+
+    @classmethod
+    def _did_delete_many(cls, models: Sequence[Self], paths: Sequence[Path]) -> None:
+        super()._did_delete_many(models, paths)
+        # inline import to avoid circular import
+        from kiln_ai.datamodel.task_run_index import TaskRunIndex
+
+        # One index transaction per task, not one per run
+        paths_by_folder: Dict[Path, List[Path]] = {}
+        for path in paths:
+            paths_by_folder.setdefault(path.parent.parent, []).append(path)
+        for run_paths in paths_by_folder.values():
+            index = TaskRunIndex.existing_for_run_path(run_paths[0])
+            if index is not None:
+                index.remove_runs(run_paths)
+
+    def _did_delete(self, path: Path) -> None:
+        super()._did_delete(path)
+        # inline import to avoid circular import
+        from kiln_ai.datamodel.task_run_index import TaskRunIndex
+
+        index = TaskRunIndex.existing_for_run_path(path)
+        if index is not None:
+            index.remove_run(path)
+
     @model_validator(mode="after")
     def validate_input_format(self, info: ValidationInfo) -> Self:
         # Don't validate if loading from file (not new). Too slow.
@@ -89,6 +147,8 @@ class TaskRun(KilnParentedModel):
 
         # validate output
         if task.input_json_schema is not None:
+            import jsonschema.exceptions
+
             try:
                 validate_schema(json.loads(self.input), task.input_json_schema)
             except json.JSONDecodeError:
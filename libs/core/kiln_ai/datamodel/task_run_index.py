@@ -0,0 +1,693 @@
+"""
+A persistent, per-task index of task runs.
+
+Listing the runs of a task normally parses and validates every `runs/*/task_run.kiln` file. For tasks with tens of thousands of runs that takes minutes on a cold start. This index stores the small set of fields needed for listings (ID, created_at, tags, rating, source, repair status, previews) in a SQLite file, so listings only need a directory scan and a stat per run.
+
+ - The index is a cache of what's on disk, never a source of truth. It can be deleted at any time and will be rebuilt.
+ - It lives in the Kiln settings cache dir (not the project folder), so it never ends up in a project's git history. File mtimes are machine-local anyway.
+ - `sync()` compares the mtime/size of each run file to the indexed values, and re-indexes anything that was added, changed or removed out-of-band (git pull, manual edits, etc).
+ - Saving and deleting runs keeps an existing index up to date, one by one or in batches (see the `_did_save` and `_did_delete` hooks of `TaskRun`). Long running processes can call `sync_once()` then read with `sync=False`, skipping the directory scan, and call `sync()` when they need out-of-band changes.
+ - Aggregate statistics (counts by tag, rating, input source, etc) are kept in the same file, and updated with the runs table in the same transactions. Reading them doesn't touch the runs table. See `stats()`.
+ - So is an inverted tag -> run index, so tag filters resolve to run IDs without loading any runs. See `run_ids_with_tag()`.
+ - Filtered, sorted and paginated listings are SQL queries over the index. See `query()`.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Literal, Tuple
+
+from pydantic import BaseModel
+
+from kiln_ai.datamodel.basemodel import is_leftover_folder_name
+from kiln_ai.datamodel.packed_storage import packed_child_paths, packed_file_state
+from kiln_ai.datamodel.task_output import TaskOutputRating
+from kiln_ai.datamodel.task_run import TaskRun
+from kiln_ai.utils.config import Config
+
+# Bump when the schema or indexed fields change. Mismatched indexes are dropped and rebuilt.
+INDEX_SCHEMA_VERSION = 4
+
+# Long enough for any UI preview, short enough to keep the index small.
+PREVIEW_CHARS = 200
+
+# The run fields we index. Loaded with a partial load: skips large fields like trace.
+INDEXED_RUN_FIELDS = [
+    "id",
+    "created_at",
+    "tags",
+    "input",
+    "input_source",
+    "output",
+    "repair_instructions",
+    "repaired_output",
+]
+# Run fields we only need the keys of (has_thinking checks for reasoning keys). Often the largest field of a run, so never fully loaded.
+INDEXED_RUN_KEY_FIELDS = ["intermediate_outputs"]
+
+# The runs columns aggregated into the stats table
+STATS_COLUMNS = "tags, rating, input_source_type, repaired, has_thinking"
+
+# The runs columns read into a TaskRunIndexEntry, see _entry_from_row
+ENTRY_COLUMNS = "dirname, id, mtime_ns, created_at, tags, rating, input_source_type, model_name, repaired, has_output, input_preview, output_preview, has_thinking"
+
+# Sort order of query() results -> SQL sort expression. Missing values sort before all others. Ties are broken by run folder name, so the order is stable for cursors.
+RunSortKey = Literal["created_at", "rating", "model"]
+_SORT_EXPRESSIONS: Dict[str, str] = {
+    "created_at": "created_at",
+    "rating": "COALESCE(rating_value, -1e9)",
+    "model": "COALESCE(model_name, '')",
+}
+
+
+@dataclass
+class TaskRunIndexEntry:
+    """The indexed fields of a single task run."""
+
+    id: str | None
+    path: Path
+    mtime_ns: int
+    created_at: datetime
+    tags: List[str]
+    rating: TaskOutputRating | None
+    input_source_type: str | None
+    model_name: str | None
+    repaired: bool
+    has_output: bool
+    input_preview: str | None
+    output_preview: str | None
+    has_thinking: bool
+
+
+@dataclass
+class TaskRunIndexQuery:
+    """Conditions for TaskRunIndex.query(). Runs must match all of them."""
+
+    # Runs must have every one of these tags
+    tags: List[str] = field(default_factory=list)
+    input_source_type: str | None = None
+    # Bounds on the overall rating value (inclusive). Unrated runs never match a bound.
+    min_rating: float | None = None
+    max_rating: float | None = None
+    # See HighRatingDatasetFilter
+    high_quality: bool | None = None
+    # See ThinkingModelDatasetFilter
+    has_thinking: bool | None = None
+
+
+@dataclass
+class TaskRunIndexPage:
+    """One page of TaskRunIndex.query() results."""
+
+    entries: List[TaskRunIndexEntry]
+    # The number of runs matching the query, over all pages
+    total: int
+    # Pass to query() to get the next page. None on the last page.
+    next_cursor: str | None
+
+
+class TaskRunStats(BaseModel):
+    """Aggregate counts over the runs of a task."""
+
+    total: int = 0
+    # Tag -> number of runs with the tag
+    tag_counts: Dict[str, int] = {}
+    # Overall rating, as "{type}:{value}" (e.g. "five_star:5", "pass_fail:1"), or "unrated" -> number of runs
+    rating_counts: Dict[str, int] = {}
+    # Input source type (e.g. "human", "synthetic") -> number of runs
+    input_source_counts: Dict[str, int] = {}
+    repaired_count: int = 0
+    # Runs with thinking data (reasoning or chain of thought) usable to train a thinking model
+    thinking_count: int = 0
+
+
+def _preview(text: str | None) -> str | None:
+    if text is None:
+        return None
+    return text[:PREVIEW_CHARS]
+
+
+def _run_row(run: TaskRun, dirname: str, mtime_ns: int, size: int) -> tuple:
+    output = run.output
+    model_name = (
+        output.source.properties.get("model_name")
+        if output and output.source and output.source.properties
+        else None
+    )
+    if not isinstance(model_name, str):
+        model_name = None
+    rating = output.rating if output else None
+    # Same as HighRatingDatasetFilter, which we can't import here (it imports this module)
+    high_quality = run.repaired_output is not None or (
+        rating is not None and rating.is_high_quality()
+    )
+    return (
+        dirname,
+        run.id,
+        mtime_ns,
+        size,
+        run.created_at.isoformat(),
+        json.dumps(run.tags),
+        rating.model_dump_json() if rating else None,
+        run.input_source.type.value if run.input_source else None,
+        model_name,
+        1 if run.repair_instructions else 0,
+        1 if output and output.output else 0,
+        _preview(run.input),
+        _preview(output.output if output else None),
+        1 if run.has_thinking_training_data() else 0,
+        rating.value if rating else None,
+        1 if high_quality else 0,
+    )
+
+
+def _encode_cursor(sort: str, descending: bool, sort_value, dirname: str) -> str:
+    data = json.dumps([sort, descending, sort_value, dirname])
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort: str, descending: bool) -> Tuple[object, str]:
+    # Returns the (sort value, dirname) of the last entry of the previous page
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        cursor_sort, cursor_descending, sort_value, dirname = data
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+    # Check types, a forged cursor could hold values sqlite can't bind (e.g. a dict)
+    if (
+        not isinstance(dirname, str)
+        or not isinstance(cursor_descending, bool)
+        or not (sort_value is None or isinstance(sort_value, (str, int, float)))
+    ):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort or cursor_descending != descending:
+        raise ValueError("Cursor is for a different sort order")
+    return sort_value, dirname
+
+
+def _rating_key(rating_json: str | None) -> str:
+    rating = json.loads(rating_json) if rating_json else None
+    if not rating or rating.get("value") is None:
+        return "unrated"
+    return f"{rating.get('type')}:{rating['value']:g}"
+
+
+def _stat_keys(
+    tags: str,
+    rating: str | None,
+    input_source_type: str | None,
+    repaired: int,
+    has_thinking: int,
+) -> List[Tuple[str, str]]:
+    # The (kind, key) stats counters a run contributes to. Arguments are STATS_COLUMNS values.
+    keys = [("total", ""), ("rating", _rating_key(rating))]
+    keys.extend(("tag", tag) for tag in set(json.loads(tags)))
+    if input_source_type:
+        keys.append(("input_source", input_source_type))
+    if repaired:
+        keys.append(("repaired", ""))
+    if has_thinking:
+        keys.append(("thinking", ""))
+    return keys
+
+
+def _row_stat_values(row: tuple) -> tuple:
+    # STATS_COLUMNS values of a _run_row tuple
+    return (row[5], row[6], row[7], row[9], row[13])
+
+
+class TaskRunIndex:
+    """
+    Index of the task runs for a single task. Use `TaskRunIndex.for_task_path()` to get an instance.
+    """
+
+    _instances: Dict[Path, "TaskRunIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, task_folder: Path, index_path: Path):
+        self.task_folder = task_folder
+        self.runs_folder = task_folder / TaskRun.relationship_name()
+        self.index_path = index_path
+        # SQLite handles cross-process locking, this serializes writers in process
+        self._lock = threading.Lock()
+        self._schema_checked = False
+        # Whether this instance has synced with disk since the index file was (re)created
+        self._synced = False
+
+    @classmethod
+    def index_path_for_task_folder(cls, task_folder: Path) -> Path:
+        key = hashlib.sha256(str(task_folder.resolve()).encode("utf-8")).hexdigest()
+        index_dir = Path(Config.settings_path()).parent / "cache" / "run_index"
+        return index_dir / f"{key[:32]}.sqlite"
+
+    @classmethod
+    def for_task_path(cls, task_path: Path) -> "TaskRunIndex":
+        """
+        Get the index for a task, given the path to the task file or folder.
+        """
+        task_folder = task_path.parent if task_path.suffix == ".kiln" else task_path
+        index_path = cls.index_path_for_task_folder(task_folder)
+        with cls._instances_lock:
+            index = cls._instances.get(index_path)
+            if index is None:
+                index = cls(task_folder, index_path)
+                cls._instances[index_path] = index
+            return index
+
+    @classmethod
+    def existing_for_run_path(cls, run_path: Path) -> "TaskRunIndex | None":
+        """
+        Get the index for the task which owns this run, but only if the index already exists on disk. We don't want to create an index on every save, only keep existing ones in sync.
+        """
+        # task_folder/runs/{run_dir}/task_run.kiln
+        task_folder = run_path.parent.parent.parent
+        if not cls.index_path_for_task_folder(task_folder).exists():
+            return None
+        return cls.for_task_path(task_folder)
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self.index_path.exists():
+            # New, or deleted out from under us
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._schema_checked = False
+            self._synced = False
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        if not self._schema_checked:
+            self._ensure_schema(conn)
+            self._schema_checked = True
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+            if row is not None and row[0] == str(INDEX_SCHEMA_VERSION):
+                return
+            # Missing or outdated: drop and rebuild on next sync
+            self._synced = False
+            conn.execute("DROP TABLE IF EXISTS runs")
+            conn.execute("DROP TABLE IF EXISTS stats")
+            conn.execute("DROP TABLE IF EXISTS run_tags")
+            conn.execute(
+                """
+                CREATE TABLE runs (
+                    dirname TEXT PRIMARY KEY,
+                    id TEXT,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    tags TEXT NOT NULL,
+                    rating TEXT,
+                    input_source_type TEXT,
+                    model_name TEXT,
+                    repaired INTEGER NOT NULL,
+                    has_output INTEGER NOT NULL,
+                    input_preview TEXT,
+                    output_preview TEXT,
+                    has_thinking INTEGER NOT NULL,
+                    rating_value REAL,
+                    high_quality INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX runs_id ON runs (id)")
+            conn.execute("CREATE INDEX runs_created_at ON runs (created_at, dirname)")
+            conn.execute(
+                """
+                CREATE TABLE stats (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (kind, key)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE run_tags (
+                    tag TEXT NOT NULL,
+                    dirname TEXT NOT NULL,
+                    PRIMARY KEY (tag, dirname)
+                )
+                """
+            )
+            conn.execute("CREATE INDEX run_tags_dirname ON run_tags (dirname)")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(INDEX_SCHEMA_VERSION),),
+            )
+
+    def _run_file(self, dirname: str) -> Path:
+        return self.runs_folder / dirname / TaskRun.base_filename()
+
+    def _indexed_stat_values(
+        self, conn: sqlite3.Connection, dirnames: Iterable[str]
+    ) -> List[tuple]:
+        rows = []
+        for dirname in dirnames:
+            row = conn.execute(
+                f"SELECT {STATS_COLUMNS} FROM runs WHERE dirname = ?", (dirname,)
+            ).fetchone()
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    def _update_stats(
+        self,
+        conn: sqlite3.Connection,
+        removed: List[tuple],
+        added: List[tuple],
+    ) -> None:
+        # Apply the change in counts from replacing the removed runs with the added ones. Both are lists of STATS_COLUMNS values. Call in the transaction changing the runs table.
+        deltas: Counter[Tuple[str, str]] = Counter()
+        for values in removed:
+            deltas.subtract(_stat_keys(*values))
+        for values in added:
+            deltas.update(_stat_keys(*values))
+        changes = [(kind, key, delta) for (kind, key), delta in deltas.items() if delta]
+        if not changes:
+            return
+        conn.executemany(
+            "INSERT INTO stats (kind, key, count) VALUES (?, ?, ?) ON CONFLICT (kind, key) DO UPDATE SET count = count + excluded.count",
+            changes,
+        )
+        conn.execute("DELETE FROM stats WHERE count <= 0")
+
+    def _write_changes(
+        self, conn: sqlite3.Connection, removed: List[str], rows: List[tuple]
+    ) -> None:
+        # Remove runs by dirname, and insert or replace _run_row rows. Updates the derived tables (tags, stats) too. Call in a transaction.
+        dirnames = removed + [row[0] for row in rows]
+        old_stats = self._indexed_stat_values(conn, dirnames)
+        conn.executemany(
+            "DELETE FROM run_tags WHERE dirname = ?",
+            [(dirname,) for dirname in dirnames],
+        )
+        conn.executemany(
+            "DELETE FROM runs WHERE dirname = ?", [(dirname,) for dirname in removed]
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO run_tags (tag, dirname) VALUES (?, ?)",
+            [(tag, row[0]) for row in rows for tag in json.loads(row[5])],
+        )
+        self._update_stats(conn, old_stats, [_row_stat_values(row) for row in rows])
+
+    def _disk_state(self) -> Dict[str, Tuple[int, int]]:
+        # One scandir of the runs folder and one stat per run. No parsing.
+        state: Dict[str, Tuple[int, int]] = {}
+        if not self.runs_folder.is_dir():
+            return state
+        base_filename = TaskRun.base_filename()
+        # Packed runs first: real files win over packed records (see packed_storage.py)
+        for run_file, record in packed_child_paths(self.runs_folder, base_filename):
+            state[run_file.parent.name] = (record.version, record.length)
+        with os.scandir(self.runs_folder) as entries:
+            for entry in entries:
+                if not entry.is_dir() or is_leftover_folder_name(entry.name):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(entry.path, base_filename))
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+                state[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def sync(self) -> None:
+        """
+        Bring the index in line with what's on disk. Only runs which were added or modified since the last sync are loaded.
+        """
+        with self._lock, closing(self._connect()) as conn:
+            # Snapshot under the lock: a run saved (and indexed by update_run) after an unlocked snapshot would look removed
+            disk_state = self._disk_state()
+            indexed = {
+                dirname: (mtime_ns, size)
+                for dirname, mtime_ns, size in conn.execute(
+                    "SELECT dirname, mtime_ns, size FROM runs"
+                )
+            }
+            removed = [dirname for dirname in indexed if dirname not in disk_state]
+            changed_rows: List[tuple] = []
+            for dirname, state in disk_state.items():
+                if indexed.get(dirname) == state:
+                    continue
+                try:
+                    run = TaskRun.load_partial(
+                        self._run_file(dirname),
+                        INDEXED_RUN_FIELDS,
+                        mtime_ns=state[0],
+                        keys_only=INDEXED_RUN_KEY_FIELDS,
+                    )
+                except Exception:
+                    # Invalid or partially written files are skipped (same as not being on disk). They'll be retried on the next sync.
+                    continue
+                changed_rows.append(_run_row(run, dirname, state[0], state[1]))
+            if removed or changed_rows:
+                with conn:
+                    self._write_changes(conn, removed, changed_rows)
+            self._synced = True
+
+    def sync_once(self) -> None:
+        """
+        Sync with disk if this instance hasn't yet (or the index file was recreated since). After that, the save and delete hooks keep the index up to date, so reads can pass `sync=False`. Out-of-band changes need an explicit `sync()`.
+        """
+        if not self._synced or not self.index_path.exists():
+            self.sync()
+
+    def rebuild(self) -> None:
+        """
+        Discard the index (including stats and tags) and rebuild it from disk.
+        """
+        with self._lock, closing(self._connect()) as conn:
+            with conn:
+                conn.execute("DELETE FROM runs")
+                conn.execute("DELETE FROM stats")
+                conn.execute("DELETE FROM run_tags")
+        self.sync()
+
+    def update_run(self, run_path: Path, run: TaskRun) -> None:
+        """
+        Update the index entry for a run which was just saved to run_path.
+        """
+        self.update_runs([(run_path, run)])
+
+    def update_runs(self, saved_runs: List[Tuple[Path, TaskRun]]) -> None:
+        """
+        Update the index entries for (path, run) pairs which were just saved, in one transaction.
+        """
+        rows = []
+        for path, run in saved_runs:
+            try:
+                stat = os.stat(path)
+                file_state = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                file_state = packed_file_state(path)
+                if file_state is None:
+                    continue
+            rows.append(_run_row(run, path.parent.name, *file_state))
+        if not rows:
+            return
+        with self._lock, closing(self._connect()) as conn:
+            with conn:
+                self._write_changes(conn, [], rows)
+
+    def remove_run(self, run_path: Path) -> None:
+        """
+        Remove the index entry for a run which was just deleted.
+        """
+        self.remove_runs([run_path])
+
+    def remove_runs(self, run_paths: List[Path]) -> None:
+        """
+        Remove the index entries for runs which were just deleted, in one transaction.
+        """
+        with self._lock, closing(self._connect()) as conn:
+            with conn:
+                self._write_changes(conn, [path.parent.name for path in run_paths], [])
+
+    def entries(self, sync: bool = True) -> List[TaskRunIndexEntry]:
+        """
+        List the index entries for all runs in the task.
+
+        Args:
+            sync: Sync with disk before listing (default). Catches out-of-band changes.
+        """
+        if sync:
+            self.sync()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT {ENTRY_COLUMNS} FROM runs").fetchall()
+        return [self._entry_from_row(row) for row in rows]
+
+    def _entry_from_row(self, row: tuple) -> TaskRunIndexEntry:
+        # row: ENTRY_COLUMNS values
+        return TaskRunIndexEntry(
+            id=row[1],
+            path=self._run_file(row[0]),
+            mtime_ns=row[2],
+            created_at=datetime.fromisoformat(row[3]),
+            tags=json.loads(row[4]),
+            rating=TaskOutputRating.model_validate_json(row[5]) if row[5] else None,
+            input_source_type=row[6],
+            model_name=row[7],
+            repaired=bool(row[8]),
+            has_output=bool(row[9]),
+            input_preview=row[10],
+            output_preview=row[11],
+            has_thinking=bool(row[12]),
+        )
+
+    def query(
+        self,
+        query: TaskRunIndexQuery | None = None,
+        sort: RunSortKey = "created_at",
+        descending: bool = True,
+        limit: int | None = None,
+        cursor: str | None = None,
+        sync: bool = True,
+    ) -> TaskRunIndexPage:
+        """
+        Filter, sort and paginate the index entries of the task's runs. Runs in SQL over the index: no runs are loaded (beyond syncing).
+
+        Pagination uses keyset cursors: a page starts after the last entry of the previous one, so runs added or removed between requests don't shift pages.
+
+        Args:
+            query: Conditions runs must match. None for all runs.
+            sort: The sort key, see RunSortKey.
+            descending: Sort order (default newest/highest first).
+            limit: Max entries per page. None for all.
+            cursor: The next_cursor of the previous page, None for the first page. Must be from a query with the same sort and order.
+            sync: Sync with disk first (default). Catches out-of-band changes.
+
+        Raises:
+            ValueError: If the sort key or cursor is invalid.
+        """
+        sort_expression = _SORT_EXPRESSIONS.get(sort)
+        if sort_expression is None:
+            raise ValueError(f"Invalid sort key: {sort}")
+        if limit is not None and limit < 1:
+            raise ValueError("Limit must be at least 1")
+        query = query or TaskRunIndexQuery()
+
+        conditions: List[str] = []
+        params: List[object] = []
+        for tag in query.tags:
+            conditions.append("dirname IN (SELECT dirname FROM run_tags WHERE tag = ?)")
+            params.append(tag)
+        if query.input_source_type is not None:
+            conditions.append("input_source_type = ?")
+            params.append(query.input_source_type)
+        if query.min_rating is not None:
+            conditions.append("rating_value >= ?")
+            params.append(query.min_rating)
+        if query.max_rating is not None:
+            conditions.append("rating_value <= ?")
+            params.append(query.max_rating)
+        if query.high_quality is not None:
+            conditions.append("high_quality = ?")
+            params.append(1 if query.high_quality else 0)
+        if query.has_thinking is not None:
+            conditions.append("has_thinking = ?")
+            params.append(1 if query.has_thinking else 0)
+        where = " AND ".join(conditions) or "1"
+
+        page_conditions = where
+        page_params = list(params)
+        if cursor is not None:
+            sort_value, dirname = _decode_cursor(cursor, sort, descending)
+            page_conditions += (
+                f" AND ({sort_expression}, dirname) {'<' if descending else '>'} (?, ?)"
+            )
+            page_params.extend([sort_value, dirname])
+        direction = "DESC" if descending else "ASC"
+        page_sql = f"SELECT {ENTRY_COLUMNS}, {sort_expression} FROM runs WHERE {page_conditions} ORDER BY {sort_expression} {direction}, dirname {direction}"
+        if limit is not None:
+            # One extra row tells us if there's a next page
+            page_sql += " LIMIT ?"
+            page_params.append(limit + 1)
+
+        if sync:
+            self.sync()
+        with closing(self._connect()) as conn:
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM runs WHERE {where}", params
+            ).fetchone()[0]
+            rows = conn.execute(page_sql, page_params).fetchall()
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor(sort, descending, last[-1], last[0])
+        return TaskRunIndexPage(
+            entries=[self._entry_from_row(row) for row in rows],
+            total=total,
+            next_cursor=next_cursor,
+        )
+
+    def run_ids_with_tag(self, tag: str, sync: bool = True) -> List[str | None]:
+        """
+        The IDs of the runs with a tag. A lookup in the tag index: no runs are loaded.
+
+        Args:
+            sync: Sync with disk first (default). Catches out-of-band changes.
+        """
+        if sync:
+            self.sync()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT runs.id FROM run_tags JOIN runs ON runs.dirname = run_tags.dirname WHERE run_tags.tag = ?",
+                (tag,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def tag_counts(self, sync: bool = True) -> Dict[str, int]:
+        """
+        Every tag used in the task, with the number of runs which have it.
+
+        Args:
+            sync: Sync with disk first (default). Catches out-of-band changes.
+        """
+        return self.stats(sync=sync).tag_counts
+
+    def stats(self, sync: bool = True) -> TaskRunStats:
+        """
+        Aggregate counts over all runs in the task. Read from the stats table, which is kept up to date as runs are indexed: the cost doesn't grow with the number of runs (beyond the sync's directory scan).
+
+        Args:
+            sync: Sync with disk first (default). Catches out-of-band changes.
+        """
+        if sync:
+            self.sync()
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT kind, key, count FROM stats").fetchall()
+        stats = TaskRunStats()
+        for kind, key, count in rows:
+            if kind == "total":
+                stats.total = count
+            elif kind == "tag":
+                stats.tag_counts[key] = count
+            elif kind == "rating":
+                stats.rating_counts[key] = count
+            elif kind == "input_source":
+                stats.input_source_counts[key] = count
+            elif kind == "repaired":
+                stats.repaired_count = count
+            elif kind == "thinking":
+                stats.thinking_count = count
+        return stats
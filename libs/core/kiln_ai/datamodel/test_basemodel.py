@@ -1,5 +1,9 @@
 import datetime
 import json
+import os
+import shutil
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 from unittest.mock import MagicMock, patch
@@ -8,10 +12,19 @@ import pytest
 
 from kiln_ai.adapters.model_adapters.base_adapter import BaseAdapter
 from kiln_ai.adapters.run_output import RunOutput
-from kiln_ai.datamodel import Task, TaskRun
+from kiln_ai.datamodel import (
+    DataSource,
+    DataSourceType,
+    Task,
+    TaskOutput,
+    TaskRun,
+)
 from kiln_ai.datamodel.basemodel import (
+    STALE_LEFTOVER_SECONDS,
+    TRASH_FOLDER_PREFIX,
     KilnBaseModel,
     KilnParentedModel,
+    _sweep_stale_leftovers,
     string_to_valid_name,
 )
 from kiln_ai.datamodel.model_cache import ModelCache
@@ -298,6 +311,39 @@ def test_lazy_load_parent(tmp_path):
     assert loaded_child.cached_parent() is loaded_parent
 
 
+def test_lazy_load_parent_shared(tmp_path, tmp_model_cache):
+    parent = BaseParentExample(
+        name="Parent", path=(tmp_path / BaseParentExample.base_filename())
+    )
+    parent.save_to_file()
+    child1 = DefaultParentedModel(parent=parent, name="Child1")
+    child1.save_to_file()
+    child2 = DefaultParentedModel(parent=parent, name="Child2")
+    child2.save_to_file()
+
+    # Children loaded from disk share the readonly cached parent, instead of each loading a copy
+    loaded_parents = [
+        DefaultParentedModel.load_from_file(child.path).parent
+        for child in [child1, child2]
+    ]
+    assert loaded_parents[0] is not None
+    assert loaded_parents[0] is loaded_parents[1]
+    assert loaded_parents[0].is_readonly()
+    with pytest.raises(ValueError, match="readonly"):
+        loaded_parents[0].name = "Edited"
+
+    # Missing parent file
+    parent.path.unlink()
+    assert DefaultParentedModel.load_from_file(child1.path).parent is None
+
+    # Explicitly assigned parents are returned as is
+    child = DefaultParentedModel(name="Child3")
+    assert child.parent is None
+    child.parent = parent
+    assert child.parent is parent
+    assert child.cached_parent() is parent
+
+
 def test_delete(tmp_path):
     # Test deleting a file
     file_path = tmp_path / "test.kiln"
@@ -361,7 +407,7 @@ def test_load_from_file_with_cache(test_base_file, tmp_model_cache):
 
     # Check that the cache was checked and set
     tmp_model_cache.get_model.assert_called_once_with(
-        test_base_file, KilnBaseModel, readonly=False
+        test_base_file, KilnBaseModel, readonly=False, mtime_ns=None
     )
     tmp_model_cache.set_model.assert_called_once()
 
@@ -414,7 +460,7 @@ def test_load_from_file_with_cached_model(test_base_file, tmp_model_cache):
 
         # Check that the cache was checked and the cached model was returned
         tmp_model_cache.get_model.assert_called_once_with(
-            test_base_file, KilnBaseModel, readonly=False
+            test_base_file, KilnBaseModel, readonly=False, mtime_ns=None
         )
         assert model is cached_model
 
@@ -451,26 +497,308 @@ def test_from_id_and_parent_path(test_base_parented_file, tmp_model_cache):
     assert not_found is None
 
 
-def test_from_id_and_parent_path_with_cache(test_base_parented_file, tmp_model_cache):
-    # Set up parent and child
+def test_from_id_and_parent_path_uses_index(test_base_parented_file, tmp_model_cache):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    children = [DefaultParentedModel(parent=parent, name=f"Child{i}") for i in range(3)]
+    for child in children:
+        child.save_to_file()
+
+    # First lookup builds the index from the folder names
+    found_child = DefaultParentedModel.from_id_and_parent_path(
+        children[0].id, test_base_parented_file
+    )
+    assert found_child is not None
+    assert found_child.id == children[0].id
+
+    # Later lookups are a single load: no scan of the other children
+    with patch.object(
+        DefaultParentedModel, "_iterate_children_paths_with_mtime"
+    ) as mock_iterate:
+        for child in children:
+            found_child = DefaultParentedModel.from_id_and_parent_path(
+                child.id, test_base_parented_file
+            )
+            assert found_child is not None
+            assert found_child.id == child.id
+        mock_iterate.assert_not_called()
+
+
+def test_from_id_and_parent_path_index_tracks_save_and_delete(
+    test_base_parented_file, tmp_model_cache
+):
     parent = BaseParentExample.load_from_file(test_base_parented_file)
     child = DefaultParentedModel(parent=parent, name="Child")
     child.save_to_file()
+    assert child.id is not None and child.path is not None
+    assert (
+        DefaultParentedModel.from_id_and_parent_path(child.id, test_base_parented_file)
+        is not None
+    )
+    relationship_folder = child.path.parent.parent
+
+    new_child = DefaultParentedModel(parent=parent, name="New Child")
+    new_child.save_to_file()
+    assert new_child.id is not None
+    assert (
+        tmp_model_cache.child_path_for_id(relationship_folder, new_child.id)
+        == new_child.path
+    )
 
-    # First load to populate cache
-    _ = DefaultParentedModel.from_id_and_parent_path(child.id, test_base_parented_file)
+    child.delete()
+    assert tmp_model_cache.child_path_for_id(relationship_folder, child.id) is None
+    assert (
+        DefaultParentedModel.from_id_and_parent_path(child.id, test_base_parented_file)
+        is None
+    )
 
-    # Mock cache to verify it's used
-    tmp_model_cache.get_model_id = MagicMock(return_value=child.id)
 
-    # Load again - should use cache
+def test_from_id_and_parent_path_index_stale(test_base_parented_file, tmp_model_cache):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    child = DefaultParentedModel(parent=parent, name="Child")
+    child.save_to_file()
+    assert child.id is not None and child.path is not None
+    DefaultParentedModel.from_id_and_parent_path(child.id, test_base_parented_file)
+
+    # Rename the folder out-of-band: the indexed path no longer exists
+    moved_folder = child.path.parent.parent / "moved"
+    child.path.parent.rename(moved_folder)
     found_child = DefaultParentedModel.from_id_and_parent_path(
         child.id, test_base_parented_file
     )
+    assert found_child is not None
+    assert found_child.path == moved_folder / DefaultParentedModel.base_filename()
 
+
+def test_from_id_and_parent_path_verifies_in_file_id(
+    test_base_parented_file, tmp_model_cache
+):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    child = DefaultParentedModel(parent=parent, name="Child")
+    child.save_to_file()
+    assert child.id is not None and child.path is not None
+    original_id = child.id
+
+    # Edit the in-file ID, so the folder name no longer matches
+    data = json.loads(child.path.read_text())
+    data["id"] = "edited_id"
+    mtime_ns = child.path.stat().st_mtime_ns
+    child.path.write_text(json.dumps(data))
+    os.utime(child.path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+    assert (
+        DefaultParentedModel.from_id_and_parent_path(
+            original_id, test_base_parented_file
+        )
+        is None
+    )
+    found_child = DefaultParentedModel.from_id_and_parent_path(
+        "edited_id", test_base_parented_file
+    )
     assert found_child is not None
-    assert found_child.id == child.id
-    tmp_model_cache.get_model_id.assert_called()
+    assert found_child.path == child.path
+
+
+def test_from_ids_and_parent_path(test_base_parented_file, tmp_model_cache):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    children = [DefaultParentedModel(parent=parent, name=f"Child{i}") for i in range(4)]
+    for child in children:
+        child.save_to_file()
+    ids = [child.id for child in children[:3]]
+
+    found = DefaultParentedModel.from_ids_and_parent_path(
+        [*ids, "nonexistent"], test_base_parented_file
+    )
+    assert set(found.keys()) == set(ids)
+    assert found[ids[1]].name == "Child1"
+    assert not found[ids[1]].is_readonly()
+    readonly_found = DefaultParentedModel.from_ids_and_parent_path(
+        ids, test_base_parented_file, readonly=True
+    )
+    assert all(child.is_readonly() for child in readonly_found.values())
+
+    # Resolved from the ID index: no scan of every child
+    with patch.object(
+        DefaultParentedModel, "_iterate_children_paths_with_mtime"
+    ) as mock_iterate:
+        found = DefaultParentedModel.from_ids_and_parent_path(
+            ids, test_base_parented_file
+        )
+        assert set(found.keys()) == set(ids)
+        mock_iterate.assert_not_called()
+
+    assert DefaultParentedModel.from_ids_and_parent_path(ids, None) == {}
+
+
+def test_from_ids_and_parent_path_stale_and_edited(
+    test_base_parented_file, tmp_model_cache
+):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    moved = DefaultParentedModel(parent=parent, name="Moved")
+    edited = DefaultParentedModel(parent=parent, name="Edited")
+    moved.save_to_file()
+    edited.save_to_file()
+    assert moved.path is not None and edited.path is not None
+    DefaultParentedModel.from_ids_and_parent_path(
+        [moved.id, edited.id], test_base_parented_file
+    )
+
+    # Renamed out-of-band, and an in-file ID which doesn't match its folder name
+    moved_folder = moved.path.parent.parent / "moved"
+    moved.path.parent.rename(moved_folder)
+    data = json.loads(edited.path.read_text())
+    data["id"] = "edited_id"
+    mtime_ns = edited.path.stat().st_mtime_ns
+    edited.path.write_text(json.dumps(data))
+    os.utime(edited.path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+    found = DefaultParentedModel.from_ids_and_parent_path(
+        [moved.id, edited.id, "edited_id"], test_base_parented_file
+    )
+    assert set(found.keys()) == {moved.id, "edited_id"}
+    assert found[moved.id].path == moved_folder / DefaultParentedModel.base_filename()
+    assert found["edited_id"].path == edited.path
+
+
+def test_delete_many(test_base_parented_file, tmp_model_cache):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    children = [DefaultParentedModel(parent=parent, name=f"Child{i}") for i in range(3)]
+    for child in children:
+        child.save_to_file()
+    unsaved = DefaultParentedModel(parent=parent, name="Unsaved")
+    paths = [child.path for child in children[:2]]
+    relationship_folder = paths[0].parent.parent
+    DefaultParentedModel.from_ids_and_parent_path(
+        [child.id for child in children], test_base_parented_file
+    )
+
+    with patch("kiln_ai.datamodel.basemodel._delete_in_background") as mock_background:
+        errors = DefaultParentedModel.delete_many([*children[:2], unsaved])
+    assert errors[:2] == [None, None]
+    assert isinstance(errors[2], ValueError)
+    assert all(not path.parent.exists() for path in paths)
+    assert all(child.path is None for child in children[:2])
+    assert (
+        tmp_model_cache.child_path_for_id(relationship_folder, children[0].id) is None
+    )
+
+    # Moved to a trash folder beside the relationship folder, removed in the background
+    trash_folders = mock_background.call_args.args[0]
+    assert len(trash_folders) == 1
+    assert trash_folders[0].parent == relationship_folder.parent
+    assert trash_folders[0].name.startswith(".kiln_trash_")
+    assert {p.name for p in trash_folders[0].iterdir()} == {
+        path.parent.name for path in paths
+    }
+    remaining = DefaultParentedModel.all_children_of_parent_path(
+        test_base_parented_file
+    )
+    assert [child.name for child in remaining] == ["Child2"]
+
+
+def test_delete_many_background_removal(test_base_parented_file, tmp_model_cache):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    child = DefaultParentedModel(parent=parent, name="Child")
+    child.save_to_file()
+    assert child.path is not None
+    container = child.path.parent.parent.parent
+    # Leftover from an interrupted process
+    leftover = container / ".kiln_trash_leftover"
+    (leftover / "old_child").mkdir(parents=True)
+    old_mtime = time.time() - STALE_LEFTOVER_SECONDS - 60
+    os.utime(leftover, (old_mtime, old_mtime))
+    # Recently used: maybe another process is still deleting it
+    in_use = container / ".kiln_trash_in_use"
+    (in_use / "other_child").mkdir(parents=True)
+
+    threads = []
+    original_thread = threading.Thread
+
+    def capture_thread(*args, **kwargs):
+        thread = original_thread(*args, **kwargs)
+        threads.append(thread)
+        return thread
+
+    with patch("kiln_ai.datamodel.basemodel.threading.Thread", capture_thread):
+        assert DefaultParentedModel.delete_many([child]) == [None]
+    for thread in threads:
+        thread.join()
+    assert list(container.glob(".kiln_trash_*")) == [in_use]
+
+
+def test_sweep_stale_leftovers_rate_limited(tmp_path):
+    old_mtime = time.time() - STALE_LEFTOVER_SECONDS - 60
+
+    def make_leftover(name: str) -> Path:
+        leftover = tmp_path / name
+        leftover.mkdir()
+        os.utime(leftover, (old_mtime, old_mtime))
+        return leftover
+
+    leftover = make_leftover(".kiln_trash_leftover")
+    _sweep_stale_leftovers(tmp_path, TRASH_FOLDER_PREFIX)
+    assert not leftover.exists()
+
+    # Each container is scanned at most once per STALE_LEFTOVER_SECONDS
+    later_leftover = make_leftover(".kiln_trash_later")
+    _sweep_stale_leftovers(tmp_path, TRASH_FOLDER_PREFIX)
+    assert later_leftover.exists()
+
+
+def test_delete_many_missing_folder(test_base_parented_file, tmp_model_cache):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    child = DefaultParentedModel(parent=parent, name="Child")
+    child.save_to_file()
+    assert child.path is not None
+    shutil.rmtree(child.path.parent)
+    errors = DefaultParentedModel.delete_many([child])
+    assert isinstance(errors[0], FileNotFoundError)
+
+
+def test_load_children_warm_cache_reuses_scan_stat(
+    test_base_parented_file, tmp_model_cache
+):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    for i in range(3):
+        DefaultParentedModel(parent=parent, name=f"Child{i}").save_to_file()
+
+    # Populate the cache
+    DefaultParentedModel.all_children_of_parent_path(test_base_parented_file)
+
+    # Warm load validates with the mtime from the directory scan, not another stat per file
+    with patch.object(
+        tmp_model_cache, "_is_cache_valid", wraps=tmp_model_cache._is_cache_valid
+    ) as mock_valid:
+        children = DefaultParentedModel.all_children_of_parent_path(
+            test_base_parented_file
+        )
+    assert len(children) == 3
+    child_calls = [
+        call
+        for call in mock_valid.call_args_list
+        if call.args[0].name == DefaultParentedModel.base_filename()
+    ]
+    assert len(child_calls) == 3
+    assert all(call.args[2] is not None for call in child_calls)
+    assert tmp_model_cache.stats().hits >= 3
+
+
+def test_load_children_detects_stale_cache(test_base_parented_file, tmp_model_cache):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    child = DefaultParentedModel(parent=parent, name="Child")
+    child.save_to_file()
+    DefaultParentedModel.all_children_of_parent_path(test_base_parented_file)
+
+    # Edit on disk, bypassing the datamodel
+    assert child.path is not None
+    data = json.loads(child.path.read_text())
+    data["name"] = "Edited"
+    mtime_ns = child.path.stat().st_mtime_ns
+    child.path.write_text(json.dumps(data))
+    # Ensure mtime changes, even on filesystems with coarse timestamps
+    os.utime(child.path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+    children = DefaultParentedModel.all_children_of_parent_path(test_base_parented_file)
+    assert [c.name for c in children] == ["Edited"]
 
 
 def test_from_id_and_parent_path_without_parent():
@@ -479,6 +807,275 @@ def test_from_id_and_parent_path_without_parent():
     assert not_found is None
 
 
+def test_readonly_load_shares_frozen_instance(test_base_file, tmp_model_cache):
+    readonly_model = KilnBaseModel.load_from_file(test_base_file, readonly=True)
+    assert readonly_model.is_readonly()
+    assert KilnBaseModel.load_from_file(test_base_file, readonly=True) is readonly_model
+
+    with pytest.raises(ValueError, match="readonly"):
+        readonly_model.created_by = "someone_else"
+
+    # Default loads are private, editable copies
+    model = KilnBaseModel.load_from_file(test_base_file)
+    assert model is not readonly_model
+    assert not model.is_readonly()
+    model.created_by = "someone_else"
+    assert readonly_model.created_by != "someone_else"
+
+
+def test_cold_load_does_not_share_cached_instance(test_base_file, tmp_model_cache):
+    # First load is a cache miss. Edits to it must not leak into the cache.
+    model = KilnBaseModel.load_from_file(test_base_file)
+    model.created_by = "someone_else"
+
+    cached = KilnBaseModel.load_from_file(test_base_file, readonly=True)
+    assert cached is not model
+    assert cached.created_by != "someone_else"
+
+
+def test_readonly_without_cache_is_editable(test_base_file):
+    # Nothing is shared when the cache is disabled, so nothing to freeze
+    with patch.object(ModelCache.shared(), "_enabled", False):
+        model = KilnBaseModel.load_from_file(test_base_file, readonly=True)
+    assert not model.is_readonly()
+    model.created_by = "someone_else"
+
+
+def test_readonly_freezes_nested_models(tmp_path, tmp_model_cache):
+    task = Task(name="Test Task", instruction="Test", path=tmp_path / "task.kiln")
+    task.save_to_file()
+    run = TaskRun(
+        parent=task,
+        input="Test input",
+        input_source=DataSource(
+            type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+        ),
+        output=TaskOutput(
+            output="Test output",
+            source=DataSource(
+                type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+            ),
+        ),
+    )
+    run.save_to_file()
+    assert run.path is not None
+
+    readonly_run = TaskRun.load_from_file(run.path, readonly=True)
+    with pytest.raises(ValueError, match="readonly"):
+        readonly_run.output.output = "Edited"
+
+    # Parent is still available, but not attached to the shared instance
+    parent = readonly_run.parent
+    assert parent is not None
+    assert parent.id == task.id
+    assert readonly_run.cached_parent() is None
+
+    editable_run = TaskRun.load_from_file(run.path)
+    editable_run.output.output = "Edited"
+    editable_run.save_to_file()
+    assert TaskRun.load_from_file(run.path, readonly=True).output.output == "Edited"
+
+
+def test_readonly_does_not_freeze_nested_containers(tmp_path, tmp_model_cache):
+    # Known limit: readonly only blocks field assignment. Nested lists/dicts are the cached ones, and mutating them changes the cache. Freezing them would change their types for every reader.
+    task = Task(name="Test Task", instruction="Test", path=tmp_path / "task.kiln")
+    task.save_to_file()
+    run = TaskRun(
+        parent=task,
+        input="Test input",
+        tags=["a"],
+        output=TaskOutput(output="Test output"),
+    )
+    run.save_to_file()
+    assert run.path is not None
+
+    readonly_run = TaskRun.load_from_file(run.path, readonly=True)
+    with pytest.raises(ValueError, match="readonly"):
+        readonly_run.tags = ["b"]
+    assert isinstance(readonly_run.tags, list)
+    readonly_run.tags.append("b")
+    assert TaskRun.load_from_file(run.path, readonly=True).tags == ["a", "b"]
+
+    # Default loads are deep copies, unaffected by each other
+    editable_run = TaskRun.load_from_file(run.path)
+    editable_run.tags.append("c")
+    assert TaskRun.load_from_file(run.path).tags == ["a", "b"]
+
+
+def test_cold_load_returns_parsed_instance(test_base_file, tmp_model_cache):
+    # The first load keeps the instance it parsed (no freeze, copy, thaw), and the cache gets a frozen copy
+    parsed = []
+    model_from_text = KilnBaseModel._model_from_text
+
+    def record_parse(path, text):
+        parsed.append(model_from_text(path, text))
+        return parsed[-1]
+
+    with patch.object(KilnBaseModel, "_model_from_text", side_effect=record_parse):
+        model = KilnBaseModel.load_from_file(test_base_file)
+    assert parsed == [model] and parsed[0] is model
+    assert not model.is_readonly()
+
+    cached = tmp_model_cache.get_model(test_base_file, KilnBaseModel, readonly=True)
+    assert cached is not None and cached is not model
+    assert cached.is_readonly()
+
+
+@pytest.fixture
+def saved_task_run(tmp_path) -> TaskRun:
+    task = Task(name="Test Task", instruction="Test", path=tmp_path / "task.kiln")
+    task.save_to_file()
+    run = TaskRun(
+        parent=task,
+        input="Test input",
+        input_source=DataSource(
+            type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+        ),
+        output=TaskOutput(
+            output="Test output",
+            source=DataSource(
+                type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+            ),
+        ),
+        intermediate_outputs={"reasoning": "Long reasoning " * 1000},
+        tags=["a", "b"],
+    )
+    run.save_to_file()
+    return run
+
+
+def test_load_fields(saved_task_run, tmp_model_cache):
+    assert saved_task_run.path is not None
+    values = TaskRun.load_fields(saved_task_run.path, ["tags", "output", "id"])
+    assert values["tags"] == ["a", "b"]
+    assert values["id"] == saved_task_run.id
+    assert isinstance(values["output"], TaskOutput)
+    assert values["output"].output == "Test output"
+    assert set(values.keys()) == {"tags", "output", "id"}
+
+    # Cached separately from full models, and shared (so frozen)
+    assert TaskRun.load_fields(saved_task_run.path, ["id", "output", "tags"]) is values
+    assert values["output"].is_readonly()
+    assert tmp_model_cache.get_model(saved_task_run.path, TaskRun) is None
+
+
+def test_load_fields_invalidated_on_change(saved_task_run, tmp_model_cache):
+    assert saved_task_run.path is not None
+    TaskRun.load_fields(saved_task_run.path, ["tags"])
+    saved_task_run.tags = ["c"]
+    saved_task_run.save_to_file()
+    assert TaskRun.load_fields(saved_task_run.path, ["tags"]) == {"tags": ["c"]}
+
+
+def test_load_fields_errors(saved_task_run, test_base_file):
+    assert saved_task_run.path is not None
+    with pytest.raises(ValueError, match="has no field"):
+        TaskRun.load_fields(saved_task_run.path, ["not_a_field"])
+    with pytest.raises(ValueError, match="model type is incorrect"):
+        TaskRun.load_fields(test_base_file, ["id"])
+
+
+def test_load_fields_newer_version(test_newer_file):
+    data = json.loads(test_newer_file.read_text())
+    data["model_type"] = "kiln_base_model"
+    test_newer_file.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match="schema version is higher"):
+        KilnBaseModel.load_fields(test_newer_file, ["id"])
+
+
+def test_load_partial(saved_task_run, tmp_model_cache):
+    assert saved_task_run.path is not None
+    run = TaskRun.load_partial(saved_task_run.path, ["tags", "output"])
+    assert run.tags == ["a", "b"]
+    assert run.output.output == "Test output"
+    assert run.path == saved_task_run.path
+    assert run.is_readonly()
+
+    # Not loaded
+    with pytest.raises(AttributeError):
+        run.intermediate_outputs
+    with pytest.raises(ValueError, match="partially loaded"):
+        run.save_to_file()
+
+    # If the full model is cached, we get that
+    full_run = TaskRun.load_from_file(saved_task_run.path, readonly=True)
+    assert TaskRun.load_partial(saved_task_run.path, ["tags"]) is full_run
+
+
+def test_save_many(test_base_parented_file, tmp_model_cache):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    children = [
+        DefaultParentedModel(parent=parent, name=f"Child {i}") for i in range(5)
+    ]
+    # Build the child ID index, so we can check save_many keeps it updated
+    assert (
+        DefaultParentedModel.from_id_and_parent_path("missing", test_base_parented_file)
+        is None
+    )
+    assert KilnBaseModel.save_many(children, max_workers=2) == [None] * 5
+
+    for child in children:
+        assert child.path is not None and child.path.exists()
+        assert DefaultParentedModel.load_from_file(child.path).name == child.name
+    # No temp files left behind
+    relationship_folder = children[0].path.parent.parent
+    assert [p.name for p in relationship_folder.glob("*/.*")] == []
+    # Child index updated, like save_to_file
+    loaded = DefaultParentedModel.all_children_of_parent_path(test_base_parented_file)
+    assert {c.id for c in loaded} == {c.id for c in children}
+    assert (
+        tmp_model_cache.child_path_for_id(relationship_folder, children[0].id)
+        == children[0].path
+    )
+
+
+def test_save_many_invalidates_cache(test_base_file, tmp_model_cache):
+    model = KilnBaseModel.load_from_file(test_base_file)
+    model.created_by = "someone_else"
+    assert KilnBaseModel.save_many([model]) == [None]
+    assert tmp_model_cache.get_model(test_base_file, KilnBaseModel) is None
+    assert KilnBaseModel.load_from_file(test_base_file).created_by == "someone_else"
+
+
+def test_save_many_reports_per_item_errors(test_base_parented_file, saved_task_run):
+    parent = BaseParentExample.load_from_file(test_base_parented_file)
+    good = DefaultParentedModel(parent=parent, name="Good")
+    assert saved_task_run.path is not None
+    partial = TaskRun.load_partial(saved_task_run.path, ["tags"])
+
+    errors = KilnBaseModel.save_many([KilnBaseModel(), good, partial])
+    assert isinstance(errors[0], ValueError)
+    assert "path' is not set" in str(errors[0])
+    assert errors[1] is None
+    assert isinstance(errors[2], ValueError)
+    assert "partially loaded" in str(errors[2])
+    assert good.path is not None and good.path.exists()
+
+
+def test_save_many_write_error_leaves_no_partial_file(tmp_path):
+    model = KilnBaseModel(path=tmp_path / "model.kiln")
+    with patch("kiln_ai.datamodel.basemodel.os.replace", side_effect=OSError("full")):
+        errors = KilnBaseModel.save_many([model])
+    assert isinstance(errors[0], OSError)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_save_to_file_async(test_base_file, tmp_model_cache):
+    model = KilnBaseModel.load_from_file(test_base_file)
+    model.created_by = "someone_else"
+    await model.save_to_file_async()
+    assert model.path == test_base_file
+    assert KilnBaseModel.load_from_file(test_base_file).created_by == "someone_else"
+
+    with pytest.raises(ValueError, match="path' is not set"):
+        await KilnBaseModel().save_to_file_async()
+
+
+def test_save_many_empty():
+    assert KilnBaseModel.save_many([]) == []
+
+
 class MockAdapter(BaseAdapter):
     """Implementation of BaseAdapter for testing"""
 
@@ -0,0 +1,112 @@
+import asyncio
+import contextvars
+import inspect
+import threading
+import time
+
+import pytest
+
+from kiln_ai.datamodel import Project, Task, TaskOutput, TaskRun
+from kiln_ai.datamodel.blocking_io import (
+    blocking_handler,
+    datamodel_executor,
+    run_blocking,
+)
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id")
+
+
+async def test_run_blocking_runs_on_pool():
+    def thread_name(suffix: str) -> str:
+        return threading.current_thread().name + suffix
+
+    result = await run_blocking(thread_name, suffix="!")
+    assert result.startswith("kiln_datamodel")
+    assert result.endswith("!")
+
+
+async def test_run_blocking_copies_context():
+    request_id.set("abc")
+    assert await run_blocking(request_id.get) == "abc"
+
+
+async def test_run_blocking_raises():
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await run_blocking(fail)
+
+
+def test_executor_is_shared():
+    assert datamodel_executor() is datamodel_executor()
+
+
+async def test_blocking_handler_preserves_signature():
+    def handler(project_id: str, limit: int = 10) -> list[str]:
+        """Docs"""
+        return [project_id] * limit
+
+    wrapped = blocking_handler(handler)
+    assert inspect.iscoroutinefunction(wrapped)
+    assert wrapped.__name__ == "handler"
+    assert wrapped.__doc__ == "Docs"
+    assert inspect.signature(wrapped) == inspect.signature(handler)
+    assert await wrapped("p", limit=2) == ["p", "p"]
+
+
+async def test_blocking_work_does_not_block_loop():
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        await run_blocking(time.sleep, 0.3)
+    finally:
+        ticker_task.cancel()
+    # Would be ~1 if the sleep blocked the loop
+    assert ticks > 5
+
+
+@pytest.fixture
+def task(tmp_path):
+    project = Project(name="Test Project", path=tmp_path / "project.kiln")
+    project.save_to_file()
+    task = Task(name="Test Task", instruction="Do it", parent=project)
+    task.save_to_file()
+    return task
+
+
+def make_run(task: Task, input: str) -> TaskRun:
+    return TaskRun(
+        parent=task,
+        input=input,
+        output=TaskOutput(output="out"),
+    )
+
+
+async def test_async_model_accessors(task):
+    run = make_run(task, "a")
+    await run.save_to_file_async()
+    assert run.path is not None and run.path.exists()
+
+    loaded = await TaskRun.load_from_file_async(run.path)
+    assert loaded.input == "a"
+
+    runs = await task.runs_async()
+    assert [r.id for r in runs] == [run.id]
+    readonly_runs = await task.runs_async(readonly=True)
+    assert [r.id for r in readonly_runs] == [run.id]
+
+    by_id = await TaskRun.from_id_and_parent_path_async(run.id, task.path)
+    assert by_id is not None and by_id.id == run.id
+    children = await TaskRun.all_children_of_parent_path_async(task.path)
+    assert [r.id for r in children] == [run.id]
+
+    await run.delete_async()
+    assert await task.runs_async() == []
@@ -1,6 +1,16 @@
+from unittest.mock import patch
+
 import pytest
 from pydantic import BaseModel
 
+from kiln_ai.datamodel import (
+    DataSource,
+    DataSourceType,
+    Task,
+    TaskOutput,
+    TaskOutputRating,
+    TaskRun,
+)
 from kiln_ai.datamodel.dataset_filters import (
     AllDatasetFilter,
     DatasetFilterId,
@@ -9,8 +19,12 @@ from kiln_ai.datamodel.dataset_filters import (
     TagFilter,
     ThinkingModelDatasetFilter,
     ThinkingModelHighRatedFilter,
+    add_dataset_filter_to_query,
     dataset_filter_from_id,
+    filter_fields,
+    filtered_run_ids,
 )
+from kiln_ai.datamodel.task_run_index import TaskRunIndex, TaskRunIndexQuery
 
 # Note: Many more filter tests in test_dataset_split.py
 
@@ -69,3 +83,139 @@ def test_tag_filter(tag, expected_error, expected_tag):
         filter = dataset_filter_from_id(tag)
         assert isinstance(filter, TagFilter)
         assert filter.tag == expected_tag
+
+
+def test_filter_fields():
+    assert filter_fields(AllDatasetFilter) == []
+    assert filter_fields(TagFilter("a")) == ["tags"]
+    assert filter_fields(HighRatingDatasetFilter) == ["output", "repaired_output"]
+    for filter_id in StaticDatasetFilters:
+        assert filter_fields(dataset_filter_from_id(filter_id)) is not None
+
+    # Unknown for custom filters
+    assert filter_fields(lambda run: True) is None
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        AllDatasetFilter,
+        HighRatingDatasetFilter,
+        ThinkingModelDatasetFilter,
+        ThinkingModelHighRatedFilter,
+        TagFilter("tag_a"),
+        # Custom filter, no known fields: full load
+        lambda run: run.input == "input 1",
+    ],
+)
+def test_filtered_run_ids(tmp_path, filter):
+    task = Task(name="Test Task", instruction="Test", path=tmp_path / "task.kiln")
+    task.save_to_file()
+    source = DataSource(type=DataSourceType.human, properties={"created_by": "Jane"})
+    for i in range(4):
+        TaskRun(
+            parent=task,
+            input=f"input {i}",
+            input_source=source,
+            output=TaskOutput(
+                output="output",
+                source=source,
+                rating=TaskOutputRating(value=5) if i % 2 == 0 else None,
+            ),
+            intermediate_outputs={"reasoning": "thinking"} if i < 2 else None,
+            tags=["tag_a"] if i == 3 else [],
+        ).save_to_file()
+
+    expected = {run.id for run in task.runs() if filter(run)}
+    assert set(filtered_run_ids(task.path, filter)) == expected
+
+
+def test_filtered_run_ids_tag_filter_uses_tag_index(tmp_path):
+    task = Task(name="Test Task", instruction="Test", path=tmp_path / "task.kiln")
+    task.save_to_file()
+    source = DataSource(type=DataSourceType.human, properties={"created_by": "Jane"})
+    runs = [
+        TaskRun(
+            parent=task,
+            input=f"input {i}",
+            input_source=source,
+            output=TaskOutput(output="output", source=source),
+            tags=["tag_a"] if i < 2 else ["tag_b"],
+        )
+        for i in range(4)
+    ]
+    for run in runs:
+        run.save_to_file()
+    filter = TagFilter("tag_a")
+    assert set(filtered_run_ids(task.path, filter)) == {runs[0].id, runs[1].id}
+
+    # Once indexed, only the tag index is read
+    with (
+        patch.object(TaskRun, "load_from_file") as mock_load,
+        patch.object(TaskRun, "load_partial") as mock_load_partial,
+    ):
+        assert set(filtered_run_ids(task.path, filter)) == {runs[0].id, runs[1].id}
+        mock_load.assert_not_called()
+        mock_load_partial.assert_not_called()
+
+    # Tag edits keep the index in sync
+    runs[0].tags = []
+    runs[0].save_to_file()
+    runs[3].tags = ["tag_a", "tag_b"]
+    runs[3].save_to_file()
+    assert set(filtered_run_ids(task.path, filter)) == {runs[1].id, runs[3].id}
+    runs[1].delete()
+    assert filtered_run_ids(task.path, filter) == [runs[3].id]
+    assert filtered_run_ids(task.path, TagFilter("missing")) == []
+
+
+@pytest.mark.parametrize(
+    "filter_id",
+    [
+        "all",
+        "high_rating",
+        "thinking_model",
+        "thinking_model_high_rated",
+        "tag::tag_a",
+    ],
+)
+def test_add_dataset_filter_to_query_matches_filter(tmp_path, filter_id):
+    task = Task(name="Test Task", instruction="Test", path=tmp_path / "task.kiln")
+    task.save_to_file()
+    source = DataSource(type=DataSourceType.human, properties={"created_by": "Jane"})
+    for i in range(6):
+        TaskRun(
+            parent=task,
+            input=f"input {i}",
+            input_source=source,
+            output=TaskOutput(
+                output="output",
+                source=source,
+                rating=TaskOutputRating(value=5 if i % 2 == 0 else 2),
+            ),
+            repair_instructions="fix it" if i == 5 else None,
+            repaired_output=TaskOutput(output="fixed", source=source)
+            if i == 5
+            else None,
+            intermediate_outputs={"reasoning": "thinking"} if i < 3 else None,
+            tags=["tag_a"] if i == 3 else [],
+        ).save_to_file()
+
+    query = TaskRunIndexQuery()
+    add_dataset_filter_to_query(query, filter_id)
+    filter = dataset_filter_from_id(filter_id)
+    expected = {run.id for run in task.runs() if filter(run)}
+    entries = TaskRunIndex.for_task_path(task.path).query(query).entries
+    assert {entry.id for entry in entries} == expected
+
+
+def test_add_dataset_filter_to_query_combines():
+    query = TaskRunIndexQuery(tags=["a"])
+    add_dataset_filter_to_query(query, "tag::b")
+    add_dataset_filter_to_query(query, "high_rating")
+    assert query.tags == ["a", "b"]
+    assert query.high_quality is True
+    assert query.has_thinking is None
+
+    with pytest.raises(ValueError):
+        add_dataset_filter_to_query(query, "unknown")
@@ -0,0 +1,172 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from kiln_ai.datamodel import (
+    DataSource,
+    DataSourceType,
+    Task,
+    TaskOutput,
+    TaskRun,
+)
+from kiln_ai.datamodel.eval import EvalRun
+from kiln_ai.datamodel.json_codec import (
+    JSON_CODECS,
+    OrjsonJsonCodec,
+    json_codec,
+    json_codec_by_name,
+)
+
+
+@pytest.fixture
+def task(tmp_path) -> Task:
+    task = Task(
+        name="Test Task",
+        instruction="Test Instruction",
+        path=tmp_path / "task" / "task.kiln",
+    )
+    task.save_to_file()
+    return task
+
+
+@pytest.fixture
+def task_run(task) -> TaskRun:
+    run = TaskRun(
+        parent=task,
+        input="Test input",
+        input_source=DataSource(
+            type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+        ),
+        output=TaskOutput(
+            output="Test output",
+            source=DataSource(
+                type=DataSourceType.synthetic,
+                properties={
+                    "model_name": "gpt_4o",
+                    "model_provider": "openai",
+                    "adapter_name": "test_adapter",
+                },
+            ),
+        ),
+        intermediate_outputs={"reasoning": "Thinking " * 500},
+        tags=["a", "b"],
+    )
+    run.save_to_file()
+    return run
+
+
+@pytest.fixture
+def eval_run(tmp_path) -> EvalRun:
+    run = EvalRun(
+        path=tmp_path / "eval_run.kiln",
+        dataset_id="dataset123",
+        task_run_config_id="config456",
+        input='{"key": "value"}',
+        output='{"result": "success"}',
+        scores={"accuracy": 0.95},
+    )
+    run.save_to_file()
+    return run
+
+
+def with_codec(name: str):
+    return patch(
+        "kiln_ai.datamodel.json_codec.Config.shared",
+        **{"return_value.get_value.return_value": name},
+    )
+
+
+def available_codecs():
+    codecs = []
+    for name in JSON_CODECS:
+        try:
+            json_codec_by_name(name)
+        except ValueError:
+            continue
+        codecs.append(name)
+    return codecs
+
+
+def test_default_codec():
+    assert json_codec().name == "stdlib"
+
+
+def test_invalid_codec():
+    with pytest.raises(ValueError, match="Invalid json_codec"):
+        json_codec_by_name("not_a_codec")
+
+
+def test_orjson_not_installed():
+    with (
+        patch.dict("sys.modules", {"orjson": None}),
+        pytest.raises(ValueError, match="requires the orjson package"),
+    ):
+        OrjsonJsonCodec()
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_codecs_load_same_models(codec, task_run, eval_run, task):
+    with with_codec(codec):
+        assert json_codec().name == codec
+        loaded_run = TaskRun.load_from_file(task_run.path)
+        assert loaded_run.model_dump() == task_run.model_dump()
+        loaded_eval_run = EvalRun.load_from_file(eval_run.path)
+        assert loaded_eval_run.model_dump() == eval_run.model_dump()
+        loaded_task = Task.load_from_file(task.path)
+        assert loaded_task.id == task.id
+        assert loaded_task.instruction == task.instruction
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_codecs_check_model_type(codec, task_run):
+    text = task_run.path.read_text()
+    task_run.path.write_text(text.replace('"task_run"', '"eval_run"'))
+    with with_codec(codec), pytest.raises(ValueError, match="model type"):
+        TaskRun.load_from_file(task_run.path)
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_codecs_model_type_not_last(codec, task_run):
+    # Hand edited files may have keys in any order
+    data = json.loads(task_run.path.read_text())
+    reordered = {"model_type": data.pop("model_type"), **data}
+    task_run.path.write_text(json.dumps(reordered))
+    with with_codec(codec):
+        assert TaskRun.load_from_file(task_run.path).id == task_run.id
+    reordered["model_type"] = "eval_run"
+    task_run.path.write_text(json.dumps(reordered))
+    with with_codec(codec), pytest.raises(ValueError, match="model type"):
+        TaskRun.load_from_file(task_run.path)
+
+
+@pytest.mark.parametrize("codec", available_codecs())
+def test_codecs_save_byte_identical(codec, task_run):
+    original = task_run.path.read_bytes()
+    with with_codec(codec):
+        loaded = TaskRun.load_from_file(task_run.path)
+        loaded.save_to_file()
+    assert task_run.path.read_bytes() == original
+
+
+@pytest.mark.benchmark
+def test_benchmark_codecs(benchmark, task_run, eval_run, task):
+    iterations = 500
+    results = []
+    for model in (task_run, eval_run, task):
+        model_type = type(model)
+        for codec in available_codecs():
+            with with_codec(codec):
+                start = benchmark._timer()
+                for _ in range(iterations):
+                    loaded = model_type.load_from_file(model.path)
+                load_time = benchmark._timer() - start
+
+                start = benchmark._timer()
+                for _ in range(iterations):
+                    loaded.save_to_file()
+                save_time = benchmark._timer() - start
+            results.append(
+                f"{model_type.__name__:8} {codec:8} load: {iterations / load_time:8.0f} ops/s, save: {iterations / save_time:8.0f} ops/s"
+            )
+    print("\n" + "\n".join(results))
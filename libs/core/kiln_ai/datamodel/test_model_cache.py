@@ -266,3 +266,148 @@ def test_get_model_readonly(model_cache, test_path):
 
     # Both should have the same data
     assert readonly_model == copied_model == model
+
+
+class OtherModelTest(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def enabled_cache():
+    def _make(**kwargs) -> ModelCache:
+        cache = ModelCache(**kwargs)
+        cache._enabled = True
+        return cache
+
+    return _make
+
+
+@pytest.fixture
+def make_file(tmp_path):
+    def _make(name: str) -> tuple[Path, int]:
+        path = tmp_path / name
+        path.touch()
+        return path, path.stat().st_mtime_ns
+
+    return _make
+
+
+def test_lru_eviction_by_entries(enabled_cache, make_file):
+    cache = enabled_cache(max_entries=2)
+    paths = [make_file(f"{i}.kiln") for i in range(3)]
+    cache.set_model(paths[0][0], ModelTest(name="0", value=0), paths[0][1])
+    cache.set_model(paths[1][0], ModelTest(name="1", value=1), paths[1][1])
+    # Use 0, so 1 is least recently used
+    assert cache.get_model(paths[0][0], ModelTest) is not None
+    cache.set_model(paths[2][0], ModelTest(name="2", value=2), paths[2][1])
+
+    assert list(cache.model_cache.keys()) == [paths[0][0], paths[2][0]]
+    assert cache.stats().evictions == 1
+
+
+def test_lru_eviction_by_bytes(enabled_cache, make_file):
+    cache = enabled_cache(max_bytes=250)
+    paths = [make_file(f"{i}.kiln") for i in range(3)]
+    for i, (path, mtime_ns) in enumerate(paths):
+        cache.set_model(path, ModelTest(name=str(i), value=i), mtime_ns, 100)
+
+    assert list(cache.model_cache.keys()) == [paths[1][0], paths[2][0]]
+    stats = cache.stats()
+    assert stats.approximate_bytes == 200
+    assert stats.evictions == 1
+
+
+def test_lru_eviction_per_type(enabled_cache, make_file):
+    cache = enabled_cache(max_entries_per_type={"ModelTest": 1})
+    a, b, c = make_file("a.kiln"), make_file("b.kiln"), make_file("c.kiln")
+    cache.set_model(a[0], ModelTest(name="a", value=1), a[1])
+    cache.set_model(b[0], OtherModelTest(name="b"), b[1])
+    cache.set_model(c[0], ModelTest(name="c", value=3), c[1])
+
+    assert list(cache.model_cache.keys()) == [b[0], c[0]]
+    assert cache.stats().entries_by_type == {"ModelTest": 1, "OtherModelTest": 1}
+
+
+def test_stats_counters(enabled_cache, make_file):
+    cache = enabled_cache()
+    path, mtime_ns = make_file("a.kiln")
+    cache.set_model(path, ModelTest(name="a", value=1), mtime_ns, 10)
+
+    assert cache.get_model(path, ModelTest) is not None
+    assert cache.get_model(path.parent / "missing.kiln", ModelTest) is None
+    cache.set_model(path, ModelTest(name="a", value=1), mtime_ns - 1)
+    assert cache.get_model(path, ModelTest) is None
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 2
+    assert stats.stale_invalidations == 1
+    assert stats.entries == 0
+    assert stats.approximate_bytes == 0
+
+    cache.reset_stats()
+    assert cache.stats().hits == 0
+
+
+def test_set_model_replaces_existing_entry(enabled_cache, make_file):
+    cache = enabled_cache()
+    path, mtime_ns = make_file("a.kiln")
+    cache.set_model(path, ModelTest(name="a", value=1), mtime_ns, 10)
+    cache.set_model(path, ModelTest(name="a", value=2), mtime_ns, 20)
+
+    stats = cache.stats()
+    assert stats.entries == 1
+    assert stats.approximate_bytes == 20
+    assert stats.entries_by_type == {"ModelTest": 1}
+
+
+@pytest.mark.parametrize(
+    "settings,expected",
+    [
+        ({}, (None, None, {})),
+        (
+            {
+                "model_cache_max_entries": 10,
+                "model_cache_max_bytes": 1000,
+                "model_cache_max_entries_per_type": {"TaskRun": 5},
+            },
+            (10, 1000, {"TaskRun": 5}),
+        ),
+    ],
+)
+def test_shared_uses_config_limits(settings, expected):
+    with (
+        mock.patch("kiln_ai.utils.config.Config.shared") as mock_shared,
+        mock.patch.object(ModelCache, "_shared_instance", None),
+    ):
+        mock_shared.return_value.get_value.side_effect = lambda name: settings.get(name)
+        cache = ModelCache.shared()
+        assert (
+            cache.max_entries,
+            cache.max_bytes,
+            cache.max_entries_per_type,
+        ) == expected
+
+
+def test_child_index(model_cache, tmp_path):
+    folder = tmp_path / "runs"
+    child_path = folder / "123 - Child" / "task_run.kiln"
+
+    # Not indexed: updates are ignored, the first lookup builds the full index
+    model_cache.set_child_path(folder, "123", child_path)
+    assert not model_cache.has_child_index(folder)
+    assert model_cache.child_path_for_id(folder, "123") is None
+
+    model_cache.set_child_index(folder, {"123": child_path})
+    assert model_cache.has_child_index(folder)
+    assert model_cache.child_path_for_id(folder, "123") == child_path
+
+    new_child_path = folder / "456 - New" / "task_run.kiln"
+    model_cache.set_child_path(folder, "456", new_child_path)
+    assert model_cache.child_path_for_id(folder, "456") == new_child_path
+
+    model_cache.remove_child_path(folder, "123")
+    assert model_cache.child_path_for_id(folder, "123") is None
+
+    model_cache.clear()
+    assert not model_cache.has_child_index(folder)
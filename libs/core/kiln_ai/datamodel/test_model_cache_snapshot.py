@@ -0,0 +1,238 @@
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from kiln_ai.datamodel import (
+    DataSource,
+    DataSourceType,
+    Project,
+    Task,
+    TaskOutput,
+    TaskRun,
+)
+from kiln_ai.datamodel.model_cache import ModelCache
+from kiln_ai.datamodel.model_cache_snapshot import (
+    ModelCacheSnapshot,
+    start_model_cache_snapshot,
+)
+
+
+def new_cache() -> ModelCache:
+    # Force the cache on, it's disabled on filesystems with coarse timestamps
+    cache = ModelCache()
+    cache._enabled = True
+    return cache
+
+
+@pytest.fixture
+def model_cache():
+    model_cache = new_cache()
+    with patch(
+        "kiln_ai.datamodel.basemodel.ModelCache.shared", return_value=model_cache
+    ):
+        yield model_cache
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return tmp_path / "cache" / "model_cache.snapshot"
+
+
+@pytest.fixture
+def task(tmp_path):
+    project = Project(name="Test Project", path=tmp_path / "project.kiln")
+    project.save_to_file()
+    task = Task(name="Test Task", instruction="Test Instruction", parent=project)
+    task.save_to_file()
+    for i in range(3):
+        TaskRun(
+            parent=task,
+            input=f"Input {i}",
+            input_source=DataSource(
+                type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+            ),
+            output=TaskOutput(
+                output="Test output",
+                source=DataSource(
+                    type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+                ),
+            ),
+        ).save_to_file()
+    return task
+
+
+def restart(model_cache: ModelCache, snapshot_path) -> ModelCacheSnapshot:
+    """Simulate a restart: empty cache, with the snapshot attached."""
+    model_cache.clear()
+    model_cache.reset_stats()
+    snapshot = ModelCacheSnapshot(snapshot_path, model_cache)
+    model_cache.set_snapshot(snapshot)
+    return snapshot
+
+
+def test_restore_after_restart(task, model_cache, snapshot_path):
+    runs = task.runs(readonly=True)
+    assert ModelCacheSnapshot(snapshot_path, model_cache).save() == 4
+    assert snapshot_path.exists()
+
+    restart(model_cache, snapshot_path)
+    with patch.object(TaskRun, "_model_from_text") as mock_parse:
+        restored = task.runs(readonly=True)
+        mock_parse.assert_not_called()
+    assert {run.id: run.input for run in restored} == {
+        run.id: run.input for run in runs
+    }
+    assert all(run.is_readonly() for run in restored)
+    # The runs, and their parent task
+    assert model_cache.stats().snapshot_restores == 4
+
+    # Parents aren't stored in the snapshot, they load from the path as usual
+    assert restored[0].cached_parent() is None
+    assert restored[0].parent is not None
+    assert restored[0].parent.id == task.id
+
+    # Editable copies still work
+    run = TaskRun.load_from_file(runs[0].path)
+    run.input = "Edited"
+    run.save_to_file()
+    assert TaskRun.load_from_file(runs[0].path).input == "Edited"
+
+
+def test_changed_files_not_restored(task, model_cache, snapshot_path):
+    runs = task.runs(readonly=True)
+    ModelCacheSnapshot(snapshot_path, model_cache).save()
+
+    # Changed while the app was closed
+    edited = TaskRun.load_from_file(runs[0].path)
+    edited.input = "Edited while closed"
+    edited.save_to_file()
+
+    restart(model_cache, snapshot_path)
+    assert TaskRun.load_from_file(runs[0].path).input == "Edited while closed"
+    assert TaskRun.load_from_file(runs[1].path).input == runs[1].input
+    assert model_cache.stats().snapshot_restores == 1
+
+
+def test_corrupt_snapshot_discarded(task, model_cache, snapshot_path):
+    snapshot_path.parent.mkdir(parents=True)
+    snapshot_path.write_bytes(b"not a pickle")
+    restart(model_cache, snapshot_path)
+    assert len(task.runs()) == 3
+    assert not snapshot_path.exists()
+
+
+def test_other_version_discarded(task, model_cache, snapshot_path):
+    task.runs(readonly=True)
+    ModelCacheSnapshot(snapshot_path, model_cache).save()
+
+    with open(snapshot_path, "rb") as f:
+        header = pickle.load(f)
+        groups = pickle.load(f)
+    header["kiln_version"] = "0.0.1"
+    with open(snapshot_path, "wb") as f:
+        pickle.dump(header, f)
+        pickle.dump(groups, f)
+
+    restart(model_cache, snapshot_path)
+    assert len(task.runs(readonly=True)) == 3
+    assert model_cache.stats().snapshot_restores == 0
+    assert not snapshot_path.exists()
+
+
+def test_changed_model_schema_skipped(task, model_cache, snapshot_path):
+    task.runs(readonly=True)
+    ModelCacheSnapshot(snapshot_path, model_cache).save()
+
+    snapshot = restart(model_cache, snapshot_path)
+    with patch(
+        "kiln_ai.datamodel.model_cache_snapshot.schema_fingerprint",
+        return_value="changed",
+    ):
+        assert snapshot.load() == {}
+        assert len(task.runs(readonly=True)) == 3
+    assert model_cache.stats().snapshot_restores == 0
+
+
+def test_save_keeps_entries_not_yet_restored(task, model_cache, snapshot_path):
+    runs = task.runs(readonly=True)
+    ModelCacheSnapshot(snapshot_path, model_cache).save()
+
+    # Only one run used this session
+    snapshot = restart(model_cache, snapshot_path)
+    TaskRun.load_from_file(runs[0].path, readonly=True)
+    assert len(model_cache.model_cache) == 1
+    assert snapshot.save() == 4
+
+    restart(model_cache, snapshot_path)
+    task.runs(readonly=True)
+    assert model_cache.stats().snapshot_restores == 4
+
+
+def test_save_if_changed(task, model_cache, snapshot_path):
+    snapshot = ModelCacheSnapshot(snapshot_path, model_cache)
+    task.runs(readonly=True)
+    assert snapshot.save_if_changed()
+    assert not snapshot.save_if_changed()
+    task.runs()[0].save_to_file()
+    assert snapshot.save_if_changed()
+
+
+def test_start_and_stop(task, model_cache, snapshot_path):
+    snapshot = ModelCacheSnapshot(snapshot_path, model_cache, save_interval_seconds=60)
+    snapshot.start()
+    assert snapshot.running()
+    assert model_cache.snapshot is snapshot
+    task.runs(readonly=True)
+    snapshot.stop()
+    assert not snapshot.running()
+    assert model_cache.snapshot is None
+    # Saved on stop
+    assert snapshot_path.exists()
+
+
+def test_disabled_by_default():
+    assert start_model_cache_snapshot() is None
+
+
+@pytest.mark.benchmark
+def test_benchmark_restore(benchmark, tmp_path, model_cache, snapshot_path):
+    project = Project(name="Test Project", path=tmp_path / "project.kiln")
+    project.save_to_file()
+    task = Task(name="Test Task", instruction="Test Instruction", parent=project)
+    task.save_to_file()
+    runs = [
+        TaskRun(
+            parent=task,
+            input=f"Input {i}",
+            input_source=DataSource(
+                type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+            ),
+            output=TaskOutput(
+                output="Test output",
+                source=DataSource(
+                    type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+                ),
+            ),
+            intermediate_outputs={"reasoning": "Thinking " * 200},
+        )
+        for i in range(500)
+    ]
+    TaskRun.save_many(runs)
+
+    restart(model_cache, None)
+    model_cache.set_snapshot(None)
+    start = benchmark._timer()
+    task.runs(readonly=True)
+    cold_time = benchmark._timer() - start
+
+    ModelCacheSnapshot(snapshot_path, model_cache).save()
+    restart(model_cache, snapshot_path)
+    start = benchmark._timer()
+    task.runs(readonly=True)
+    restored_time = benchmark._timer() - start
+    assert model_cache.stats().snapshot_restores == 501
+
+    print(
+        f"\n500 runs, cold: {cold_time * 1000:.1f}ms, from snapshot: {restored_time * 1000:.1f}ms"
+    )
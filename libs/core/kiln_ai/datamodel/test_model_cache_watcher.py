@@ -0,0 +1,200 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from kiln_ai.datamodel.model_cache import ModelCache
+from kiln_ai.datamodel.model_cache_watcher import (
+    InotifyModelCacheWatcher,
+    PollingModelCacheWatcher,
+    inotify_available,
+    model_cache_watcher_from_config,
+    start_model_cache_watcher,
+)
+
+
+class ModelTest(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def cache():
+    cache = ModelCache()
+    cache._enabled = True
+    return cache
+
+
+@pytest.fixture
+def watched_file(tmp_path, cache):
+    path = tmp_path / "watched" / "model.kiln"
+    path.parent.mkdir()
+    path.write_text("{}")
+    cache.set_model(path, ModelTest(name="test"), path.stat().st_mtime_ns)
+    return path
+
+
+def touch_later(path):
+    # Force a new mtime, even on filesystems with coarse timestamps
+    mtime_ns = path.stat().st_mtime_ns + 1_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def wait_for(condition, timeout=5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_covered_reads_skip_stat(tmp_path, cache, watched_file):
+    watcher = PollingModelCacheWatcher([tmp_path / "watched"], cache, interval=60)
+    watcher.start()
+    try:
+        assert cache.watcher is watcher
+        assert watcher.covers(watched_file)
+        assert not watcher.covers(tmp_path / "other" / "model.kiln")
+        with patch.object(cache, "_is_cache_valid") as mock_valid:
+            assert cache.get_model(watched_file, ModelTest) is not None
+            mock_valid.assert_not_called()
+    finally:
+        watcher.stop()
+    assert cache.watcher is None
+    assert not watcher.covers(watched_file)
+
+
+def test_stale_read_not_cached_after_invalidation(tmp_path, cache):
+    path = tmp_path / "watched" / "model.kiln"
+    path.parent.mkdir()
+    path.write_text("{}")
+    watcher = PollingModelCacheWatcher([tmp_path / "watched"], cache, interval=60)
+    watcher.start()
+    try:
+        # A reader reads the file...
+        read_mtime_ns = path.stat().st_mtime_ns
+        stale_model = ModelTest(name="stale")
+
+        # ...then the file changes, and the watcher invalidates it...
+        touch_later(path)
+        cache.invalidate(path)
+
+        # ...before the reader caches what it read
+        assert not cache.set_model(path, stale_model, read_mtime_ns)
+        assert not cache.set_fields(
+            path, ModelTest, ("name",), {"name": "stale"}, read_mtime_ns
+        )
+        assert cache.get_model(path, ModelTest) is None
+        assert cache.get_fields(path, ModelTest, ("name",)) is None
+
+        # A read of the current version is cached as usual
+        current_mtime_ns = path.stat().st_mtime_ns
+        assert cache.set_model(path, ModelTest(name="fresh"), current_mtime_ns)
+        assert cache.get_model(path, ModelTest).name == "fresh"
+    finally:
+        watcher.stop()
+
+
+def test_polling_invalidates_changed_files(tmp_path, cache, watched_file):
+    watcher = PollingModelCacheWatcher([tmp_path / "watched"], cache)
+    watcher.poll_once()
+    assert watched_file in cache.model_cache
+
+    touch_later(watched_file)
+    watcher.poll_once()
+    assert watched_file not in cache.model_cache
+
+
+def test_polling_thread(tmp_path, cache, watched_file):
+    watcher = PollingModelCacheWatcher([tmp_path / "watched"], cache, interval=0.01)
+    watcher.start()
+    try:
+        touch_later(watched_file)
+        assert wait_for(lambda: watched_file not in cache.model_cache)
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.skipif(not inotify_available(), reason="inotify requires Linux")
+def test_inotify_invalidates_changed_files(tmp_path, cache, watched_file):
+    watcher = InotifyModelCacheWatcher([tmp_path / "watched"], cache)
+    watcher.start()
+    try:
+        watched_file.write_text('{"changed": true}')
+        assert wait_for(lambda: watched_file not in cache.model_cache)
+
+        # New folders are watched too
+        new_file = tmp_path / "watched" / "new_folder" / "model.kiln"
+        new_file.parent.mkdir()
+        assert wait_for(lambda: str(new_file.parent) in watcher._watch_paths.values())
+        new_file.write_text("{}")
+        cache.set_model(new_file, ModelTest(name="new"), new_file.stat().st_mtime_ns)
+        new_file.write_text('{"changed": true}')
+        assert wait_for(lambda: new_file not in cache.model_cache)
+    finally:
+        watcher.stop()
+
+
+def test_invalidate_under(tmp_path, cache, watched_file):
+    other = tmp_path / "watched_other.kiln"
+    other.write_text("{}")
+    cache.set_model(other, ModelTest(name="other"), other.stat().st_mtime_ns)
+
+    cache.invalidate_under(tmp_path / "watched")
+    assert watched_file not in cache.model_cache
+    assert other in cache.model_cache
+
+
+@pytest.mark.parametrize(
+    "mode,expected",
+    [
+        ("off", None),
+        (None, None),
+        ("polling", PollingModelCacheWatcher),
+        ("inotify", InotifyModelCacheWatcher),
+    ],
+)
+def test_watcher_from_config(tmp_path, mode, expected):
+    project_path = tmp_path / "project" / "project.kiln"
+    project_path.parent.mkdir()
+    with patch("kiln_ai.datamodel.model_cache_watcher.Config.shared") as mock_shared:
+        mock_shared.return_value.get_value.return_value = mode
+        mock_shared.return_value.projects = [str(project_path)]
+        watcher = model_cache_watcher_from_config()
+    if expected is None:
+        assert watcher is None
+    else:
+        assert isinstance(watcher, expected)
+        assert watcher.roots == [str(project_path.parent)]
+
+
+def test_watcher_from_config_invalid():
+    with patch("kiln_ai.datamodel.model_cache_watcher.Config.shared") as mock_shared:
+        mock_shared.return_value.get_value.return_value = "invalid"
+        mock_shared.return_value.projects = []
+        with pytest.raises(ValueError):
+            model_cache_watcher_from_config()
+
+
+def test_start_falls_back_to_polling(tmp_path, cache):
+    failing = InotifyModelCacheWatcher([tmp_path], cache)
+    with (
+        patch(
+            "kiln_ai.datamodel.model_cache_watcher.model_cache_watcher_from_config",
+            return_value=failing,
+        ),
+        patch.object(failing, "_setup", side_effect=OSError("no watches left")),
+        patch(
+            "kiln_ai.datamodel.model_cache_watcher.ModelCache.shared",
+            return_value=cache,
+        ),
+    ):
+        watcher = start_model_cache_watcher()
+    try:
+        assert isinstance(watcher, PollingModelCacheWatcher)
+        assert watcher.running()
+    finally:
+        assert watcher is not None
+        watcher.stop()
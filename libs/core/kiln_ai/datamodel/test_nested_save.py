@@ -1,7 +1,17 @@
+import os
+import shutil
+import threading
+import time
+from unittest.mock import patch
+
 import pytest
 from pydantic import Field, ValidationError
 
-from kiln_ai.datamodel.basemodel import KilnParentedModel, KilnParentModel
+from kiln_ai.datamodel.basemodel import (
+    STALE_LEFTOVER_SECONDS,
+    KilnParentedModel,
+    KilnParentModel,
+)
 
 
 class ModelC(KilnParentedModel):
@@ -204,3 +214,116 @@ def test_validation_error_in_c_level_length():
         ModelA.validate_and_save_with_subrelations(data)
 
     assert "String should match pattern" in str(exc_info.value)
+
+
+def staged_data():
+    return {
+        "name": "Root",
+        "bs": [
+            {"value": i, "cs": [{"code": "ABC"}, {"code": "DEF"}]} for i in range(5)
+        ],
+    }
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_staged_save_new_folder(tmp_path, parallel):
+    root_path = tmp_path / "root" / "model_a.kiln"
+
+    instance = ModelA.validate_and_save_with_subrelations(
+        staged_data(), path=root_path, parallel=parallel
+    )
+
+    assert instance.path == root_path
+    bs = instance.bs()
+    assert sorted(b.value for b in bs) == list(range(5))
+    assert all(len(b.cs()) == 2 for b in bs)
+    # The staging folder is cleaned up
+    assert os.listdir(tmp_path) == ["root"]
+    assert sorted(os.listdir(tmp_path / "root")) == ["bs", "model_a.kiln"]
+
+
+def test_staged_save_merges_into_existing_folder(tmp_path):
+    root_path = tmp_path / "model_a.kiln"
+    instance = ModelA.validate_and_save_with_subrelations(staged_data(), path=root_path)
+
+    # Save over the existing root, adding another child. Existing children are kept.
+    data = {"id": instance.id, "name": "Renamed", "bs": [{"value": 99}]}
+    updated = ModelA.validate_and_save_with_subrelations(data, path=root_path)
+
+    assert ModelA.load_from_file(root_path).name == "Renamed"
+    assert sorted(b.value for b in updated.bs()) == [0, 1, 2, 3, 4, 99]
+    assert not any(name.startswith(".kiln_staging") for name in os.listdir(tmp_path))
+
+
+def test_staged_save_writes_nothing_if_invalid(tmp_path):
+    data = staged_data()
+    data["bs"][3]["cs"][1]["code"] = "invalid"
+    data["bs"][4]["value"] = -1
+
+    with pytest.raises(ValidationError) as exc_info:
+        ModelA.validate_and_save_with_subrelations(
+            data, path=tmp_path / "root" / "model_a.kiln"
+        )
+
+    # All errors reported at once
+    assert [error["loc"] for error in exc_info.value.errors()] == [
+        ("bs", 3, "cs", 1, "code"),
+        ("bs", 4, "value"),
+    ]
+    assert os.listdir(tmp_path) == []
+
+
+def test_staged_save_write_failure_leaves_nothing(tmp_path):
+    root_path = tmp_path / "root" / "model_a.kiln"
+
+    with (
+        patch("kiln_ai.datamodel.basemodel.os.rename", side_effect=OSError("boom")),
+        patch(
+            "kiln_ai.datamodel.basemodel._merge_staged_folder",
+            side_effect=OSError("boom"),
+        ),
+    ):
+        with pytest.raises(OSError, match="boom"):
+            ModelA.validate_and_save_with_subrelations(staged_data(), path=root_path)
+
+    assert not (tmp_path / "root").exists()
+    assert not any(name.startswith(".kiln_staging") for name in os.listdir(tmp_path))
+
+
+def test_staged_save_sweeps_stale_staging_folders(tmp_path):
+    # Left by processes which exited mid-save, one long ago and one maybe still saving
+    stale = tmp_path / ".kiln_staging_stale"
+    (stale / "root").mkdir(parents=True)
+    old_mtime = time.time() - STALE_LEFTOVER_SECONDS - 60
+    os.utime(stale, (old_mtime, old_mtime))
+    in_use = tmp_path / ".kiln_staging_in_use"
+    (in_use / "root").mkdir(parents=True)
+
+    threads = []
+    original_thread = threading.Thread
+
+    def capture_thread(*args, **kwargs):
+        thread = original_thread(*args, **kwargs)
+        threads.append(thread)
+        return thread
+
+    with patch("kiln_ai.datamodel.basemodel.threading.Thread", capture_thread):
+        ModelA.validate_and_save_with_subrelations(
+            staged_data(), path=tmp_path / "root" / "model_a.kiln"
+        )
+    for thread in threads:
+        thread.join()
+    assert sorted(os.listdir(tmp_path)) == [".kiln_staging_in_use", "root"]
+
+
+def test_child_scans_skip_staging_folders(tmp_path):
+    instance = ModelA.validate_and_save_with_subrelations(
+        staged_data(), path=tmp_path / "model_a.kiln"
+    )
+    b_path = instance.bs()[0].path
+    assert b_path is not None
+    # A staged child folder, which looks just like a child
+    shutil.copytree(b_path.parent, b_path.parent.parent / ".kiln_staging_leftover")
+
+    assert len(instance.bs()) == 5
+    assert len(ModelB._child_paths_from_dirnames(b_path.parent.parent)) == 5
@@ -0,0 +1,306 @@
+from unittest.mock import patch
+
+import pytest
+
+from kiln_ai.datamodel import (
+    DataSource,
+    DataSourceType,
+    Project,
+    Task,
+    TaskOutput,
+    TaskRun,
+)
+from kiln_ai.datamodel.model_cache import ModelCache
+from kiln_ai.datamodel.packed_storage import (
+    INDEX_FILENAME,
+    PACKED_FOLDER_NAME,
+    PackedStore,
+    pack_relationship,
+    packed_file_state,
+    unpack_relationship,
+)
+from kiln_ai.datamodel.task_run_index import TaskRunIndex
+
+
+@pytest.fixture
+def model_cache():
+    # Force the cache on, it's disabled on filesystems with coarse timestamps
+    model_cache = ModelCache()
+    model_cache._enabled = True
+    with patch(
+        "kiln_ai.datamodel.basemodel.ModelCache.shared", return_value=model_cache
+    ):
+        yield model_cache
+
+
+@pytest.fixture
+def task(tmp_path):
+    project = Project(name="Test Project", path=tmp_path / "project.kiln")
+    project.save_to_file()
+    task = Task(name="Test Task", instruction="Test Instruction", parent=project)
+    task.save_to_file()
+    return task
+
+
+def make_run(task, input="Test input", save=True) -> TaskRun:
+    run = TaskRun(
+        parent=task,
+        input=input,
+        input_source=DataSource(
+            type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+        ),
+        output=TaskOutput(
+            output="Test output",
+            source=DataSource(
+                type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+            ),
+        ),
+    )
+    if save:
+        run.save_to_file()
+    return run
+
+
+@pytest.fixture
+def packed_task(task):
+    for i in range(5):
+        make_run(task, input=f"Input {i}")
+    assert pack_relationship(TaskRun, task.path) == 5
+    return task
+
+
+def runs_folder(task):
+    return task.path.parent / "runs"
+
+
+def test_pack_relationship(task):
+    runs = [make_run(task, input=f"Input {i}") for i in range(5)]
+    assert pack_relationship(TaskRun, task.path) == 5
+
+    # Folders are gone, only the store is left
+    assert [p.name for p in runs_folder(task).iterdir()] == [PACKED_FOLDER_NAME]
+
+    # Same children, at the same paths
+    loaded = {run.id: run for run in task.runs()}
+    assert set(loaded.keys()) == {run.id for run in runs}
+    for run in runs:
+        assert loaded[run.id].path == run.path
+        assert loaded[run.id].input == run.input
+        assert loaded[run.id].parent.id == task.id
+
+    found = TaskRun.from_id_and_parent_path(runs[2].id, task.path)
+    assert found is not None
+    assert found.input == "Input 2"
+
+
+def test_pack_relationship_keeps_folders_with_other_files(task):
+    run = make_run(task)
+    assert run.path is not None
+    (run.path.parent / "notes.txt").write_text("keep me")
+    pack_relationship(TaskRun, task.path)
+    assert not run.path.exists()
+    assert (run.path.parent / "notes.txt").exists()
+    assert len(task.runs()) == 1
+
+
+def test_pack_relationship_rejects_parent_models(tmp_path):
+    project = Project(name="Test Project", path=tmp_path / "project.kiln")
+    project.save_to_file()
+    with pytest.raises(ValueError, match="children of its own"):
+        pack_relationship(Task, project.path)
+
+
+def test_save_edit_and_delete_packed(packed_task):
+    new_run = make_run(packed_task, input="New input")
+    assert new_run.path is not None
+    # In the store, not a folder
+    assert not new_run.path.parent.exists()
+    assert TaskRun.load_from_file(new_run.path).input == "New input"
+    assert len(packed_task.runs()) == 6
+
+    new_run.input = "Edited input"
+    new_run.save_to_file()
+    assert TaskRun.load_from_file(new_run.path).input == "Edited input"
+    assert not new_run.path.parent.exists()
+
+    path = new_run.path
+    new_run.delete()
+    assert len(packed_task.runs()) == 5
+    with pytest.raises(FileNotFoundError):
+        TaskRun.load_from_file(path)
+
+
+def test_save_many_packed(packed_task):
+    new_runs = [make_run(packed_task, input=f"Bulk {i}", save=False) for i in range(3)]
+    assert TaskRun.save_many(new_runs) == [None] * 3
+    assert all(run.path is not None for run in new_runs)
+    assert {run.input for run in packed_task.runs()} >= {"Bulk 0", "Bulk 1", "Bulk 2"}
+
+
+def test_load_fields_packed(packed_task):
+    run = packed_task.runs()[0]
+    assert run.path is not None
+    assert TaskRun.load_fields(run.path, ["input"]) == {"input": run.input}
+    assert TaskRun.load_partial(run.path, ["input"]).input == run.input
+
+
+def test_packed_cache(packed_task, model_cache):
+    run = packed_task.runs()[0]
+    assert run.path is not None
+    first = TaskRun.load_from_file(run.path, readonly=True)
+    assert TaskRun.load_from_file(run.path, readonly=True) is first
+
+    # Changes by another writer (not through this model) are caught by the record version
+    store = PackedStore(runs_folder(packed_task), TaskRun.base_filename())
+    data, _ = store.read(run.path.parent.name)
+    store.write(run.path.parent.name, data.replace(b"Input", b"Changed"))
+    reloaded = TaskRun.load_from_file(run.path, readonly=True)
+    assert reloaded is not first
+    assert reloaded.input.startswith("Changed")
+
+
+def test_real_files_win(packed_task):
+    run = packed_task.runs()[0]
+    assert run.path is not None
+    # e.g. a git pull restoring a folder
+    run.path.parent.mkdir()
+    run.path.write_text(run.model_copy(update={"input": "From file"}).model_dump_json())
+
+    assert TaskRun.load_from_file(run.path).input == "From file"
+    runs = packed_task.runs()
+    assert len(runs) == 5
+    assert [r.input for r in runs if r.id == run.id] == ["From file"]
+
+    # Saves go to the file, deletes remove both copies
+    loaded = TaskRun.load_from_file(run.path)
+    loaded.input = "Saved to file"
+    loaded.save_to_file()
+    assert "Saved to file" in run.path.read_text()
+    loaded.delete()
+    assert len(packed_task.runs()) == 4
+
+
+def test_unpack_relationship(packed_task):
+    runs = {run.id: run.input for run in packed_task.runs()}
+    assert unpack_relationship(TaskRun, packed_task.path) == 5
+    assert not (runs_folder(packed_task) / PACKED_FOLDER_NAME).exists()
+    assert PackedStore.for_relationship_folder(runs_folder(packed_task)) is None
+
+    loaded = packed_task.runs()
+    assert {run.id: run.input for run in loaded} == runs
+    assert all(run.path is not None and run.path.is_file() for run in loaded)
+    # Pretty printed, like save_to_file
+    assert loaded[0].path.read_text().startswith('{\n  "v": 1')
+
+    # Not packed any more: nothing to do
+    assert unpack_relationship(TaskRun, packed_task.path) == 0
+
+
+def test_compact(packed_task):
+    store = PackedStore.for_relationship_folder(runs_folder(packed_task))
+    assert store is not None
+    run = packed_task.runs()[0]
+    for i in range(5):
+        run.input = f"Edit {i}"
+        run.save_to_file()
+    packed_task.runs()[1].delete()
+    assert store.dead_bytes() > 0
+    old_segments = set(store.store_folder.glob("segment-*.seg"))
+
+    store.compact()
+    assert store.dead_bytes() == 0
+    assert set(store.store_folder.glob("segment-*.seg")).isdisjoint(old_segments)
+    runs = packed_task.runs()
+    assert len(runs) == 4
+    assert run.path is not None
+    assert TaskRun.load_from_file(run.path).input == "Edit 4"
+
+
+def test_auto_compact(packed_task):
+    store = PackedStore.for_relationship_folder(runs_folder(packed_task))
+    assert store is not None
+    runs = packed_task.runs()
+    with patch("kiln_ai.datamodel.packed_storage.COMPACT_MIN_DEAD_BYTES", 0):
+        runs[0].delete()
+        runs[1].delete()
+        assert store.dead_bytes() > 0
+        # Dead bytes now outweigh live bytes, so it compacts
+        runs[2].delete()
+    assert store.dead_bytes() == 0
+    assert len(packed_task.runs()) == 2
+
+
+def test_segment_rollover(task):
+    store = PackedStore.create(runs_folder(task), TaskRun.base_filename())
+    with patch("kiln_ai.datamodel.packed_storage.SEGMENT_MAX_BYTES", 100):
+        store.write_many(
+            [(f"child{i}", b'{"x": "' + b"a" * 60 + b'"}') for i in range(3)]
+        )
+    assert len(list(store.store_folder.glob("segment-*.seg"))) == 3
+    assert store.read("child2")[0].startswith(b'{"x"')
+
+
+def test_refresh_sees_other_writers(task):
+    store = PackedStore.create(runs_folder(task), TaskRun.base_filename())
+    store.write("child1", b"{}")
+    # A second instance stands in for another process
+    other = PackedStore(runs_folder(task), TaskRun.base_filename())
+    other.write("child2", b"{}")
+    assert store.refresh() == ["child2"]
+    assert set(store.entries().keys()) == {"child1", "child2"}
+
+    other.compact()
+    # Index replaced: full reload
+    assert store.refresh() is None
+    assert set(store.entries().keys()) == {"child1", "child2"}
+
+
+def test_partial_index_line_ignored(task):
+    store = PackedStore.create(runs_folder(task), TaskRun.base_filename())
+    store.write("child1", b"{}")
+    with open(store.store_folder / INDEX_FILENAME, "a") as f:
+        f.write("child2\t1\t0")
+    assert set(store.entries().keys()) == {"child1"}
+
+
+def test_packed_file_state(packed_task, tmp_path):
+    run = packed_task.runs()[0]
+    assert run.path is not None
+    state = packed_file_state(run.path)
+    assert state is not None
+    assert state[1] > 0
+    assert packed_file_state(tmp_path / "missing" / "task_run.kiln") is None
+
+
+def test_run_index_with_packed_runs(packed_task):
+    index = TaskRunIndex.for_task_path(packed_task.path)
+    assert len(index.entries()) == 5
+
+    new_run = make_run(packed_task, input="New input")
+    assert new_run.id in {e.id for e in index.entries(sync=False)}
+    with (
+        patch.object(TaskRun, "load_from_file") as mock_load,
+        patch.object(TaskRun, "load_partial") as mock_load_partial,
+    ):
+        assert len(index.entries()) == 6
+        mock_load.assert_not_called()
+        mock_load_partial.assert_not_called()
+
+
+def test_delete_many_packed(packed_task):
+    runs = packed_task.runs()
+    # A real file shadowing a packed record: both copies must go
+    runs[0].path.parent.mkdir()
+    runs[0].path.write_text(runs[0].model_dump_json(exclude={"path"}))
+    index = TaskRunIndex.for_task_path(packed_task.path)
+    assert len(index.entries()) == 5
+
+    store = PackedStore.for_model_path(runs[1].path)
+    assert store is not None
+    deleted_dirname = runs[1].path.parent.name
+    with patch.object(store, "delete_many", wraps=store.delete_many) as mock_delete:
+        assert TaskRun.delete_many(runs[:3]) == [None] * 3
+        mock_delete.assert_called_once()
+    assert len(packed_task.runs()) == 2
+    assert {e.id for e in index.entries(sync=False)} == {r.id for r in runs[3:]}
+    assert store.delete_many([deleted_dirname]) == [False]
@@ -0,0 +1,318 @@
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from kiln_ai.datamodel import (
+    DataSource,
+    DataSourceType,
+    Project,
+    Task,
+    TaskOutput,
+    TaskRun,
+    parallel_load,
+)
+from kiln_ai.datamodel.model_cache import ModelCache
+from kiln_ai.datamodel.parallel_load import (
+    freeze_support,
+    iter_models,
+    load_models,
+    parallel_load_settings,
+    process_pool_available,
+)
+
+
+@pytest.fixture
+def model_cache():
+    # Force the cache on, it's disabled on filesystems with coarse timestamps
+    model_cache = ModelCache()
+    model_cache._enabled = True
+    with patch(
+        "kiln_ai.datamodel.basemodel.ModelCache.shared", return_value=model_cache
+    ):
+        yield model_cache
+
+
+@pytest.fixture
+def task(tmp_path):
+    project = Project(name="Test Project", path=tmp_path / "project.kiln")
+    project.save_to_file()
+    task = Task(name="Test Task", instruction="Test Instruction", parent=project)
+    task.save_to_file()
+    return task
+
+
+def write_runs(task: Task, count: int) -> None:
+    # Write run files directly: much faster than save_to_file for large counts
+    run = TaskRun(
+        parent=task,
+        input="Test input",
+        input_source=DataSource(
+            type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+        ),
+        output=TaskOutput(
+            output="Test output",
+            source=DataSource(
+                type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+            ),
+        ),
+    )
+    data = json.loads(run.model_dump_json(exclude={"path"}))
+    assert task.path is not None
+    runs_folder = task.path.parent / "runs"
+    for i in range(count):
+        data["id"] = str(100000000000 + i)
+        data["input"] = f"Test input {i}"
+        run_folder = runs_folder / data["id"]
+        run_folder.mkdir(parents=True)
+        (run_folder / "task_run.kiln").write_text(json.dumps(data))
+
+
+def run_paths(task: Task):
+    return list(TaskRun._iterate_children_paths_with_mtime(task.path))
+
+
+def test_parallel_load_settings_defaults():
+    thread_threshold, process_threshold, workers = parallel_load_settings()
+    assert thread_threshold == 256
+    assert process_threshold == 20000
+    assert workers >= 1
+
+
+def test_parallel_load_settings_from_config():
+    with patch("kiln_ai.datamodel.parallel_load.Config.shared") as mock_shared:
+        mock_shared.return_value.get_value.side_effect = {
+            "parallel_load_threshold": 10,
+            "parallel_load_process_threshold": 100,
+            "parallel_load_workers": 3,
+        }.get
+        assert parallel_load_settings() == (10, 100, 3)
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        # serial
+        (1000, 1000, 4),
+        # thread pool
+        (1, 1000, 4),
+        # process pool
+        (1, 1, 2),
+    ],
+)
+def test_load_models(task, model_cache, settings):
+    write_runs(task, 10)
+    paths = run_paths(task)
+    with patch(
+        "kiln_ai.datamodel.parallel_load.parallel_load_settings",
+        return_value=settings,
+    ):
+        runs = load_models(TaskRun, paths)
+
+    # In order, editable, and cached
+    assert [run.path for run in runs] == [path for path, _ in paths]
+    assert all(not run.is_readonly() for run in runs)
+    assert all(
+        model_cache.get_model(path, TaskRun, readonly=True) is not None
+        for path, _ in paths
+    )
+    assert {run.input for run in runs} == {f"Test input {i}" for i in range(10)}
+
+
+def test_load_models_uses_process_pool(task, model_cache):
+    write_runs(task, 10)
+    paths = run_paths(task)
+    with (
+        patch(
+            "kiln_ai.datamodel.parallel_load.parallel_load_settings",
+            return_value=(1, 1, 2),
+        ),
+        patch(
+            "kiln_ai.datamodel.parallel_load._load_with_processes",
+            wraps=parallel_load._load_with_processes,
+        ) as mock_processes,
+        patch(
+            "kiln_ai.datamodel.parallel_load._load_with_threads",
+        ) as mock_threads,
+    ):
+        runs = load_models(TaskRun, paths)
+
+    mock_processes.assert_called_once()
+    mock_threads.assert_not_called()
+    assert [run.path for run in runs] == [path for path, _ in paths]
+
+
+def test_frozen_app_without_freeze_support_uses_threads(task, model_cache):
+    write_runs(task, 10)
+    paths = run_paths(task)
+    with (
+        patch.object(sys, "frozen", True, create=True),
+        patch("kiln_ai.datamodel.parallel_load._freeze_support_enabled", False),
+        patch(
+            "kiln_ai.datamodel.parallel_load.parallel_load_settings",
+            return_value=(1, 1, 2),
+        ),
+        patch("kiln_ai.datamodel.parallel_load._load_with_processes") as mock_processes,
+    ):
+        assert not process_pool_available()
+        runs = load_models(TaskRun, paths)
+
+    mock_processes.assert_not_called()
+    assert {run.input for run in runs} == {f"Test input {i}" for i in range(10)}
+
+
+def test_freeze_support_enables_process_pool():
+    with (
+        patch.object(sys, "frozen", True, create=True),
+        patch("kiln_ai.datamodel.parallel_load._freeze_support_enabled", False),
+        patch("multiprocessing.freeze_support") as mock_freeze_support,
+    ):
+        assert not process_pool_available()
+        freeze_support()
+        mock_freeze_support.assert_called_once()
+        assert process_pool_available()
+
+
+def test_load_models_readonly_uses_cache(task, model_cache):
+    write_runs(task, 10)
+    paths = run_paths(task)
+    with patch(
+        "kiln_ai.datamodel.parallel_load.parallel_load_settings",
+        return_value=(1, 1000, 4),
+    ):
+        runs = load_models(TaskRun, paths, readonly=True)
+        assert all(run.is_readonly() for run in runs)
+
+        with patch(
+            "kiln_ai.datamodel.parallel_load.read_model_file"
+        ) as mock_read_model_file:
+            warm_runs = load_models(TaskRun, paths, readonly=True)
+            mock_read_model_file.assert_not_called()
+    assert all(warm is cold for warm, cold in zip(warm_runs, runs))
+
+
+@pytest.mark.parametrize("settings", [(1, 1000, 4), (1, 1, 2)])
+def test_load_models_invalid_file_raises(task, model_cache, settings):
+    write_runs(task, 5)
+    paths = run_paths(task)
+    paths[2][0].write_text("not json")
+    with (
+        patch(
+            "kiln_ai.datamodel.parallel_load.parallel_load_settings",
+            return_value=settings,
+        ),
+        pytest.raises(ValueError),
+    ):
+        load_models(TaskRun, paths)
+
+
+def test_all_children_uses_parallel_load(task, model_cache):
+    write_runs(task, 10)
+    with patch(
+        "kiln_ai.datamodel.parallel_load.parallel_load_settings",
+        return_value=(1, 1000, 4),
+    ):
+        runs = task.runs()
+    assert len(runs) == 10
+
+
+def test_iter_models_batches(task, model_cache):
+    write_runs(task, 100)
+    paths = run_paths(task)
+    batch_sizes = []
+
+    def recording_load_models(cls, batch, readonly=False):
+        batch_sizes.append(len(batch))
+        return load_models(cls, batch, readonly=readonly)
+
+    with patch(
+        "kiln_ai.datamodel.parallel_load.load_models", side_effect=recording_load_models
+    ):
+        runs = list(iter_models(TaskRun, iter(paths), batch_size=32))
+
+    assert [run.path for run in runs] == [path for path, _ in paths]
+    # Batches grow up to the batch size
+    assert batch_sizes == [16, 32, 32, 20]
+
+
+def test_iter_children_filter_and_limit(task, model_cache):
+    write_runs(task, 50)
+    inputs = [run.input for run in task.runs()]
+
+    filtered = list(
+        task.iter_runs(filter=lambda run: run.input.endswith("1"), readonly=True)
+    )
+    assert [run.input for run in filtered] == [i for i in inputs if i.endswith("1")]
+    assert [run.input for run in task.iter_runs(limit=3)] == inputs[:3]
+    assert list(task.iter_runs(limit=0)) == []
+
+    # Stopping early only loads the first batch
+    with patch.object(
+        TaskRun, "load_from_file", wraps=TaskRun.load_from_file
+    ) as mock_load:
+        first = next(task.iter_runs())
+    assert first.input == inputs[0]
+    assert mock_load.call_count == 16
+
+
+def test_iter_children_stopping_early_closes_scandir(task, model_cache):
+    write_runs(task, 50)
+    real_scandir = os.scandir
+    open_scandirs = []
+
+    class TrackedScandir:
+        def __init__(self, path):
+            self._iterator = real_scandir(path)
+            open_scandirs.append(self)
+
+        def __enter__(self):
+            return self._iterator.__enter__()
+
+        def __exit__(self, *args):
+            open_scandirs.remove(self)
+            return self._iterator.__exit__(*args)
+
+    with patch("kiln_ai.datamodel.basemodel.os.scandir", TrackedScandir):
+        runs = task.iter_runs()
+        next(runs)
+        assert open_scandirs == []
+        runs.close()
+
+
+@pytest.mark.benchmark
+@pytest.mark.large_benchmark
+@pytest.mark.parametrize("count", [10_000, 100_000, 500_000])
+def test_benchmark_cold_load_runs(task, count):
+    write_runs(task, count)
+    paths = run_paths(task)
+
+    def time_cold_load(settings) -> float:
+        # New cache each time, so every load is cold
+        model_cache = ModelCache()
+        model_cache._enabled = True
+        with (
+            patch(
+                "kiln_ai.datamodel.basemodel.ModelCache.shared",
+                return_value=model_cache,
+            ),
+            patch(
+                "kiln_ai.datamodel.parallel_load.parallel_load_settings",
+                return_value=settings,
+            ),
+        ):
+            start = time.perf_counter()
+            runs = load_models(TaskRun, paths, readonly=True)
+            elapsed = time.perf_counter() - start
+        assert len(runs) == count
+        return elapsed
+
+    workers = parallel_load_settings()[2]
+    serial = time_cold_load((count + 1, count + 1, workers))
+    threads = time_cold_load((1, count + 1, workers))
+    processes = time_cold_load((1, 1, workers))
+    print(
+        f"\n{count} runs, {workers} workers. Serial: {serial:.2f}s, threads: {threads:.2f}s, processes: {processes:.2f}s"
+    )
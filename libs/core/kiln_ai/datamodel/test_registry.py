@@ -2,16 +2,39 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from kiln_ai.datamodel import Project
-from kiln_ai.datamodel.registry import all_projects, project_from_id
+from kiln_ai.datamodel import Project, Task
+from kiln_ai.datamodel.registry import (
+    ProjectRegistry,
+    all_projects,
+    project_from_id,
+    task_from_id,
+)
 
 
 @pytest.fixture
 def mock_config():
+    ProjectRegistry.shared().clear()
     with patch("kiln_ai.datamodel.registry.Config") as mock:
         config_instance = Mock()
         mock.shared.return_value = config_instance
         yield config_instance
+    ProjectRegistry.shared().clear()
+
+
+@pytest.fixture
+def projects_on_disk(tmp_path, mock_config):
+    projects = []
+    for i in range(3):
+        project = Project(
+            name=f"Project {i}", path=tmp_path / f"project{i}" / "project.kiln"
+        )
+        project.save_to_file()
+        Task(
+            name="Test Task", instruction="Test Instruction", parent=project
+        ).save_to_file()
+        projects.append(project)
+    mock_config.projects = [str(p.path) for p in projects]
+    return projects
 
 
 @pytest.fixture
@@ -94,3 +117,67 @@ def test_project_from_id_with_errors(mock_config, mock_project):
         result = project_from_id("target-id")
 
         assert result == project3
+
+
+def test_project_from_id_remembers_path(projects_on_disk):
+    target = projects_on_disk[2]
+    assert project_from_id(target.id).id == target.id
+
+    with patch.object(Project, "load_from_file", wraps=Project.load_from_file) as load:
+        assert project_from_id(target.id).id == target.id
+        load.assert_called_once_with(str(target.path))
+
+
+def test_all_projects_remembers_paths(projects_on_disk):
+    assert len(all_projects()) == 3
+    with patch.object(Project, "load_from_file", wraps=Project.load_from_file) as load:
+        assert project_from_id(projects_on_disk[1].id) is not None
+        assert load.call_count == 1
+
+
+def test_project_list_change_clears_registry(projects_on_disk, mock_config):
+    removed = projects_on_disk[0]
+    assert project_from_id(removed.id) is not None
+    mock_config.projects = [str(p.path) for p in projects_on_disk[1:]]
+    assert project_from_id(removed.id) is None
+
+
+def test_project_replaced_on_disk(projects_on_disk, mock_config):
+    first, second = projects_on_disk[0], projects_on_disk[1]
+    assert project_from_id(first.id) is not None
+    assert project_from_id(second.id) is not None
+
+    # Swap the paths in the project files, without changing the setting
+    first_text = first.path.read_text()
+    first.path.write_text(second.path.read_text())
+    second.path.write_text(first_text)
+
+    assert project_from_id(first.id).path == second.path
+    assert project_from_id(second.id).path == first.path
+
+
+def test_task_from_id_remembers_path(projects_on_disk):
+    project = projects_on_disk[1]
+    task = project.tasks()[0]
+    assert task_from_id(project.id, task.id).id == task.id
+
+    with (
+        patch.object(Project, "load_from_file") as load_project,
+        patch.object(Task, "load_from_file", wraps=Task.load_from_file) as load_task,
+    ):
+        found = task_from_id(project.id, task.id)
+        load_project.assert_not_called()
+        load_task.assert_called_once_with(task.path)
+    assert found is not None
+    assert found.id == task.id
+    assert found.parent.id == project.id
+
+
+def test_task_from_id_deleted_task(projects_on_disk):
+    project = projects_on_disk[0]
+    task = project.tasks()[0]
+    assert task_from_id(project.id, task.id) is not None
+    task.delete()
+    assert task_from_id(project.id, task.id) is None
+    assert task_from_id(project.id, "missing") is None
+    assert task_from_id("missing", task.id) is None
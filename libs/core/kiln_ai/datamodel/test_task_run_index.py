@@ -0,0 +1,509 @@
+import base64
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from unittest.mock import patch
+
+import pytest
+
+from kiln_ai.datamodel import (
+    DataSource,
+    DataSourceType,
+    Project,
+    Task,
+    TaskOutput,
+    TaskOutputRating,
+    TaskRun,
+)
+from kiln_ai.datamodel.task_run_index import (
+    PREVIEW_CHARS,
+    TaskRunIndex,
+    TaskRunIndexQuery,
+)
+
+
+@pytest.fixture
+def task(tmp_path):
+    project = Project(name="Test Project", path=tmp_path / "project.kiln")
+    project.save_to_file()
+    task = Task(name="Test Task", instruction="Test Instruction", parent=project)
+    task.save_to_file()
+    return task
+
+
+def make_run(task, input="Test input", tags=None, rating=None, save=True) -> TaskRun:
+    run = TaskRun(
+        parent=task,
+        input=input,
+        input_source=DataSource(
+            type=DataSourceType.human, properties={"created_by": "Jane Doe"}
+        ),
+        output=TaskOutput(
+            output="Test output",
+            source=DataSource(
+                type=DataSourceType.synthetic,
+                properties={
+                    "model_name": "gpt_4o",
+                    "model_provider": "openai",
+                    "adapter_name": "test_adapter",
+                },
+            ),
+            rating=rating,
+        ),
+        tags=tags or [],
+    )
+    if save:
+        run.save_to_file()
+    return run
+
+
+def test_entries_builds_index(task):
+    run = make_run(task, tags=["a", "b"], rating=TaskOutputRating(value=4))
+    index = TaskRunIndex.for_task_path(task.path)
+    assert not index.index_path.exists()
+
+    entries = index.entries()
+    assert index.index_path.exists()
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry.id == run.id
+    assert entry.path == run.path
+    assert entry.created_at == run.created_at
+    assert entry.tags == ["a", "b"]
+    assert entry.rating is not None
+    assert entry.rating.value == 4
+    assert entry.input_source_type == "human"
+    assert entry.model_name == "gpt_4o"
+    assert entry.repaired is False
+    assert entry.has_output is True
+    assert entry.input_preview == "Test input"
+    assert entry.output_preview == "Test output"
+
+
+def test_for_task_path_shared_instance(task):
+    assert TaskRunIndex.for_task_path(task.path) is TaskRunIndex.for_task_path(
+        task.path.parent
+    )
+
+
+def test_preview_truncated(task):
+    make_run(task, input="x" * (PREVIEW_CHARS * 2))
+    entries = TaskRunIndex.for_task_path(task.path).entries()
+    assert entries[0].input_preview == "x" * PREVIEW_CHARS
+
+
+def test_sync_only_loads_changed_runs(task):
+    make_run(task)
+    make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+    index.entries()
+
+    with (
+        patch.object(TaskRun, "load_from_file") as mock_load,
+        patch.object(TaskRun, "load_partial") as mock_load_partial,
+    ):
+        assert len(index.entries()) == 2
+        mock_load.assert_not_called()
+        mock_load_partial.assert_not_called()
+
+
+def test_save_and_delete_keep_index_updated(task):
+    run = make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+    index.entries()
+
+    run.tags = ["updated"]
+    run.save_to_file()
+    assert index.entries(sync=False)[0].tags == ["updated"]
+
+    new_run = make_run(task)
+    assert {e.id for e in index.entries(sync=False)} == {run.id, new_run.id}
+
+    run.delete()
+    assert [e.id for e in index.entries(sync=False)] == [new_run.id]
+
+
+def test_save_many_keeps_index_updated(task):
+    run = make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+    index.entries()
+
+    run.tags = ["updated"]
+    new_runs = [make_run(task, input=f"Bulk input {i}", save=False) for i in range(3)]
+    assert TaskRun.save_many([run, *new_runs]) == [None] * 4
+
+    entries = {e.id: e for e in index.entries(sync=False)}
+    assert set(entries.keys()) == {run.id, *[r.id for r in new_runs]}
+    assert entries[run.id].tags == ["updated"]
+
+
+def test_save_does_not_create_index(task):
+    make_run(task)
+    assert not TaskRunIndex.for_task_path(task.path).index_path.exists()
+
+
+def test_sync_catches_out_of_band_changes(task):
+    run = make_run(task)
+    removed_run = make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+    index.entries()
+
+    # Edit a file directly on disk, changing size
+    assert run.path is not None
+    data = json.loads(run.path.read_text())
+    data["tags"] = ["edited_on_disk"]
+    run.path.write_text(json.dumps(data))
+
+    # Remove a run without going through the datamodel
+    assert removed_run.path is not None
+    removed_run.path.unlink()
+
+    entries = index.entries()
+    assert len(entries) == 1
+    assert entries[0].tags == ["edited_on_disk"]
+
+
+def test_sync_keeps_runs_saved_during_sync(task):
+    make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+    index.entries()
+    original_disk_state = index._disk_state
+    saver = None
+
+    def disk_state_then_save():
+        nonlocal saver
+        # The snapshot must be taken with the lock held, so the concurrent save below is indexed after sync finishes
+        assert index._lock.locked()
+        state = original_disk_state()
+        saver = threading.Thread(target=make_run, args=(task, "Saved during sync"))
+        saver.start()
+        return state
+
+    with patch.object(index, "_disk_state", side_effect=disk_state_then_save):
+        index.sync()
+    assert saver is not None
+    saver.join()
+
+    assert "Saved during sync" in [e.input_preview for e in index.entries(sync=False)]
+    assert len(index.entries()) == 2
+
+
+def test_sync_once(task):
+    run = make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+
+    with patch.object(index, "sync", wraps=index.sync) as mock_sync:
+        index.sync_once()
+        index.sync_once()
+        assert mock_sync.call_count == 1
+    assert [e.id for e in index.entries(sync=False)] == [run.id]
+
+    # Saves keep the index up to date without syncing
+    new_run = make_run(task)
+    with patch.object(index, "sync") as mock_sync:
+        index.sync_once()
+        mock_sync.assert_not_called()
+    assert {e.id for e in index.entries(sync=False)} == {run.id, new_run.id}
+
+    # Out-of-band changes are only picked up by an explicit sync
+    assert new_run.path is not None
+    new_run.path.unlink()
+    index.sync_once()
+    assert len(index.entries(sync=False)) == 2
+    index.sync()
+    assert [e.id for e in index.entries(sync=False)] == [run.id]
+
+    # A deleted index file is rebuilt on the next sync_once
+    index.index_path.unlink()
+    index.sync_once()
+    assert [e.id for e in index.entries(sync=False)] == [run.id]
+
+
+def test_sync_skips_invalid_files(task):
+    make_run(task)
+    invalid_dir = task.path.parent / "runs" / "invalid"
+    invalid_dir.mkdir()
+    (invalid_dir / "task_run.kiln").write_text("not json")
+
+    assert len(TaskRunIndex.for_task_path(task.path).entries()) == 1
+
+
+def test_outdated_schema_is_rebuilt(task):
+    make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+    index.entries()
+
+    with closing(sqlite3.connect(index.index_path)) as conn, conn:
+        conn.execute("UPDATE meta SET value = '0' WHERE key = 'schema_version'")
+        conn.execute("DELETE FROM runs")
+
+    fresh_index = TaskRunIndex(index.task_folder, index.index_path)
+    assert len(fresh_index.entries()) == 1
+
+
+def test_rebuild(task):
+    make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+    index.entries()
+    index.rebuild()
+    assert len(index.entries(sync=False)) == 1
+
+
+def test_empty_task(task):
+    assert TaskRunIndex.for_task_path(task.path).entries() == []
+
+
+def test_index_file_deleted(task):
+    make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+    index.entries()
+    index.index_path.unlink()
+    assert len(index.entries()) == 1
+
+
+def test_stats(task):
+    make_run(task, tags=["a", "b"], rating=TaskOutputRating(value=5))
+    make_run(task, tags=["a"], rating=TaskOutputRating(value=2))
+    thinking_run = make_run(task, save=False)
+    thinking_run.intermediate_outputs = {"reasoning": "Thinking..."}
+    thinking_run.save_to_file()
+
+    stats = TaskRunIndex.for_task_path(task.path).stats()
+    assert stats.total == 3
+    assert stats.tag_counts == {"a": 2, "b": 1}
+    assert stats.rating_counts == {"five_star:5": 1, "five_star:2": 1, "unrated": 1}
+    assert stats.input_source_counts == {"human": 3}
+    assert stats.repaired_count == 0
+    assert stats.thinking_count == 1
+
+
+def test_stats_updated_incrementally(task):
+    run = make_run(task, tags=["a"])
+    index = TaskRunIndex.for_task_path(task.path)
+    assert index.stats().tag_counts == {"a": 1}
+
+    # Saves, save_many and deletes update the stats, without a sync
+    run.tags = ["b"]
+    run.output.rating = TaskOutputRating(type="pass_fail", value=1.0)
+    run.save_to_file()
+    stats = index.stats(sync=False)
+    assert stats.total == 1
+    assert stats.tag_counts == {"b": 1}
+    assert stats.rating_counts == {"pass_fail:1": 1}
+
+    new_runs = [make_run(task, tags=["b"], save=False) for _ in range(3)]
+    assert TaskRun.save_many(new_runs) == [None] * 3
+    stats = index.stats(sync=False)
+    assert stats.total == 4
+    assert stats.tag_counts == {"b": 4}
+
+    run.delete()
+    new_runs[0].delete()
+    stats = index.stats(sync=False)
+    assert stats.total == 2
+    assert stats.rating_counts == {"unrated": 2}
+
+    # Matches a full rebuild
+    index.rebuild()
+    assert index.stats(sync=False) == stats
+
+
+def test_stats_sync_catches_out_of_band_changes(task):
+    run = make_run(task, tags=["a"])
+    removed_run = make_run(task, tags=["a"])
+    index = TaskRunIndex.for_task_path(task.path)
+    assert index.stats().tag_counts == {"a": 2}
+
+    assert run.path is not None
+    data = json.loads(run.path.read_text())
+    data["tags"] = ["edited_on_disk"]
+    run.path.write_text(json.dumps(data))
+    assert removed_run.path is not None
+    removed_run.path.unlink()
+
+    stats = index.stats()
+    assert stats.total == 1
+    assert stats.tag_counts == {"edited_on_disk": 1}
+
+
+def test_sync_loads_only_keys_of_intermediate_outputs(task):
+    run = make_run(task, save=False)
+    run.intermediate_outputs = {"reasoning": "Thinking..." * 1000}
+    run.save_to_file()
+    assert run.path is not None
+    # Edited out of band, so sync reloads it
+    data = json.loads(run.path.read_text())
+    data["intermediate_outputs"]["chain_of_thought"] = "More thinking"
+    run.path.write_text(json.dumps(data))
+
+    index = TaskRunIndex.for_task_path(task.path)
+    with patch.object(
+        TaskRun, "load_fields", wraps=TaskRun.load_fields
+    ) as mock_load_fields:
+        assert [entry.has_thinking for entry in index.entries()] == [True]
+    loaded_fields = [call.args[1] for call in mock_load_fields.call_args_list]
+    assert all("intermediate_outputs" not in fields for fields in loaded_fields)
+    assert TaskRun.load_fields(run.path, [], keys_only=["intermediate_outputs"]) == {
+        "intermediate_outputs": ["reasoning", "chain_of_thought"]
+    }
+
+
+def test_partial_run_field_keys(task):
+    run = make_run(task, save=False)
+    run.intermediate_outputs = {"chain_of_thought": "Thinking..."}
+    run.save_to_file()
+    plain_run = make_run(task)
+    assert run.path is not None and plain_run.path is not None
+
+    partial = TaskRun.load_partial(run.path, ["id"], keys_only=["intermediate_outputs"])
+    assert partial.field_keys("intermediate_outputs") == ["chain_of_thought"]
+    assert partial.has_thinking_training_data()
+    with pytest.raises(AttributeError):
+        partial.intermediate_outputs
+
+    plain_partial = TaskRun.load_partial(
+        plain_run.path, ["id"], keys_only=["intermediate_outputs"]
+    )
+    assert plain_partial.field_keys("intermediate_outputs") is None
+    assert not plain_partial.has_thinking_training_data()
+
+    # Full models read the keys from the field
+    assert run.field_keys("intermediate_outputs") == ["chain_of_thought"]
+    assert plain_run.field_keys("intermediate_outputs") is None
+
+
+def test_stats_empty_task(task):
+    stats = TaskRunIndex.for_task_path(task.path).stats()
+    assert stats.total == 0
+    assert stats.tag_counts == {}
+
+
+def test_run_ids_with_tag(task):
+    run_a = make_run(task, tags=["a", "b"])
+    run_b = make_run(task, tags=["b"])
+    index = TaskRunIndex.for_task_path(task.path)
+
+    assert index.run_ids_with_tag("a") == [run_a.id]
+    assert set(index.run_ids_with_tag("b")) == {run_a.id, run_b.id}
+    assert index.run_ids_with_tag("c") == []
+    assert index.tag_counts(sync=False) == {"a": 1, "b": 2}
+
+    run_b.tags = ["c"]
+    run_b.save_to_file()
+    assert index.run_ids_with_tag("b", sync=False) == [run_a.id]
+    assert index.run_ids_with_tag("c", sync=False) == [run_b.id]
+
+    run_a.delete()
+    assert index.run_ids_with_tag("a", sync=False) == []
+    assert index.tag_counts(sync=False) == {"c": 1}
+
+    index.rebuild()
+    assert index.run_ids_with_tag("c", sync=False) == [run_b.id]
+
+
+def test_query_filters(task):
+    five = make_run(task, tags=["a", "b"], rating=TaskOutputRating(value=5))
+    two = make_run(task, tags=["a"], rating=TaskOutputRating(value=2))
+    unrated = make_run(task, tags=["b"])
+    index = TaskRunIndex.for_task_path(task.path)
+
+    def ids(query):
+        return {entry.id for entry in index.query(query).entries}
+
+    assert ids(None) == {five.id, two.id, unrated.id}
+    assert ids(TaskRunIndexQuery(tags=["a"])) == {five.id, two.id}
+    assert ids(TaskRunIndexQuery(tags=["a", "b"])) == {five.id}
+    assert ids(TaskRunIndexQuery(min_rating=3)) == {five.id}
+    assert ids(TaskRunIndexQuery(max_rating=3)) == {two.id}
+    assert ids(TaskRunIndexQuery(high_quality=True)) == {five.id}
+    assert ids(TaskRunIndexQuery(input_source_type="human")) == {
+        five.id,
+        two.id,
+        unrated.id,
+    }
+    assert ids(TaskRunIndexQuery(input_source_type="synthetic")) == set()
+    assert ids(TaskRunIndexQuery(has_thinking=True)) == set()
+    assert index.query(TaskRunIndexQuery(tags=["b"])).total == 2
+
+
+def test_query_sort_and_paginate(task):
+    runs = [make_run(task, rating=TaskOutputRating(value=i % 5 + 1)) for i in range(7)]
+    index = TaskRunIndex.for_task_path(task.path)
+
+    for sort in ["created_at", "rating", "model"]:
+        for descending in [True, False]:
+            expected = [
+                e.id for e in index.query(sort=sort, descending=descending).entries
+            ]
+            paged = []
+            cursor = None
+            while True:
+                page = index.query(
+                    sort=sort, descending=descending, limit=3, cursor=cursor
+                )
+                assert page.total == 7
+                paged.extend(entry.id for entry in page.entries)
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+            assert paged == expected
+
+    newest_first = [e.id for e in index.query().entries]
+    assert newest_first == [run.id for run in reversed(runs)]
+    ratings = [e.rating.value for e in index.query(sort="rating").entries]
+    assert ratings == sorted(ratings, reverse=True)
+
+
+def test_query_cursor_stable_across_changes(task):
+    runs = [make_run(task) for _ in range(4)]
+    index = TaskRunIndex.for_task_path(task.path)
+    page = index.query(descending=False, limit=2)
+    assert [e.id for e in page.entries] == [runs[0].id, runs[1].id]
+
+    # Removing a run from the first page doesn't shift the second
+    runs[0].delete()
+    page = index.query(descending=False, limit=2, cursor=page.next_cursor)
+    assert [e.id for e in page.entries] == [runs[2].id, runs[3].id]
+    assert page.total == 3
+    assert page.next_cursor is None
+
+
+def test_query_invalid_arguments(task):
+    make_run(task)
+    make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+    cursor = index.query(limit=1).next_cursor
+    assert cursor is not None
+
+    with pytest.raises(ValueError, match="different sort order"):
+        index.query(sort="rating", cursor=cursor)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        index.query(cursor="not a cursor")
+    with pytest.raises(ValueError, match="Invalid sort key"):
+        index.query(sort="input")  # type: ignore
+    with pytest.raises(ValueError, match="Limit"):
+        index.query(limit=0)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        # sort values sqlite can't bind
+        ["created_at", True, {"a": 1}, "123"],
+        ["created_at", True, [1, 2], "123"],
+        # descending must be a bool
+        ["created_at", 1, "2024-01-01", "123"],
+        # dirname must be a string
+        ["created_at", True, "2024-01-01", 123],
+        # wrong shape
+        ["created_at", True, "2024-01-01"],
+        {"sort": "created_at"},
+    ],
+)
+def test_query_forged_cursor(task, data):
+    make_run(task)
+    index = TaskRunIndex.for_task_path(task.path)
+    cursor = base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        index.query(cursor=cursor)
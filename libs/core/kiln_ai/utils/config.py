@@ -1,11 +1,21 @@
 import getpass
 import os
+import tempfile
 import threading
+import time
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
 
+from kiln_ai.utils.file_lock import FileLock
+
+# How often (seconds) reads re-check the settings file for changes made outside this instance
+SETTINGS_CHECK_INTERVAL = 1.0
+
+# Guards writes to the settings file between threads. Writes from other processes are guarded by a file lock.
+_settings_write_lock = threading.RLock()
+
 
 class ConfigProperty:
     def __init__(
@@ -26,6 +36,12 @@ class ConfigProperty:
 
 
 class Config:
+    """
+    Kiln settings. Each property is read from the settings file, then its environment variable, then its default.
+
+    Resolved values are memoized, so hot paths (e.g. `created_by` on every model) don't re-run defaults or type conversions. The memo is dropped when settings are updated through this instance. Changes to the settings file on disk (other processes, edits by hand) are picked up on the next check, so may take up to SETTINGS_CHECK_INTERVAL seconds to apply. Memoized values are keyed on their environment variable's value, so environment changes apply on the next read.
+    """
+
     _shared_instance = None
 
     def __init__(self, properties: Dict[str, ConfigProperty] | None = None):
@@ -137,8 +153,51 @@ class Config:
                 default_lambda=lambda: [],
                 sensitive_keys=["api_key"],
             ),
+            "model_cache_max_entries": ConfigProperty(
+                int,
+                env_var="KILN_MODEL_CACHE_MAX_ENTRIES",
+            ),
+            "model_cache_max_bytes": ConfigProperty(
+                int,
+                env_var="KILN_MODEL_CACHE_MAX_BYTES",
+            ),
+            "model_cache_max_entries_per_type": ConfigProperty(
+                dict,
+                default_lambda=lambda: {},
+            ),
+            "model_cache_watcher": ConfigProperty(
+                str,
+                env_var="KILN_MODEL_CACHE_WATCHER",
+                default="off",
+            ),
+            "model_cache_snapshot": ConfigProperty(
+                bool,
+                env_var="KILN_MODEL_CACHE_SNAPSHOT",
+                default=False,
+            ),
+            "parallel_load_threshold": ConfigProperty(
+                int,
+                env_var="KILN_PARALLEL_LOAD_THRESHOLD",
+            ),
+            "parallel_load_process_threshold": ConfigProperty(
+                int,
+                env_var="KILN_PARALLEL_LOAD_PROCESS_THRESHOLD",
+            ),
+            "parallel_load_workers": ConfigProperty(
+                int,
+                env_var="KILN_PARALLEL_LOAD_WORKERS",
+            ),
+            "json_codec": ConfigProperty(
+                str,
+                env_var="KILN_JSON_CODEC",
+                default="stdlib",
+            ),
         }
+        # Resolved values: name -> (environment variable value, resolved value). Replaced, not cleared, on invalidation so in-flight reads can't repopulate it with stale values.
+        self._values: Dict[str, Tuple[str | None, Any]] = {}
+        self._settings_stamp = self._settings_file_stamp()
         self._settings = self.load_settings()
+        self._next_settings_check = time.monotonic() + SETTINGS_CHECK_INTERVAL
 
     @classmethod
     def shared(cls):
@@ -159,17 +218,35 @@ class Config:
         if name not in self._properties:
             return super().__getattribute__(name)
 
+        self._reload_settings_if_changed()
+        values = self._values
         property_config = self._properties[name]
+        env_value = (
+            os.environ.get(property_config.env_var) if property_config.env_var else None
+        )
+        cached = values.get(name)
+        if cached is not None and cached[0] == env_value:
+            value = cached[1]
+        else:
+            value = self._resolve_value(name, property_config, env_value)
+            values[name] = (env_value, value)
+
+        # Copy mutable values, so callers editing them can't change the memoized value
+        if isinstance(value, (list, dict)):
+            return type(value)(value)
+        return value
 
+    def _resolve_value(
+        self, name: str, property_config: ConfigProperty, env_value: str | None
+    ) -> Any:
         # Check if the value is in settings
         if name in self._settings:
             value = self._settings[name]
             return value if value is None else property_config.type(value)
 
         # Check environment variable
-        if property_config.env_var and property_config.env_var in os.environ:
-            value = os.environ[property_config.env_var]
-            return property_config.type(value)
+        if env_value is not None:
+            return property_config.type(env_value)
 
         # Use default value or default_lambda
         if property_config.default_lambda:
@@ -180,13 +257,39 @@ class Config:
         return None if value is None else property_config.type(value)
 
     def __setattr__(self, name, value):
-        if name in ("_properties", "_settings"):
+        if name in (
+            "_properties",
+            "_settings",
+            "_values",
+            "_settings_stamp",
+            "_next_settings_check",
+        ):
             super().__setattr__(name, value)
         elif name in self._properties:
             self.update_settings({name: value})
         else:
             raise AttributeError(f"Config has no attribute '{name}'")
 
+    def _settings_file_stamp(self) -> Tuple[str, int, int]:
+        path = self.settings_path(create=False)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return (path, 0, -1)
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    def _reload_settings_if_changed(self) -> None:
+        now = time.monotonic()
+        if now < self._next_settings_check:
+            return
+        self._next_settings_check = now + SETTINGS_CHECK_INTERVAL
+        # Stamp before loading, so a write landing mid-load is caught by the next check
+        stamp = self._settings_file_stamp()
+        if stamp != self._settings_stamp:
+            self._settings = self.load_settings()
+            self._settings_stamp = stamp
+            self._values = {}
+
     @classmethod
     def settings_dir(cls, create=True):
         settings_dir = os.path.join(Path.home(), ".kiln_ai")
@@ -208,6 +311,7 @@ class Config:
         return settings
 
     def settings(self, hide_sensitive=False) -> Dict[str, Any]:
+        self._reload_settings_if_changed()
         if not hide_sensitive:
             return self._settings
 
@@ -233,8 +337,12 @@ class Config:
         self.update_settings({name: value})
 
     def update_settings(self, new_settings: Dict[str, Any]):
-        # Lock to prevent race conditions in multi-threaded scenarios
-        with threading.Lock():
+        settings_path = self.settings_path()
+        # Lock against other threads, then other processes, so concurrent updates don't clobber each other
+        with (
+            _settings_write_lock,
+            FileLock(Path(settings_path + ".lock")),
+        ):
             # Fresh load to avoid clobbering changes from other instances
             current_settings = self.load_settings()
             current_settings.update(new_settings)
@@ -242,9 +350,20 @@ class Config:
             current_settings = {
                 k: v for k, v in current_settings.items() if v is not None
             }
-            with open(self.settings_path(), "w") as f:
-                yaml.dump(current_settings, f)
+            # Write to a temp file and swap it in, so readers never see a partial file
+            fd, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(settings_path), prefix=".settings.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    yaml.dump(current_settings, f)
+                os.replace(temp_path, settings_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
             self._settings = current_settings
+            self._settings_stamp = self._settings_file_stamp()
+            self._values = {}
 
 
 def _get_user_id():
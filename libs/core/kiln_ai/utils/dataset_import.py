@@ -198,8 +198,10 @@ def import_csv(task: Task, dataset_path: str, dataset_name: str) -> int:
             rows.append(run)
 
     # now that we know all rows are valid, we can save them
-    for run in rows:
-        run.save_to_file()
+    errors = TaskRun.save_many(rows)
+    for error in errors:
+        if error is not None:
+            raise error
 
     return len(rows)
 
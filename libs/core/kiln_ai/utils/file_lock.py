@@ -0,0 +1,122 @@
+"""
+Advisory file locks, for serializing work across processes on the same machine (e.g. several servers sharing a project).
+
+Locks are held on a lock file with `fcntl.flock` (or `msvcrt.locking` on Windows). The OS releases them if the process dies, so a crash never leaves a stale lock. Lock files are left in place after release: deleting them would race with other processes opening the same file.
+"""
+
+import hashlib
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import IO
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# How often a blocked acquire retries
+POLL_INTERVAL = 0.01
+
+# Keys are spread over this many lock files, see lock_path_for_key
+LOCK_STRIPES = 256
+
+
+class FileLockTimeout(TimeoutError):
+    pass
+
+
+def lock_path_for_key(key: str) -> Path:
+    """
+    A lock file in the Kiln settings cache dir for an arbitrary key (e.g. the path of the file being protected). Keeps lock files out of project folders.
+
+    Keys are striped over a fixed set of LOCK_STRIPES lock files by hash, so the number of lock files stays bounded however many keys are used (lock files are never deleted, see above). Keys sharing a stripe serialize with each other across processes, which is safe, just occasionally slower.
+    """
+    # Imported here, as Config locks its settings file with FileLock
+    from kiln_ai.utils.config import Config
+
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    stripe = int.from_bytes(digest[:8], "big") % LOCK_STRIPES
+    return Path(Config.settings_path()).parent / "cache" / "locks" / f"{stripe}.lock"
+
+
+class FileLock:
+    """
+    An exclusive, cross-process lock on a lock file.
+
+    Not reentrant. Threads in one process should serialize on their own lock first: on some platforms flock is per process, not per thread.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: IO[bytes] | None = None
+        self._lock = threading.Lock()
+
+    def _try_lock(self, file: IO[bytes]) -> bool:
+        try:
+            if sys.platform == "win32":
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self, blocking: bool = True, timeout: float | None = None) -> bool:
+        """
+        Acquire the lock.
+
+        Args:
+            blocking: Wait for the lock if another process holds it. If False, returns False immediately instead.
+            timeout: Max seconds to wait, None to wait forever.
+
+        Returns:
+            True if acquired, False if not blocking and the lock is held elsewhere.
+
+        Raises:
+            FileLockTimeout: If the timeout passed before the lock was acquired.
+        """
+        with self._lock:
+            if self._file is not None:
+                raise RuntimeError(f"File lock already held: {self.path}")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            file = open(self.path, "a+b")
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._try_lock(file):
+                if not blocking:
+                    file.close()
+                    return False
+                if deadline is not None and time.monotonic() >= deadline:
+                    file.close()
+                    raise FileLockTimeout(f"Timed out waiting for lock: {self.path}")
+                time.sleep(POLL_INTERVAL)
+            self._file = file
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            file = self._file
+            if file is None:
+                return
+            self._file = None
+            try:
+                if sys.platform == "win32":
+                    file.seek(0)
+                    msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            finally:
+                file.close()
+
+    def is_held(self) -> bool:
+        """Whether this instance holds the lock."""
+        return self._file is not None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
@@ -0,0 +1,84 @@
+"""
+Measure import times with `python -X importtime`, for tracking startup time of kiln_ai and the servers.
+
+Imports are measured in a fresh interpreter, so modules already imported by the caller don't hide their cost.
+"""
+
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+IMPORT_TIME_PREFIX = "import time:"
+
+
+@dataclass
+class ImportTimeReport:
+    """
+    Parsed `-X importtime` output. Times are in microseconds.
+    """
+
+    # Sum of the cumulative times of the top level imports (including interpreter startup imports like site)
+    total_us: int = 0
+    # Cumulative time per module, including its own imports
+    cumulative_us: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_seconds(self) -> float:
+        return self.total_us / 1_000_000
+
+    @property
+    def modules(self) -> Set[str]:
+        return set(self.cumulative_us)
+
+    def slowest(self, count: int = 10) -> List[Tuple[str, int]]:
+        """The modules with the highest cumulative time, slowest first."""
+        return sorted(self.cumulative_us.items(), key=lambda item: -item[1])[:count]
+
+    def summary(self, count: int = 10) -> str:
+        lines = [f"Total import time: {self.total_seconds:.3f}s"]
+        for module, us in self.slowest(count):
+            lines.append(f"  {us / 1_000_000:.3f}s  {module}")
+        return "\n".join(lines)
+
+
+def parse_import_time(output: str) -> ImportTimeReport:
+    """
+    Parse the stderr of `python -X importtime`. Lines which aren't import times (e.g. warnings) are ignored.
+    """
+    report = ImportTimeReport()
+    for line in output.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        parts = line[len(IMPORT_TIME_PREFIX) :].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        if not cumulative_us.strip().isdigit():
+            # Header line
+            continue
+        module = name.strip()
+        cumulative = int(cumulative_us)
+        report.cumulative_us[module] = cumulative
+        # Nested imports are indented two spaces per level, after the separator's space
+        if name[1:2] != " ":
+            report.total_us += cumulative
+    return report
+
+
+def measure_import_time(code: str, cwd: Path | None = None) -> ImportTimeReport:
+    """
+    Run code in a new interpreter with `-X importtime`, and parse the import times.
+
+    Raises:
+        subprocess.CalledProcessError: If the code fails.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        check=True,
+    )
+    return parse_import_time(result.stderr)
@@ -0,0 +1,95 @@
+"""
+Read a few top-level keys from a JSON object, without decoding the rest.
+
+Used to load parts of large model files (e.g. the rating and tags of a task run with megabytes of reasoning in intermediate_outputs). Values are scanned in order with the stdlib C decoder, and unwanted ones dropped immediately: they are never validated or turned into models. Stops as soon as all wanted keys are found.
+"""
+
+import json
+import re
+from json.decoder import scanstring  # type: ignore[attr-defined]
+from typing import Any, Collection, Dict, List, Tuple
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    match = _WHITESPACE.match(text, pos)
+    return match.end() if match else pos
+
+
+def _object_keys(text: str, pos: int) -> Tuple[List[str] | None, int]:
+    # The keys of the JSON value at pos if it's an object (None otherwise), and the position after the value. Nested values are scanned, but never kept.
+    if text[pos : pos + 1] != "{":
+        _, pos = _decoder.raw_decode(text, pos)
+        return None, pos
+    object_keys: List[str] = []
+    pos = _skip_whitespace(text, pos + 1)
+    if text[pos : pos + 1] == "}":
+        return object_keys, pos + 1
+    while True:
+        if text[pos : pos + 1] != '"':
+            raise ValueError(f"Expected a key at position {pos}")
+        key, pos = scanstring(text, pos + 1)
+        object_keys.append(key)
+        pos = _skip_whitespace(text, pos)
+        if text[pos : pos + 1] != ":":
+            raise ValueError(f"Expected ':' at position {pos}")
+        _, pos = _decoder.raw_decode(text, _skip_whitespace(text, pos + 1))
+        pos = _skip_whitespace(text, pos)
+        char = text[pos : pos + 1]
+        if char == "}":
+            return object_keys, pos + 1
+        if char != ",":
+            raise ValueError(f"Expected ',' or '}}' at position {pos}")
+        pos = _skip_whitespace(text, pos + 1)
+
+
+def load_top_level_keys(
+    text: str, keys: Collection[str], keys_only: Collection[str] = ()
+) -> Dict[str, Any]:
+    """
+    Decode only the given top-level keys of a JSON object. Keys not present in the object are omitted from the result.
+
+    Keys in keys_only are loaded as the list of keys of their value (None if it's not an object), for checking what's in a large object without building it.
+
+    Raises:
+        ValueError: If the text is not a JSON object (json.JSONDecodeError is a ValueError).
+    """
+    wanted = set(keys) | set(keys_only)
+    keys_only = set(keys_only)
+    result: Dict[str, Any] = {}
+    pos = _skip_whitespace(text, 0)
+    if text[pos : pos + 1] != "{":
+        raise ValueError("Expected a JSON object")
+    pos = _skip_whitespace(text, pos + 1)
+    if text[pos : pos + 1] == "}":
+        return result
+
+    while True:
+        if text[pos : pos + 1] != '"':
+            raise ValueError(f"Expected a key at position {pos}")
+        key, pos = scanstring(text, pos + 1)
+        pos = _skip_whitespace(text, pos)
+        if text[pos : pos + 1] != ":":
+            raise ValueError(f"Expected ':' at position {pos}")
+        pos = _skip_whitespace(text, pos + 1)
+
+        if key in keys_only:
+            value, pos = _object_keys(text, pos)
+        else:
+            # Unwanted values are still scanned by the C decoder: it's faster than any pure python skipping (even a regex), and we need to find where they end.
+            value, pos = _decoder.raw_decode(text, pos)
+        if key in wanted:
+            result[key] = value
+            if len(result) == len(wanted):
+                # Found everything, don't scan the rest of the file
+                return result
+
+        pos = _skip_whitespace(text, pos)
+        char = text[pos : pos + 1]
+        if char == "}":
+            return result
+        if char != ",":
+            raise ValueError(f"Expected ',' or '}}' at position {pos}")
+        pos = _skip_whitespace(text, pos + 1)
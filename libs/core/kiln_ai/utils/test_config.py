@@ -1,5 +1,7 @@
 import getpass
+import multiprocessing
 import os
+import threading
 from unittest.mock import patch
 
 import pytest
@@ -299,3 +301,101 @@ def test_yaml_persistence_structured_data(config_with_yaml, mock_yaml_file):
     with open(mock_yaml_file, "r") as f:
         saved_settings = yaml.safe_load(f)
     assert saved_settings["list_of_objects"] == new_settings
+
+
+def test_values_are_memoized(config_with_yaml):
+    calls = 0
+
+    def default_lambda():
+        nonlocal calls
+        calls += 1
+        return "lambda_value"
+
+    config_with_yaml._properties["lambda_property"] = ConfigProperty(
+        str, default_lambda=default_lambda
+    )
+
+    assert config_with_yaml.lambda_property == "lambda_value"
+    assert config_with_yaml.lambda_property == "lambda_value"
+    assert calls == 1
+
+    # Updates invalidate the memo
+    config_with_yaml.update_settings({"int_property": 1})
+    assert config_with_yaml.lambda_property == "lambda_value"
+    assert calls == 2
+
+
+def test_memoized_lists_are_copied(config_with_yaml):
+    config_with_yaml.list_of_objects = [{"name": "a"}]
+    value = config_with_yaml.list_of_objects
+    value.append({"name": "b"})
+    assert config_with_yaml.list_of_objects == [{"name": "a"}]
+
+
+def test_external_settings_changes_picked_up(config_with_yaml, mock_yaml_file):
+    assert config_with_yaml.example_property == "default_value"
+    config_with_yaml._next_settings_check = float("inf")
+
+    # Another process writes the file
+    with open(mock_yaml_file, "w") as f:
+        yaml.dump({"example_property": "external_value"}, f)
+
+    # Not re-checked until the interval passes
+    assert config_with_yaml.example_property == "default_value"
+
+    config_with_yaml._next_settings_check = 0
+    assert config_with_yaml.example_property == "external_value"
+    assert config_with_yaml.settings() == {"example_property": "external_value"}
+
+
+def test_env_changes_picked_up(config_with_yaml):
+    assert config_with_yaml.example_property == "default_value"
+    # Applied on the next read, without waiting for the settings check interval
+    config_with_yaml._next_settings_check = float("inf")
+    with patch.dict(os.environ, {"EXAMPLE_PROPERTY": "env_value"}):
+        assert config_with_yaml.example_property == "env_value"
+        os.environ["EXAMPLE_PROPERTY"] = "new_env_value"
+        assert config_with_yaml.example_property == "new_env_value"
+    assert config_with_yaml.example_property == "default_value"
+
+
+def test_concurrent_updates_from_threads(config_with_yaml, mock_yaml_file):
+    configs = [Config(properties=config_with_yaml._properties.copy()) for _ in range(8)]
+
+    def update(i: int):
+        for j in range(5):
+            configs[i].update_settings({f"key_{i}_{j}": j})
+
+    threads = [threading.Thread(target=update, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(mock_yaml_file, "r") as f:
+        saved_settings = yaml.safe_load(f)
+    assert len(saved_settings) == 40
+
+
+def _update_settings_in_process(settings_path: str, i: int):
+    with patch.object(Config, "settings_path", return_value=settings_path):
+        config = Config(properties={})
+        for j in range(5):
+            config.update_settings({f"key_{i}_{j}": j})
+
+
+def test_concurrent_updates_from_processes(mock_yaml_file):
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_update_settings_in_process, args=(mock_yaml_file, i))
+        for i in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    with open(mock_yaml_file, "r") as f:
+        saved_settings = yaml.safe_load(f)
+    assert len(saved_settings) == 20
@@ -0,0 +1,100 @@
+import multiprocessing
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from kiln_ai.utils.config import Config
+from kiln_ai.utils.file_lock import (
+    LOCK_STRIPES,
+    FileLock,
+    FileLockTimeout,
+    lock_path_for_key,
+)
+
+
+def hold_lock(path: Path, locked, release) -> None:
+    # Runs in a child process
+    with FileLock(path):
+        locked.set()
+        release.wait(10)
+
+
+def test_acquire_and_release(tmp_path):
+    lock = FileLock(tmp_path / "locks" / "a.lock")
+    assert lock.acquire()
+    assert lock.is_held()
+    assert lock.path.exists()
+    lock.release()
+    assert not lock.is_held()
+    # Release is idempotent
+    lock.release()
+
+    with lock:
+        assert lock.is_held()
+    assert not lock.is_held()
+
+
+def test_exclusive(tmp_path):
+    path = tmp_path / "a.lock"
+    first = FileLock(path)
+    second = FileLock(path)
+    with first:
+        assert second.acquire(blocking=False) is False
+        with pytest.raises(FileLockTimeout):
+            second.acquire(timeout=0.05)
+    assert second.acquire(blocking=False) is True
+    second.release()
+
+    # Other paths are independent
+    with first, FileLock(tmp_path / "b.lock") as other:
+        assert other.is_held()
+
+
+def test_not_reentrant(tmp_path):
+    lock = FileLock(tmp_path / "a.lock")
+    with lock:
+        with pytest.raises(RuntimeError, match="already held"):
+            lock.acquire()
+
+
+def test_blocking_acquire_waits_for_release(tmp_path):
+    path = tmp_path / "a.lock"
+    holder = FileLock(path)
+    holder.acquire()
+    threading.Timer(0.1, holder.release).start()
+    start = time.monotonic()
+    with FileLock(path):
+        assert time.monotonic() - start >= 0.05
+
+
+def test_exclusive_across_processes(tmp_path):
+    path = tmp_path / "a.lock"
+    context = multiprocessing.get_context("spawn")
+    locked = context.Event()
+    release = context.Event()
+    process = context.Process(target=hold_lock, args=(path, locked, release))
+    process.start()
+    try:
+        assert locked.wait(30)
+        assert FileLock(path).acquire(blocking=False) is False
+    finally:
+        release.set()
+        process.join(30)
+    with FileLock(path) as lock:
+        assert lock.is_held()
+
+
+def test_lock_path_for_key():
+    path = lock_path_for_key("/some/run/task_run.kiln")
+    assert path == lock_path_for_key("/some/run/task_run.kiln")
+    assert path != lock_path_for_key("/other/run/task_run.kiln")
+    assert path.parent == Path(Config.settings_path()).parent / "cache" / "locks"
+    assert path.suffix == ".lock"
+
+
+def test_lock_path_for_key_bounded():
+    # However many keys, a fixed set of lock files
+    paths = {lock_path_for_key(f"/runs/{i}/task_run.kiln") for i in range(5000)}
+    assert len(paths) == LOCK_STRIPES
@@ -0,0 +1,69 @@
+import pytest
+
+from kiln_ai.utils.import_time import measure_import_time, parse_import_time
+
+# Startup budgets, in seconds of total import time. Generous, so slow CI machines pass, but well below the cost of the heavy dependencies (litellm alone is several seconds).
+DATAMODEL_IMPORT_BUDGET = 1.5
+ADAPTERS_IMPORT_BUDGET = 2.5
+
+# Heavy dependencies which must only be imported on first use
+LAZY_MODULES = ["litellm", "openai", "together", "scipy", "httpx", "requests"]
+
+
+def test_parse_import_time():
+    output = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 | site
+import time:        50 |         50 |     json.decoder
+import time:        20 |         70 |   json
+some warning printed to stderr
+import time:        30 |        400 | kiln_ai
+"""
+    report = parse_import_time(output)
+    assert report.total_us == 500
+    assert report.total_seconds == 0.0005
+    assert report.cumulative_us == {
+        "site": 100,
+        "json.decoder": 50,
+        "json": 70,
+        "kiln_ai": 400,
+    }
+    assert report.modules == {"site", "json.decoder", "json", "kiln_ai"}
+    assert report.slowest(2) == [("kiln_ai", 400), ("site", 100)]
+    assert "kiln_ai" in report.summary()
+
+
+def test_parse_import_time_empty():
+    report = parse_import_time("")
+    assert report.total_us == 0
+    assert report.slowest() == []
+
+
+def test_measure_import_time():
+    report = measure_import_time("import json")
+    assert "json" in report.modules
+    assert report.total_us > 0
+
+
+def test_measure_import_time_error():
+    with pytest.raises(Exception):
+        measure_import_time("import not_a_real_module_name")
+
+
+@pytest.mark.parametrize(
+    "module, budget",
+    [
+        ("kiln_ai.datamodel", DATAMODEL_IMPORT_BUDGET),
+        ("kiln_ai.adapters", ADAPTERS_IMPORT_BUDGET),
+    ],
+)
+def test_import_time_budget(module, budget):
+    report = measure_import_time(f"import {module}")
+    print(f"\nimport {module}\n{report.summary()}")
+
+    lazy_imported = [m for m in LAZY_MODULES if m in report.modules]
+    assert lazy_imported == [], (
+        f"import {module} should not import {lazy_imported}. Import them on first use instead."
+    )
+    assert report.total_seconds < budget, (
+        f"import {module} over budget ({budget}s)\n{report.summary()}"
+    )
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from kiln_ai.utils.json_projection import load_top_level_keys
+
+DOCUMENT = {
+    "v": 1,
+    "id": "123",
+    "input": 'Quotes " and escapes \\ and unicode é \n',
+    "nested": {"a": [1, 2, {"b": "}]{["}], "c": None},
+    "empty_list": [],
+    "empty_object": {},
+    "number": -1.5e3,
+    "flag": True,
+    "nothing": None,
+    "tags": ["a", "b"],
+}
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize(
+    "keys",
+    [
+        ["v"],
+        ["tags"],
+        ["input", "tags"],
+        ["nested", "number", "flag", "nothing"],
+        ["empty_list", "empty_object"],
+        list(DOCUMENT.keys()),
+    ],
+)
+def test_load_top_level_keys_matches_json_loads(keys, indent):
+    text = json.dumps(DOCUMENT, indent=indent)
+    assert load_top_level_keys(text, keys) == {key: DOCUMENT[key] for key in keys}
+
+
+def test_load_top_level_keys_missing_keys():
+    text = json.dumps(DOCUMENT)
+    assert load_top_level_keys(text, ["tags", "missing"]) == {"tags": ["a", "b"]}
+    assert load_top_level_keys(text, []) == {}
+    assert load_top_level_keys("{}", ["tags"]) == {}
+    assert load_top_level_keys(" { } ", ["tags"]) == {}
+
+
+def test_load_top_level_keys_stops_early():
+    # Invalid after the wanted key: never read
+    text = '{"v": 1, "tags": ["a"], "rest": not valid json'
+    assert load_top_level_keys(text, ["tags"]) == {"tags": ["a"]}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "[1, 2]",
+        '"string"',
+        '{"a": 1',
+        '{"a" 1}',
+        '{"a": 1 "b": 2}',
+        "{a: 1}",
+        '{"a": tru}',
+    ],
+)
+def test_load_top_level_keys_invalid(text):
+    with pytest.raises(ValueError):
+        load_top_level_keys(text, ["b"])
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_load_top_level_keys_keys_only(indent):
+    text = json.dumps(DOCUMENT, indent=indent)
+    assert load_top_level_keys(text, ["v"], keys_only=["nested", "empty_object"]) == {
+        "v": 1,
+        "nested": ["a", "c"],
+        "empty_object": [],
+    }
+    # Not an object
+    assert load_top_level_keys(text, [], keys_only=["tags", "nothing"]) == {
+        "tags": None,
+        "nothing": None,
+    }
+    # Keeps scanning after the object
+    assert load_top_level_keys(text, ["flag"], keys_only=["nested"]) == {
+        "nested": ["a", "c"],
+        "flag": True,
+    }
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"a": {"b" 1}}',
+        '{"a": {"b": 1 "c": 2}}',
+        '{"a": {b: 1}}',
+        '{"a": {"b": tru}}',
+    ],
+)
+def test_load_top_level_keys_keys_only_invalid(text):
+    with pytest.raises(ValueError):
+        load_top_level_keys(text, [], keys_only=["a"])
@@ -0,0 +1,13 @@
+from fastapi import FastAPI
+from kiln_ai.datamodel.model_cache import ModelCache, ModelCacheStats
+
+
+def connect_cache_api(app: FastAPI):
+    @app.get("/api/cache/stats")
+    async def get_cache_stats() -> ModelCacheStats:
+        return ModelCache.shared().stats()
+
+    @app.post("/api/cache/reset_stats")
+    async def reset_cache_stats() -> ModelCacheStats:
+        ModelCache.shared().reset_stats()
+        return ModelCache.shared().stats()
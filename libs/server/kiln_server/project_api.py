@@ -4,6 +4,7 @@ from typing import Any, Dict
 
 from fastapi import FastAPI, HTTPException
 from kiln_ai.datamodel import Project
+from kiln_ai.datamodel.blocking_io import blocking_handler
 from kiln_ai.datamodel.registry import project_from_id as project_from_id_core
 from kiln_ai.utils.config import Config
 
@@ -33,7 +34,8 @@ def add_project_to_config(project_path: str):
 
 def connect_project_api(app: FastAPI):
     @app.post("/api/project")
-    async def create_project(project: Project) -> Project:
+    @blocking_handler
+    def create_project(project: Project) -> Project:
         project_path = os.path.join(default_project_path(), project.name)
         if os.path.exists(project_path):
             raise HTTPException(
@@ -53,9 +55,8 @@ def connect_project_api(app: FastAPI):
         return project
 
     @app.patch("/api/project/{project_id}")
-    async def update_project(
-        project_id: str, project_updates: Dict[str, Any]
-    ) -> Project:
+    @blocking_handler
+    def update_project(project_id: str, project_updates: Dict[str, Any]) -> Project:
         original_project = project_from_id(project_id)
         updated_project = original_project.model_copy(update=project_updates)
         # Force validation using model_validate()
@@ -64,7 +65,8 @@ def connect_project_api(app: FastAPI):
         return updated_project
 
     @app.get("/api/projects")
-    async def get_projects() -> list[Project]:
+    @blocking_handler
+    def get_projects() -> list[Project]:
         project_paths = Config.shared().projects
         projects = []
         for project_path in project_paths if project_paths is not None else []:
@@ -80,12 +82,14 @@ def connect_project_api(app: FastAPI):
         return projects
 
     @app.get("/api/projects/{project_id}")
-    async def get_project(project_id: str) -> Project:
+    @blocking_handler
+    def get_project(project_id: str) -> Project:
         return project_from_id(project_id)
 
     # Removes the project, but does not delete the files from disk
     @app.delete("/api/projects/{project_id}")
-    async def delete_project(project_id: str) -> dict:
+    @blocking_handler
+    def delete_project(project_id: str) -> dict:
         project = project_from_id(project_id)
 
         # Remove from config
@@ -96,7 +100,8 @@ def connect_project_api(app: FastAPI):
         return {"message": f"Project removed. ID: {project_id}"}
 
     @app.post("/api/import_project")
-    async def import_project(project_path: str) -> Project:
+    @blocking_handler
+    def import_project(project_path: str) -> Project:
         if project_path is None or not os.path.exists(project_path):
             raise HTTPException(
                 status_code=400,
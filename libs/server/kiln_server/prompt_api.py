@@ -2,6 +2,7 @@ from datetime import datetime
 
 from fastapi import FastAPI, HTTPException
 from kiln_ai.datamodel import BasePrompt, Prompt, PromptId
+from kiln_ai.datamodel.blocking_io import blocking_handler
 from pydantic import BaseModel
 
 from kiln_server.task_api import task_from_id
@@ -58,7 +59,8 @@ class PromptUpdateRequest(BaseModel):
 
 def connect_prompt_api(app: FastAPI):
     @app.post("/api/projects/{project_id}/task/{task_id}/prompt")
-    async def create_prompt(
+    @blocking_handler
+    def create_prompt(
         project_id: str, task_id: str, prompt_data: PromptCreateRequest
     ) -> Prompt:
         parent_task = task_from_id(project_id, task_id)
@@ -73,7 +75,8 @@ def connect_prompt_api(app: FastAPI):
         return prompt
 
     @app.get("/api/projects/{project_id}/task/{task_id}/prompts")
-    async def get_prompts(project_id: str, task_id: str) -> PromptResponse:
+    @blocking_handler
+    def get_prompts(project_id: str, task_id: str) -> PromptResponse:
         parent_task = task_from_id(project_id, task_id)
 
         prompts: list[ApiPrompt] = []
@@ -99,7 +102,8 @@ def connect_prompt_api(app: FastAPI):
         )
 
     @app.patch("/api/projects/{project_id}/tasks/{task_id}/prompts/{prompt_id}")
-    async def update_prompt(
+    @blocking_handler
+    def update_prompt(
         project_id: str, task_id: str, prompt_id: str, prompt_data: PromptUpdateRequest
     ) -> Prompt:
         prompt = editable_prompt_from_id(project_id, task_id, prompt_id)
@@ -109,7 +113,8 @@ def connect_prompt_api(app: FastAPI):
         return prompt
 
     @app.delete("/api/projects/{project_id}/tasks/{task_id}/prompts/{prompt_id}")
-    async def delete_prompt(project_id: str, task_id: str, prompt_id: str) -> None:
+    @blocking_handler
+    def delete_prompt(project_id: str, task_id: str, prompt_id: str) -> None:
         prompt = editable_prompt_from_id(project_id, task_id, prompt_id)
         prompt.delete()
 
@@ -1,11 +1,13 @@
+import json
 import logging
 import os
 import tempfile
-from asyncio import Lock
 from datetime import datetime
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Literal
 
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from kiln_ai.adapters.adapter_registry import adapter_for_task
 from kiln_ai.adapters.ml_model_list import ModelProviderName
 from kiln_ai.adapters.model_adapters.base_adapter import AdapterConfig
@@ -16,21 +18,34 @@ from kiln_ai.datamodel import (
     TaskOutputRatingType,
     TaskRun,
 )
-from kiln_ai.datamodel.basemodel import ID_TYPE
+from kiln_ai.datamodel.basemodel import ID_TYPE, KilnBaseModel
+from kiln_ai.datamodel.blocking_io import blocking_handler, run_blocking
+from kiln_ai.datamodel.dataset_filters import add_dataset_filter_to_query
+from kiln_ai.datamodel.parallel_load import load_models
+from kiln_ai.datamodel.task_run_index import (
+    RunSortKey,
+    TaskRunIndex,
+    TaskRunIndexEntry,
+    TaskRunIndexPage,
+    TaskRunIndexQuery,
+    TaskRunStats,
+)
 from kiln_ai.utils.dataset_import import (
     DatasetFileImporter,
     DatasetImportFormat,
     ImportConfig,
     KilnInvalidImportFormat,
 )
+from kiln_ai.utils.file_lock import FileLockTimeout
 from pydantic import BaseModel, ConfigDict
 
+from kiln_server.run_lock import run_lock_key, run_locks
 from kiln_server.task_api import task_from_id
 
 logger = logging.getLogger(__name__)
 
-# Lock to prevent overwriting via concurrent updates. We use a load/update/write pattern that is not atomic.
-update_run_lock = Lock()
+# Batch operations process the selected runs in chunks of this size, reporting progress after each
+BATCH_CHUNK_SIZE = 500
 
 
 def deep_update(
@@ -85,24 +100,29 @@ class RunSummary(BaseModel):
     def repair_status_display_name(cls, run: TaskRun) -> str:
         if run.repair_instructions:
             return "Repaired"
-        elif run.output and not run.output.rating:
+        elif not run.output:
+            return "No output"
+        return RunSummary.repair_status_from_parts(
+            repaired=False,
+            rating=run.output.rating,
+            has_output=bool(run.output.output),
+        )
+
+    @classmethod
+    def repair_status_from_parts(
+        cls, repaired: bool, rating: TaskOutputRating | None, has_output: bool
+    ) -> str:
+        if repaired:
+            return "Repaired"
+        elif not rating:
             return "Rating needed"
-        elif not run.output or not run.output.output:
+        elif not has_output:
             return "No output"
-        elif (
-            run.output.rating
-            and run.output.rating.value == 5.0
-            and run.output.rating.type == TaskOutputRatingType.five_star
-        ):
+        elif rating.value == 5.0 and rating.type == TaskOutputRatingType.five_star:
             return "No repair needed"
-        elif (
-            run.output.rating
-            and run.output.rating.type != TaskOutputRatingType.five_star
-        ):
+        elif rating.type != TaskOutputRatingType.five_star:
             return "Unknown"
-        elif run.output.output:
-            return "Repair needed"
-        return "Unknown"
+        return "Repair needed"
 
     @classmethod
     def from_run(cls, run: TaskRun) -> "RunSummary":
@@ -127,6 +147,61 @@ class RunSummary(BaseModel):
             input_source=run.input_source.type if run.input_source else None,
         )
 
+    @classmethod
+    def from_index_entry(cls, entry: TaskRunIndexEntry) -> "RunSummary":
+        return RunSummary(
+            id=entry.id,
+            rating=entry.rating,
+            tags=entry.tags,
+            input_preview=RunSummary.format_preview(entry.input_preview),
+            output_preview=RunSummary.format_preview(entry.output_preview),
+            created_at=entry.created_at,
+            repair_state=RunSummary.repair_status_from_parts(
+                repaired=entry.repaired,
+                rating=entry.rating,
+                has_output=entry.has_output,
+            ),
+            model_name=entry.model_name,
+            input_source=entry.input_source_type,
+        )
+
+
+class RunSummaryPage(BaseModel):
+    runs: list[RunSummary]
+    # Runs matching the filters, over all pages
+    total: int
+    # Pass as `cursor` to get the next page. None on the last page.
+    next_cursor: str | None = None
+
+
+class RunPage(BaseModel):
+    runs: list[TaskRun]
+    # Runs matching the filters, over all pages
+    total: int
+    # Pass as `cursor` to get the next page. None on the last page.
+    next_cursor: str | None = None
+
+
+class BatchEditTagsRequest(BaseModel):
+    run_ids: list[str]
+    add_tags: list[str] | None = None
+    remove_tags: list[str] | None = None
+
+
+class BatchDeleteRunsRequest(BaseModel):
+    run_ids: list[str]
+
+
+class BatchRunResult(BaseModel):
+    run_id: str
+    success: bool
+    error: str | None = None
+
+
+class BatchRunsResponse(BaseModel):
+    # One result per requested run ID, in request order
+    results: list[BatchRunResult]
+
 
 class BulkUploadResponse(BaseModel):
     success: bool
@@ -153,63 +228,368 @@ def task_and_run_from_id(
     )
 
 
+def synced_run_index(task_path: Path) -> TaskRunIndex:
+    """
+    The run index for a task, synced with disk on first use only. After that the save and delete hooks keep it up to date, so reads pass sync=False and skip the scan of every run. Changes made outside the app are picked up by the runs_stats/sync and runs_stats/rebuild endpoints.
+    """
+    index = TaskRunIndex.for_task_path(task_path)
+    index.sync_once()
+    return index
+
+
+def query_run_index(
+    task: Task,
+    sort: RunSortKey,
+    order: Literal["asc", "desc"],
+    limit: int | None,
+    cursor: str | None,
+    tags: list[str],
+    filter_ids: list[str],
+    input_source: str | None,
+    min_rating: float | None,
+    max_rating: float | None,
+) -> TaskRunIndexPage:
+    if task.path is None:
+        return TaskRunIndexPage(entries=[], total=0, next_cursor=None)
+    query = TaskRunIndexQuery(
+        tags=list(tags),
+        input_source_type=input_source,
+        min_rating=min_rating,
+        max_rating=max_rating,
+    )
+    try:
+        for filter_id in filter_ids:
+            add_dataset_filter_to_query(query, filter_id)
+        return synced_run_index(task.path).query(
+            query,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+            sync=False,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def edited_tags(
+    tags: list[str], add_tags: list[str] | None, remove_tags: list[str] | None
+) -> list[str] | None:
+    """
+    A run's tags after removing then adding tags, or None if they don't change.
+    """
+    modified = False
+    if remove_tags and any(tag in tags for tag in remove_tags):
+        tags = list(set(tag for tag in tags if tag not in remove_tags))
+        modified = True
+    if add_tags and any(tag not in tags for tag in add_tags):
+        tags = list(set(tags + add_tags))
+        modified = True
+    return tags if modified else None
+
+
+def _batch_chunks(run_ids: list[str]) -> Iterator[list[str]]:
+    for start in range(0, len(run_ids), BATCH_CHUNK_SIZE):
+        yield run_ids[start : start + BATCH_CHUNK_SIZE]
+
+
+def _chunk_results(chunk: list[str], errors: Dict[str, str]) -> list[BatchRunResult]:
+    return [
+        BatchRunResult(
+            run_id=run_id, success=run_id not in errors, error=errors.get(run_id)
+        )
+        for run_id in chunk
+    ]
+
+
+def _run_lock_keys(task: Task, run_ids: list[str]) -> list[str]:
+    runs = TaskRun.from_ids_and_parent_path(run_ids, task.path, readonly=True)
+    return [run_lock_key(run.path) for run in runs.values() if run.path is not None]
+
+
+async def locked_batch_chunks(
+    task: Task,
+    run_ids: list[str],
+    process_chunk: Callable[[list[str]], list[BatchRunResult]],
+) -> AsyncIterator[list[BatchRunResult]]:
+    """
+    Process run IDs in chunks, yielding the results of each chunk as it completes. Each chunk runs on the datamodel thread pool while holding the run locks of its runs (the same locks as update_run_util), so batch writes and single run updates don't overwrite each other. process_chunk must read the runs itself, under the locks.
+    """
+    for chunk in _batch_chunks(run_ids):
+        keys = await run_blocking(_run_lock_keys, task, chunk)
+        try:
+            async with run_locks.hold_many(keys):
+                results = await run_blocking(process_chunk, chunk)
+        except FileLockTimeout:
+            error = "Run is being updated by another process, try again"
+            results = _chunk_results(chunk, {run_id: error for run_id in chunk})
+        yield results
+
+
+def batch_edit_tags(
+    task: Task,
+    run_ids: list[str],
+    add_tags: list[str] | None,
+    remove_tags: list[str] | None,
+) -> AsyncIterator[list[BatchRunResult]]:
+    """
+    Edit the tags of many runs. Yields the results for each chunk of run IDs as it completes.
+
+    IDs are resolved in one pass (not a folder scan per ID), and changed runs are written with save_many, under their run locks.
+    """
+
+    def edit_chunk(chunk: list[str]) -> list[BatchRunResult]:
+        runs = TaskRun.from_ids_and_parent_path(chunk, task.path)
+        errors: Dict[str, str] = {}
+        to_save: list[TaskRun] = []
+        for run_id in dict.fromkeys(chunk):
+            run = runs.get(run_id)
+            if run is None:
+                errors[run_id] = "Run not found"
+                continue
+            tags = edited_tags(run.tags or [], add_tags, remove_tags)
+            if tags is not None:
+                run.tags = tags
+                to_save.append(run)
+        try:
+            save_errors = KilnBaseModel.save_many(to_save)
+        except Exception as e:
+            save_errors = [e] * len(to_save)
+        for run, error in zip(to_save, save_errors):
+            if error is not None and run.id is not None:
+                errors[run.id] = str(error)
+        return _chunk_results(chunk, errors)
+
+    return locked_batch_chunks(task, run_ids, edit_chunk)
+
+
+def batch_delete_runs(
+    task: Task, run_ids: list[str]
+) -> AsyncIterator[list[BatchRunResult]]:
+    """
+    Delete many runs. Yields the results for each chunk of run IDs as it completes.
+
+    IDs are resolved in one pass, and runs are removed with delete_many (moved to trash, then deleted in the background), under their run locks.
+    """
+
+    def delete_chunk(chunk: list[str]) -> list[BatchRunResult]:
+        runs = TaskRun.from_ids_and_parent_path(chunk, task.path, readonly=True)
+        errors: Dict[str, str] = {
+            run_id: "Run not found" for run_id in chunk if run_id not in runs
+        }
+        to_delete = list(runs.values())
+        try:
+            delete_errors = TaskRun.delete_many(to_delete)
+        except Exception as e:
+            delete_errors = [e] * len(to_delete)
+        for run, error in zip(to_delete, delete_errors):
+            if error is not None and run.id is not None:
+                errors[run.id] = str(error)
+        return _chunk_results(chunk, errors)
+
+    return locked_batch_chunks(task, run_ids, delete_chunk)
+
+
+def batch_results_with_status(
+    chunks: AsyncIterator[list[BatchRunResult]], total: int
+) -> StreamingResponse:
+    # Server sent events: a progress message per chunk, then the results, then "complete"
+    async def event_generator():
+        results: list[BatchRunResult] = []
+        async for chunk in chunks:
+            results.extend(chunk)
+            data = {"progress": len(results), "total": total}
+            yield f"data: {json.dumps(data)}\n\n"
+        yield f"data: {BatchRunsResponse(results=results).model_dump_json()}\n\n"
+        yield "data: complete\n\n"
+
+    return StreamingResponse(
+        content=event_generator(),
+        media_type="text/event-stream",
+    )
+
+
+def raise_for_failed_runs(results: list[BatchRunResult], error: str | None = None):
+    failed = [result for result in results if not result.success]
+    if failed:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "failed_runs": [result.run_id for result in failed],
+                "error": error or failed[-1].error or "Unknown error",
+            },
+        )
+
+
 def connect_run_api(app: FastAPI):
     @app.get("/api/projects/{project_id}/tasks/{task_id}/runs/{run_id}")
-    async def get_run(project_id: str, task_id: str, run_id: str) -> TaskRun:
+    @blocking_handler
+    def get_run(project_id: str, task_id: str, run_id: str) -> TaskRun:
         return run_from_id(project_id, task_id, run_id)
 
     @app.delete("/api/projects/{project_id}/tasks/{task_id}/runs/{run_id}")
-    async def delete_run(project_id: str, task_id: str, run_id: str):
+    @blocking_handler
+    def delete_run(project_id: str, task_id: str, run_id: str):
         run = run_from_id(project_id, task_id, run_id)
         run.delete()
 
     @app.get("/api/projects/{project_id}/tasks/{task_id}/runs")
-    async def get_runs(project_id: str, task_id: str) -> list[TaskRun]:
+    @blocking_handler
+    def get_runs(project_id: str, task_id: str) -> list[TaskRun]:
         task = task_from_id(project_id, task_id)
         return list(task.runs(readonly=True))
 
     @app.get("/api/projects/{project_id}/tasks/{task_id}/runs_summaries")
-    async def get_runs_summary(project_id: str, task_id: str) -> list[RunSummary]:
+    @blocking_handler
+    def get_runs_summary(project_id: str, task_id: str) -> list[RunSummary]:
+        task = task_from_id(project_id, task_id)
+        if task.path is None:
+            return []
+        # Served from the run index: only new or modified runs are loaded from disk
+        entries = synced_run_index(task.path).entries(sync=False)
+        return [RunSummary.from_index_entry(entry) for entry in entries]
+
+    @app.get("/api/projects/{project_id}/tasks/{task_id}/runs_summaries_page")
+    @blocking_handler
+    def get_runs_summaries_page(
+        project_id: str,
+        task_id: str,
+        sort: RunSortKey = "created_at",
+        order: Literal["asc", "desc"] = "desc",
+        limit: int | None = Query(None, ge=1),
+        cursor: str | None = None,
+        tags: list[str] = Query([]),
+        filter_ids: list[str] = Query([]),
+        input_source: str | None = None,
+        min_rating: float | None = None,
+        max_rating: float | None = None,
+    ) -> RunSummaryPage:
         task = task_from_id(project_id, task_id)
-        # Readonly since we are not mutating the runs. Faster as we don't need to copy them.
-        runs = task.runs(readonly=True)
-        run_summaries: list[RunSummary] = []
-        for run in runs:
-            summary = RunSummary.from_run(run)
-            run_summaries.append(summary)
-        return run_summaries
+        # Filtered, sorted and paginated in the run index: no runs are loaded
+        page = query_run_index(
+            task,
+            sort,
+            order,
+            limit,
+            cursor,
+            tags,
+            filter_ids,
+            input_source,
+            min_rating,
+            max_rating,
+        )
+        return RunSummaryPage(
+            runs=[RunSummary.from_index_entry(entry) for entry in page.entries],
+            total=page.total,
+            next_cursor=page.next_cursor,
+        )
+
+    @app.get("/api/projects/{project_id}/tasks/{task_id}/runs_page")
+    @blocking_handler
+    def get_runs_page(
+        project_id: str,
+        task_id: str,
+        sort: RunSortKey = "created_at",
+        order: Literal["asc", "desc"] = "desc",
+        limit: int | None = Query(None, ge=1),
+        cursor: str | None = None,
+        tags: list[str] = Query([]),
+        filter_ids: list[str] = Query([]),
+        input_source: str | None = None,
+        min_rating: float | None = None,
+        max_rating: float | None = None,
+    ) -> RunPage:
+        task = task_from_id(project_id, task_id)
+        # Filtered and paginated in the run index, then only the runs on this page are loaded
+        page = query_run_index(
+            task,
+            sort,
+            order,
+            limit,
+            cursor,
+            tags,
+            filter_ids,
+            input_source,
+            min_rating,
+            max_rating,
+        )
+        runs = load_models(
+            TaskRun,
+            [(entry.path, entry.mtime_ns) for entry in page.entries],
+            readonly=True,
+        )
+        return RunPage(runs=runs, total=page.total, next_cursor=page.next_cursor)
+
+    @app.get("/api/projects/{project_id}/tasks/{task_id}/runs_stats")
+    @blocking_handler
+    def get_runs_stats(project_id: str, task_id: str) -> TaskRunStats:
+        task = task_from_id(project_id, task_id)
+        if task.path is None:
+            return TaskRunStats()
+        # Maintained incrementally in the run index, so this doesn't load the runs
+        return synced_run_index(task.path).stats(sync=False)
+
+    @app.get("/api/projects/{project_id}/tasks/{task_id}/tags")
+    @blocking_handler
+    def get_tags(project_id: str, task_id: str) -> Dict[str, int]:
+        task = task_from_id(project_id, task_id)
+        if task.path is None:
+            return {}
+        # Tag -> run count, from the run index
+        return synced_run_index(task.path).tag_counts(sync=False)
+
+    @app.post("/api/projects/{project_id}/tasks/{task_id}/runs_stats/sync")
+    @blocking_handler
+    def sync_runs_stats(project_id: str, task_id: str) -> TaskRunStats:
+        task = task_from_id(project_id, task_id)
+        if task.path is None:
+            return TaskRunStats()
+        # Picks up runs added, edited or removed outside the app (git pull, manual edits)
+        index = TaskRunIndex.for_task_path(task.path)
+        index.sync()
+        return index.stats(sync=False)
+
+    @app.post("/api/projects/{project_id}/tasks/{task_id}/runs_stats/rebuild")
+    @blocking_handler
+    def rebuild_runs_stats(project_id: str, task_id: str) -> TaskRunStats:
+        task = task_from_id(project_id, task_id)
+        if task.path is None:
+            return TaskRunStats()
+        # Recovery: rebuilds the run index (and stats) from the run files
+        index = TaskRunIndex.for_task_path(task.path)
+        index.rebuild()
+        return index.stats(sync=False)
 
     @app.post("/api/projects/{project_id}/tasks/{task_id}/runs/delete")
     async def delete_runs(project_id: str, task_id: str, run_ids: list[str]):
-        task = task_from_id(project_id, task_id)
-        failed_runs: list[str] = []
-        last_error: Exception | None = None
-        for run_id in run_ids:
-            try:
-                run = TaskRun.from_id_and_parent_path(run_id, task.path)
-                if run:
-                    run.delete()
-                else:
-                    failed_runs.append(run_id)
-                    last_error = Exception("Run not found")
-            except Exception as e:
-                last_error = e
-                failed_runs.append(run_id)
-        if failed_runs:
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "failed_runs": failed_runs,
-                    "error": str(last_error) if last_error else "Unknown error",
-                },
-            )
+        task = await run_blocking(task_from_id, project_id, task_id)
+        chunks = batch_delete_runs(task, run_ids)
+        results = [r async for chunk in chunks for r in chunk]
+        raise_for_failed_runs(results)
         return {"success": True}
 
+    @app.post("/api/projects/{project_id}/tasks/{task_id}/runs/batch_delete")
+    async def batch_delete(
+        project_id: str, task_id: str, request: BatchDeleteRunsRequest
+    ) -> BatchRunsResponse:
+        task = await run_blocking(task_from_id, project_id, task_id)
+        chunks = batch_delete_runs(task, request.run_ids)
+        return BatchRunsResponse(results=[r async for chunk in chunks for r in chunk])
+
+    @app.post("/api/projects/{project_id}/tasks/{task_id}/runs/batch_delete/stream")
+    async def batch_delete_stream(
+        project_id: str, task_id: str, request: BatchDeleteRunsRequest
+    ) -> StreamingResponse:
+        task = await run_blocking(task_from_id, project_id, task_id)
+        return batch_results_with_status(
+            batch_delete_runs(task, request.run_ids), len(request.run_ids)
+        )
+
     @app.post("/api/projects/{project_id}/tasks/{task_id}/run")
     async def run_task(
         project_id: str, task_id: str, request: RunTaskRequest
     ) -> TaskRun:
-        task = task_from_id(project_id, task_id)
+        task = await run_blocking(task_from_id, project_id, task_id)
 
         adapter = adapter_for_task(
             task,
@@ -245,42 +625,44 @@ def connect_run_api(app: FastAPI):
         add_tags: list[str] | None = None,
         remove_tags: list[str] | None = None,
     ):
-        task = task_from_id(project_id, task_id)
-        failed_runs: list[str] = []
-        for run_id in run_ids:
-            run = TaskRun.from_id_and_parent_path(run_id, task.path)
-            if not run:
-                failed_runs.append(run_id)
-            else:
-                modified = False
-                if remove_tags and any(tag in (run.tags or []) for tag in remove_tags):
-                    run.tags = list(
-                        set(tag for tag in (run.tags or []) if tag not in remove_tags)
-                    )
-                    modified = True
-                if add_tags and any(tag not in (run.tags or []) for tag in add_tags):
-                    run.tags = list(set((run.tags or []) + add_tags))
-                    modified = True
-                if modified:
-                    run.save_to_file()
-
-        if failed_runs:
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "failed_runs": failed_runs,
-                    "error": "Runs not found",
-                },
-            )
+        task = await run_blocking(task_from_id, project_id, task_id)
+        chunks = batch_edit_tags(task, run_ids, add_tags, remove_tags)
+        results = [r async for chunk in chunks for r in chunk]
+        raise_for_failed_runs(
+            results,
+            "Runs not found"
+            if all(r.error == "Run not found" for r in results if not r.success)
+            else None,
+        )
         return {"success": True}
 
+    @app.post("/api/projects/{project_id}/tasks/{task_id}/runs/batch_edit_tags")
+    async def batch_edit_tags_endpoint(
+        project_id: str, task_id: str, request: BatchEditTagsRequest
+    ) -> BatchRunsResponse:
+        task = await run_blocking(task_from_id, project_id, task_id)
+        chunks = batch_edit_tags(
+            task, request.run_ids, request.add_tags, request.remove_tags
+        )
+        return BatchRunsResponse(results=[r async for chunk in chunks for r in chunk])
+
+    @app.post("/api/projects/{project_id}/tasks/{task_id}/runs/batch_edit_tags/stream")
+    async def batch_edit_tags_stream(
+        project_id: str, task_id: str, request: BatchEditTagsRequest
+    ) -> StreamingResponse:
+        task = await run_blocking(task_from_id, project_id, task_id)
+        chunks = batch_edit_tags(
+            task, request.run_ids, request.add_tags, request.remove_tags
+        )
+        return batch_results_with_status(chunks, len(request.run_ids))
+
     @app.post("/api/projects/{project_id}/tasks/{task_id}/runs/bulk_upload")
     async def bulk_upload(
         project_id: str,
         task_id: str,
         file: UploadFile = File(...),
     ) -> BulkUploadResponse:
-        task = task_from_id(project_id, task_id)
+        task = await run_blocking(task_from_id, project_id, task_id)
 
         # store the file in temp directory
         file_name = file.filename if file.filename else "untitled"
@@ -288,12 +670,11 @@ def connect_run_api(app: FastAPI):
             tempfile.gettempdir(),
             file_name,
         )
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        content = await file.read()
 
-        imported_count = 0
-        try:
+        def import_file() -> int:
+            with open(file_path, "wb") as f:
+                f.write(content)
             importer = DatasetFileImporter(
                 task,
                 ImportConfig(
@@ -302,7 +683,11 @@ def connect_run_api(app: FastAPI):
                     dataset_name=file_name,
                 ),
             )
-            imported_count = importer.create_runs_from_file()
+            return importer.create_runs_from_file()
+
+        imported_count = 0
+        try:
+            imported_count = await run_blocking(import_file)
         except KilnInvalidImportFormat as e:
             logger.error(
                 f"Invalid import format in {file_name}: {str(e)}",
@@ -323,12 +708,20 @@ def connect_run_api(app: FastAPI):
 async def update_run_util(
     project_id: str, task_id: str, run_id: str, run_data: Dict[str, Any]
 ) -> TaskRun:
-    # Lock to prevent overwriting concurrent updates
-    async with update_run_lock:
-        task = task_from_id(project_id, task_id)
+    task = await run_blocking(task_from_id, project_id, task_id)
+    run = await TaskRun.from_id_and_parent_path_async(run_id, task.path)
+    if run is None or run.path is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Run not found. ID: {run_id}",
+        )
+    run_path = run.path
 
-        run = TaskRun.from_id_and_parent_path(run_id, task.path)
-        if run is None:
+    def update(run_path: Path) -> TaskRun:
+        # Re-read under the lock, to apply the update on top of any update we waited on
+        try:
+            run = TaskRun.load_from_file(run_path)
+        except FileNotFoundError:
             raise HTTPException(
                 status_code=404,
                 detail=f"Run not found. ID: {run_id}",
@@ -342,6 +735,16 @@ async def update_run_util(
         updated_run.save_to_file()
         return updated_run
 
+    # Lock this run (only) while we load/update/write, which is not atomic. Also held across server processes.
+    try:
+        async with run_locks.hold(run_lock_key(run_path)):
+            return await run_blocking(update, run_path)
+    except FileLockTimeout:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Run is being updated by another process, try again. ID: {run_id}",
+        )
+
 
 def model_provider_from_string(provider: str) -> ModelProviderName:
     if not provider or provider not in ModelProviderName.__members__:
@@ -0,0 +1,83 @@
+"""
+Keyed locks for read-modify-write updates, so updates to different runs don't wait on each other.
+
+Each key (a run's file path) gets its own asyncio lock, created on first use and dropped once no one holds or waits on it. Holding a key also takes a cross-process file lock (see kiln_ai.utils.file_lock, keys share a fixed set of lock files), so several server processes sharing a project don't overwrite each other's edits. Batch edits hold all the keys in a chunk at once with `hold_many`.
+"""
+
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, Tuple
+
+from kiln_ai.utils.file_lock import FileLock, FileLockTimeout, lock_path_for_key
+
+# Max seconds to wait for another process to release a key
+FILE_LOCK_TIMEOUT = 30.0
+# How often to retry a file lock held by another process. Polled so we never block the event loop.
+FILE_LOCK_POLL_INTERVAL = 0.01
+
+
+class KeyedLock:
+    """
+    Async locks by key. Holders of different keys run concurrently, holders of the same key one at a time.
+    """
+
+    def __init__(self, cross_process: bool = True):
+        self.cross_process = cross_process
+        # key -> (lock, number of holders and waiters)
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        async with self.hold_many([key]):
+            yield
+
+    @asynccontextmanager
+    async def hold_many(self, keys: Iterable[str]) -> AsyncIterator[None]:
+        """
+        Hold several keys at once. All keys are taken in sorted order, then their lock files in sorted order, so holders of overlapping keys can't deadlock. Keys sharing a lock file take it once: file locks aren't reentrant.
+        """
+        keys = sorted(set(keys))
+        async with AsyncExitStack() as stack:
+            for key in keys:
+                await stack.enter_async_context(self._hold_in_process(key))
+            if self.cross_process:
+                for lock_path in sorted({lock_path_for_key(key) for key in keys}):
+                    file_lock = FileLock(lock_path)
+                    await self._acquire_file_lock(file_lock)
+                    stack.callback(file_lock.release)
+            yield
+
+    @asynccontextmanager
+    async def _hold_in_process(self, key: str) -> AsyncIterator[None]:
+        lock, users = self._locks.get(key, (asyncio.Lock(), 0))
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+    async def _acquire_file_lock(self, file_lock: FileLock) -> None:
+        deadline = time.monotonic() + FILE_LOCK_TIMEOUT
+        while not file_lock.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                raise FileLockTimeout(f"Timed out waiting for lock: {file_lock.path}")
+            await asyncio.sleep(FILE_LOCK_POLL_INTERVAL)
+
+    def active_keys(self) -> int:
+        """The number of keys currently held or waited on."""
+        return len(self._locks)
+
+
+# Locks for task run updates, keyed by run file path
+run_locks = KeyedLock()
+
+
+def run_lock_key(run_path: Path) -> str:
+    return str(run_path.resolve())
@@ -2,14 +2,23 @@ from typing import Any, Dict, List
 
 from fastapi import FastAPI, HTTPException
 from kiln_ai.datamodel import Task
+from kiln_ai.datamodel.blocking_io import blocking_handler
+from kiln_ai.datamodel.registry import ProjectRegistry
 
 from kiln_server.project_api import project_from_id
 
 
 def task_from_id(project_id: str, task_id: str) -> Task:
+    # Usually resolved from a previous request: a single (cached) file load
+    registry = ProjectRegistry.shared()
+    task = registry.cached_task(project_id, task_id)
+    if task:
+        return task
+
     parent_project = project_from_id(project_id)
     task = Task.from_id_and_parent_path(task_id, parent_project.path)
     if task:
+        registry.remember_task(project_id, task)
         return task
 
     raise HTTPException(
@@ -20,7 +29,8 @@ def task_from_id(project_id: str, task_id: str) -> Task:
 
 def connect_task_api(app: FastAPI):
     @app.post("/api/projects/{project_id}/task")
-    async def create_task(project_id: str, task_data: Dict[str, Any]) -> Task:
+    @blocking_handler
+    def create_task(project_id: str, task_data: Dict[str, Any]) -> Task:
         if "id" in task_data:
             raise HTTPException(
                 status_code=400,
@@ -45,7 +55,8 @@ def connect_task_api(app: FastAPI):
         return task
 
     @app.patch("/api/projects/{project_id}/task/{task_id}")
-    async def update_task(
+    @blocking_handler
+    def update_task(
         project_id: str, task_id: str, task_updates: Dict[str, Any]
     ) -> Task:
         if "input_json_schema" in task_updates or "output_json_schema" in task_updates:
@@ -77,15 +88,18 @@ def connect_task_api(app: FastAPI):
         return updated_task
 
     @app.delete("/api/projects/{project_id}/task/{task_id}")
-    async def delete_task(project_id: str, task_id: str) -> None:
+    @blocking_handler
+    def delete_task(project_id: str, task_id: str) -> None:
         task = task_from_id(project_id, task_id)
         task.delete()
 
     @app.get("/api/projects/{project_id}/tasks")
-    async def get_tasks(project_id: str) -> List[Task]:
+    @blocking_handler
+    def get_tasks(project_id: str) -> List[Task]:
         parent_project = project_from_id(project_id)
         return parent_project.tasks()
 
     @app.get("/api/projects/{project_id}/tasks/{task_id}")
-    async def get_task(project_id: str, task_id: str) -> Task:
+    @blocking_handler
+    def get_task(project_id: str, task_id: str) -> Task:
         return task_from_id(project_id, task_id)
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from kiln_ai.datamodel.model_cache import ModelCache
+
+from kiln_server.cache_api import connect_cache_api
+
+
+@pytest.fixture
+def cache():
+    cache = ModelCache(max_entries=100)
+    with patch.object(ModelCache, "shared", return_value=cache):
+        yield cache
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    connect_cache_api(app)
+    return TestClient(app)
+
+
+def test_get_cache_stats(client, cache):
+    cache._hits = 3
+    cache._evictions = 2
+
+    response = client.get("/api/cache/stats")
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["hits"] == 3
+    assert result["evictions"] == 2
+    assert result["entries"] == 0
+    assert result["max_entries"] == 100
+
+
+def test_reset_cache_stats(client, cache):
+    cache._hits = 3
+
+    response = client.post("/api/cache/reset_stats")
+
+    assert response.status_code == 200
+    assert response.json()["hits"] == 0
+    assert cache.stats().hits == 0
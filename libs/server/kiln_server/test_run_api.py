@@ -1,5 +1,9 @@
+import asyncio
+import json
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 from fastapi import FastAPI, HTTPException
 from fastapi.testclient import TestClient
@@ -15,15 +19,21 @@ from kiln_ai.datamodel import (
     TaskOutputRatingType,
     TaskRun,
 )
+from kiln_ai.datamodel.basemodel import KilnBaseModel
+from kiln_ai.utils.file_lock import FileLock, lock_path_for_key
 
 from kiln_server.custom_errors import connect_custom_errors
 from kiln_server.run_api import (
     RunSummary,
+    batch_delete_runs,
+    batch_edit_tags,
     connect_run_api,
     deep_update,
     model_provider_from_string,
     run_from_id,
+    update_run_util,
 )
+from kiln_server.run_lock import run_lock_key, run_locks
 
 
 @pytest.fixture
@@ -740,9 +750,7 @@ async def test_get_runs_summaries_success(client, task_run_setup):
     task_run = task_run_setup["task_run"]
 
     with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
-        mock_task = MagicMock()
-        mock_task.runs.return_value = [task_run]
-        mock_task_from_id.return_value = mock_task
+        mock_task_from_id.return_value = task
 
         response = client.get(
             f"/api/projects/{project.id}/tasks/{task.id}/runs_summaries"
@@ -764,6 +772,204 @@ async def test_get_runs_summaries_success(client, task_run_setup):
     assert result[0]["input_source"] == task_run.input_source.type
 
 
+@pytest.mark.asyncio
+async def test_get_runs_summaries_reflects_updates(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs_summaries"
+
+    with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
+        mock_task_from_id.return_value = task
+        assert client.get(url).json()[0]["repair_state"] == "Rating needed"
+
+        task_run.output.rating = TaskOutputRating(
+            value=5.0, type=TaskOutputRatingType.five_star
+        )
+        task_run.save_to_file()
+        result = client.get(url).json()
+
+    assert len(result) == 1
+    assert result[0]["rating"]["value"] == 5.0
+    assert result[0]["repair_state"] == "No repair needed"
+
+
+@pytest.mark.asyncio
+async def test_get_runs_stats(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs_stats"
+
+    with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
+        mock_task_from_id.return_value = task
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.json() == {
+            "total": 1,
+            "tag_counts": {},
+            "rating_counts": {"unrated": 1},
+            "input_source_counts": {"human": 1},
+            "repaired_count": 0,
+            "thinking_count": 0,
+        }
+
+        task_run.tags = ["golden"]
+        task_run.output.rating = TaskOutputRating(
+            value=5.0, type=TaskOutputRatingType.five_star
+        )
+        task_run.save_to_file()
+        result = client.get(url).json()
+        assert result["tag_counts"] == {"golden": 1}
+        assert result["rating_counts"] == {"five_star:5": 1}
+
+        rebuilt = client.post(f"{url}/rebuild")
+        assert rebuilt.status_code == 200
+        assert rebuilt.json() == result
+
+
+@pytest.mark.asyncio
+async def test_get_runs_stats_sync(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs_stats"
+
+    with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
+        mock_task_from_id.return_value = task
+        assert client.get(url).json()["total"] == 1
+
+        # Reads don't rescan the runs: changes made outside the app need an explicit sync
+        task_run.path.unlink()
+        assert client.get(url).json()["total"] == 1
+        synced = client.post(f"{url}/sync")
+        assert synced.status_code == 200
+        assert synced.json()["total"] == 0
+        assert client.get(url).json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_tags(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+    url = f"/api/projects/{project.id}/tasks/{task.id}/tags"
+
+    with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
+        mock_task_from_id.return_value = task
+        assert client.get(url).json() == {}
+
+        task_run.tags = ["a", "b"]
+        task_run.save_to_file()
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.json() == {"a": 1, "b": 1}
+
+
+def add_paging_runs(task) -> list[TaskRun]:
+    source = DataSource(
+        type=DataSourceType.synthetic,
+        properties={
+            "model_name": "gpt_4o",
+            "model_provider": "ollama",
+            "adapter_name": "kiln_langchain_adapter",
+        },
+    )
+    runs = []
+    for i in range(5):
+        run = TaskRun(
+            parent=task,
+            input=f"input {i}",
+            input_source=DataSource(
+                type=DataSourceType.human, properties={"created_by": "Test User"}
+            ),
+            output=TaskOutput(
+                output="output",
+                source=source,
+                rating=TaskOutputRating(value=i + 1),
+            ),
+            tags=["even"] if i % 2 == 0 else [],
+        )
+        run.save_to_file()
+        runs.append(run)
+    return runs
+
+
+@pytest.mark.asyncio
+async def test_get_runs_summaries_page(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    runs = add_paging_runs(task)
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs_summaries_page"
+
+    with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
+        mock_task_from_id.return_value = task
+
+        # Everything, newest first
+        result = client.get(url).json()
+        assert result["total"] == 6
+        assert result["next_cursor"] is None
+        assert [r["id"] for r in result["runs"][:5]] == [
+            run.id for run in reversed(runs)
+        ]
+
+        # Filtered, sorted by rating, in pages of 2
+        params = {"tags": "even", "sort": "rating", "order": "asc", "limit": 2}
+        page = client.get(url, params=params).json()
+        assert page["total"] == 3
+        assert [r["rating"]["value"] for r in page["runs"]] == [1, 3]
+        page = client.get(url, params={**params, "cursor": page["next_cursor"]}).json()
+        assert [r["rating"]["value"] for r in page["runs"]] == [5]
+        assert page["next_cursor"] is None
+
+        result = client.get(
+            url, params={"min_rating": 2, "max_rating": 4, "sort": "rating"}
+        ).json()
+        assert [r["rating"]["value"] for r in result["runs"]] == [4, 3, 2]
+
+        result = client.get(
+            url, params={"filter_ids": ["high_rating", "tag::even"]}
+        ).json()
+        assert {r["id"] for r in result["runs"]} == {runs[4].id}
+
+        result = client.get(url, params={"input_source": "synthetic"}).json()
+        assert result == {"runs": [], "total": 0, "next_cursor": None}
+
+
+@pytest.mark.asyncio
+async def test_get_runs_page(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    runs = add_paging_runs(task)
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs_page"
+
+    with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
+        mock_task_from_id.return_value = task
+        response = client.get(url, params={"tags": "even", "limit": 2, "order": "asc"})
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["total"] == 3
+    assert result["next_cursor"] is not None
+    assert [r["id"] for r in result["runs"]] == [runs[0].id, runs[2].id]
+    assert result["runs"][0]["input"] == "input 0"
+
+
+@pytest.mark.asyncio
+async def test_get_runs_summaries_page_invalid_params(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs_summaries_page"
+
+    with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
+        mock_task_from_id.return_value = task
+        assert client.get(url, params={"cursor": "bad"}).status_code == 400
+        assert client.get(url, params={"filter_ids": "bad"}).status_code == 400
+        assert client.get(url, params={"sort": "input"}).status_code == 422
+        assert client.get(url, params={"limit": 0}).status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_get_runs_summaries_task_not_found(client):
     with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
@@ -866,7 +1072,7 @@ async def test_delete_multiple_runs_with_exception(client, task_run_setup):
     with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
         mock_task_from_id.return_value = task
         # Simulate an unexpected error during deletion
-        with patch.object(TaskRun, "delete") as mock_delete:
+        with patch.object(TaskRun, "delete_many") as mock_delete:
             mock_delete.side_effect = Exception("Unexpected error")
             response = client.post(
                 f"/api/projects/{project.id}/tasks/{task.id}/runs/delete", json=run_ids
@@ -1219,6 +1425,321 @@ async def test_remove_tags_multiple_runs(client, task_run_setup):
     assert set(updated_run2.tags) == {"tag3"}
 
 
+@pytest.mark.asyncio
+async def test_batch_edit_tags(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    runs = add_paging_runs(task)
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs/batch_edit_tags"
+    run_ids = [runs[0].id, "non_existent_run_id", runs[1].id]
+
+    with (
+        patch("kiln_server.run_api.task_from_id") as mock_task_from_id,
+        patch.object(
+            TaskRun, "from_id_and_parent_path", wraps=TaskRun.from_id_and_parent_path
+        ) as mock_from_id,
+    ):
+        mock_task_from_id.return_value = task
+        response = client.post(
+            url,
+            json={"run_ids": run_ids, "add_tags": ["new"], "remove_tags": ["even"]},
+        )
+        # Resolved in one pass, not one lookup per ID
+        mock_from_id.assert_not_called()
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [
+            {"run_id": runs[0].id, "success": True, "error": None},
+            {
+                "run_id": "non_existent_run_id",
+                "success": False,
+                "error": "Run not found",
+            },
+            {"run_id": runs[1].id, "success": True, "error": None},
+        ]
+    }
+    assert TaskRun.from_id_and_parent_path(runs[0].id, task.path).tags == ["new"]
+    assert TaskRun.from_id_and_parent_path(runs[1].id, task.path).tags == ["new"]
+    assert TaskRun.from_id_and_parent_path(runs[2].id, task.path).tags == ["even"]
+
+
+@pytest.mark.asyncio
+async def test_batch_edit_tags_save_error(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs/batch_edit_tags"
+
+    with (
+        patch("kiln_server.run_api.task_from_id") as mock_task_from_id,
+        patch.object(KilnBaseModel, "save_many", return_value=[Exception("Disk full")]),
+    ):
+        mock_task_from_id.return_value = task
+        response = client.post(url, json={"run_ids": [task_run.id], "add_tags": ["a"]})
+
+    assert response.json()["results"] == [
+        {"run_id": task_run.id, "success": False, "error": "Disk full"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_delete(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    runs = add_paging_runs(task)
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs/batch_delete"
+
+    with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
+        mock_task_from_id.return_value = task
+        response = client.post(
+            url, json={"run_ids": [runs[0].id, "non_existent_run_id"]}
+        )
+        summaries = client.get(
+            f"/api/projects/{project.id}/tasks/{task.id}/runs_summaries"
+        ).json()
+
+    assert response.status_code == 200
+    assert [r["success"] for r in response.json()["results"]] == [True, False]
+    assert TaskRun.from_id_and_parent_path(runs[0].id, task.path) is None
+    assert runs[0].id not in {summary["id"] for summary in summaries}
+    assert len(summaries) == 5
+
+
+@pytest.mark.asyncio
+async def test_batch_edit_tags_stream(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    runs = add_paging_runs(task)
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs/batch_edit_tags/stream"
+    run_ids = [run.id for run in runs]
+
+    with (
+        patch("kiln_server.run_api.task_from_id") as mock_task_from_id,
+        patch("kiln_server.run_api.BATCH_CHUNK_SIZE", 2),
+    ):
+        mock_task_from_id.return_value = task
+        response = client.post(url, json={"run_ids": run_ids, "add_tags": ["new"]})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = [line[len("data: ") :] for line in response.text.split("\n\n") if line]
+    assert messages[-1] == "complete"
+    progress = [json.loads(message) for message in messages[:3]]
+    assert progress == [
+        {"progress": 2, "total": 5},
+        {"progress": 4, "total": 5},
+        {"progress": 5, "total": 5},
+    ]
+    results = json.loads(messages[3])["results"]
+    assert [r["run_id"] for r in results] == run_ids
+    assert all(r["success"] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_delete_stream(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs/batch_delete/stream"
+
+    with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
+        mock_task_from_id.return_value = task
+        response = client.post(url, json={"run_ids": [task_run.id]})
+
+    messages = [line[len("data: ") :] for line in response.text.split("\n\n") if line]
+    assert json.loads(messages[0]) == {"progress": 1, "total": 1}
+    assert json.loads(messages[1])["results"][0]["success"] is True
+    assert messages[2] == "complete"
+    assert TaskRun.from_id_and_parent_path(task_run.id, task.path) is None
+
+
+@pytest.mark.asyncio
+async def test_update_run_util_concurrent_updates_same_run(task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+
+    with patch("kiln_server.run_api.task_from_id") as mock_task_from_id:
+        mock_task_from_id.return_value = task
+        # Both read-modify-writes apply: neither overwrites the other with a stale copy
+        await asyncio.gather(
+            update_run_util(project.id, task.id, task_run.id, {"tags": ["a"]}),
+            update_run_util(
+                project.id,
+                task.id,
+                task_run.id,
+                {"output": {"rating": {"value": 4, "type": "five_star"}}},
+            ),
+        )
+
+    updated = TaskRun.from_id_and_parent_path(task_run.id, task.path)
+    assert updated.tags == ["a"]
+    assert updated.output.rating.value == 4
+
+
+@pytest.mark.asyncio
+async def test_update_run_util_locks_per_run(task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+    other_run = add_paging_runs(task)[0]
+    held_keys: list[str] = []
+
+    original_hold = run_locks.hold
+
+    def record_hold(key):
+        held_keys.append(key)
+        return original_hold(key)
+
+    with (
+        patch("kiln_server.run_api.task_from_id") as mock_task_from_id,
+        patch.object(run_locks, "hold", side_effect=record_hold),
+    ):
+        mock_task_from_id.return_value = task
+        await update_run_util(project.id, task.id, task_run.id, {"tags": ["a"]})
+        await update_run_util(project.id, task.id, other_run.id, {"tags": ["b"]})
+
+    assert held_keys == [
+        run_lock_key(task_run.path),
+        run_lock_key(other_run.path),
+    ]
+    assert run_locks.active_keys() == 0
+
+
+@pytest.mark.asyncio
+async def test_update_run_locked_by_other_process(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+
+    with (
+        patch("kiln_server.run_api.task_from_id") as mock_task_from_id,
+        patch("kiln_server.run_lock.FILE_LOCK_TIMEOUT", 0.05),
+        FileLock(lock_path_for_key(run_lock_key(task_run.path))),
+    ):
+        mock_task_from_id.return_value = task
+        response = client.patch(
+            f"/api/projects/{project.id}/tasks/{task.id}/runs/{task_run.id}",
+            json={"tags": ["a"]},
+        )
+
+    assert response.status_code == 409
+    assert "another process" in response.json()["message"]
+
+
+@pytest.mark.asyncio
+async def test_batch_edit_tags_holds_run_locks(task_run_setup):
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+    other_run = add_paging_runs(task)[0]
+    events: list[str] = []
+    original_save_many = KilnBaseModel.save_many
+
+    def record_save_many(models):
+        events.append("saved")
+        return original_save_many(models)
+
+    async def edit():
+        chunks = batch_edit_tags(task, [task_run.id, other_run.id], ["batch"], None)
+        return [r async for chunk in chunks for r in chunk]
+
+    with patch.object(KilnBaseModel, "save_many", side_effect=record_save_many):
+        # A single run update holds one of the runs: the batch waits for it
+        async with run_locks.hold(run_lock_key(other_run.path)):
+            batch = asyncio.create_task(edit())
+            await asyncio.sleep(0.05)
+            events.append("released")
+        results = await batch
+
+    assert events == ["released", "saved"]
+    assert all(r.success for r in results)
+    assert "batch" in TaskRun.from_id_and_parent_path(other_run.id, task.path).tags
+    assert run_locks.active_keys() == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_delete_holds_run_locks(task_run_setup):
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+    held_keys: list[list[str]] = []
+    original_hold_many = run_locks.hold_many
+
+    def record_hold_many(keys):
+        held_keys.append(list(keys))
+        return original_hold_many(keys)
+
+    with patch.object(run_locks, "hold_many", side_effect=record_hold_many):
+        chunks = batch_delete_runs(task, [task_run.id, "non_existent_run_id"])
+        results = [r async for chunk in chunks for r in chunk]
+
+    assert held_keys == [[run_lock_key(task_run.path)]]
+    assert [r.success for r in results] == [True, False]
+    assert TaskRun.from_id_and_parent_path(task_run.id, task.path) is None
+
+
+@pytest.mark.asyncio
+async def test_batch_edit_tags_locked_by_other_process(client, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+    task_run = task_run_setup["task_run"]
+    url = f"/api/projects/{project.id}/tasks/{task.id}/runs/batch_edit_tags"
+
+    with (
+        patch("kiln_server.run_api.task_from_id") as mock_task_from_id,
+        patch("kiln_server.run_lock.FILE_LOCK_TIMEOUT", 0.05),
+        FileLock(lock_path_for_key(run_lock_key(task_run.path))),
+    ):
+        mock_task_from_id.return_value = task
+        response = client.post(url, json={"run_ids": [task_run.id], "add_tags": ["a"]})
+
+    assert response.status_code == 200
+    result = response.json()["results"][0]
+    assert result["success"] is False
+    assert "another process" in result["error"]
+    assert TaskRun.from_id_and_parent_path(task_run.id, task.path).tags == []
+
+
+@pytest.mark.asyncio
+async def test_slow_listing_does_not_block_event_loop(app, task_run_setup):
+    project = task_run_setup["project"]
+    task = task_run_setup["task"]
+
+    def slow_task_from_id(project_id, task_id):
+        # Stand in for a slow disk: blocks the calling thread
+        time.sleep(0.5)
+        return task
+
+    max_gap = 0.0
+
+    async def ticker():
+        nonlocal max_gap
+        last = time.monotonic()
+        while True:
+            await asyncio.sleep(0.01)
+            now = time.monotonic()
+            max_gap = max(max_gap, now - last)
+            last = now
+
+    transport = httpx.ASGITransport(app=app)
+    with patch("kiln_server.run_api.task_from_id", side_effect=slow_task_from_id):
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as async_client:
+                response = await async_client.get(
+                    f"/api/projects/{project.id}/tasks/{task.id}/runs"
+                )
+        finally:
+            ticker_task.cancel()
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    # The listing ran on the datamodel thread pool, the loop kept ticking
+    assert max_gap < 0.25
+
+
 def test_model_provider_from_string():
     assert model_provider_from_string("openai") == ModelProviderName.openai
     assert model_provider_from_string("ollama") == ModelProviderName.ollama
@@ -0,0 +1,151 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from kiln_ai.utils.file_lock import FileLock, FileLockTimeout, lock_path_for_key
+
+from kiln_server.run_lock import KeyedLock
+
+
+async def record_hold(locks: KeyedLock, key: str, events: list, name: str):
+    async with locks.hold(key):
+        events.append(f"{name} start")
+        await asyncio.sleep(0.02)
+        events.append(f"{name} end")
+
+
+@pytest.mark.asyncio
+async def test_same_key_serialized():
+    locks = KeyedLock()
+    events: list[str] = []
+    await asyncio.gather(
+        record_hold(locks, "run_a", events, "1"),
+        record_hold(locks, "run_a", events, "2"),
+    )
+    assert events == ["1 start", "1 end", "2 start", "2 end"]
+    # Dropped once unused
+    assert locks.active_keys() == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_concurrent():
+    locks = KeyedLock()
+    events: list[str] = []
+    await asyncio.gather(
+        record_hold(locks, "run_a", events, "1"),
+        record_hold(locks, "run_b", events, "2"),
+    )
+    assert events[:2] == ["1 start", "2 start"]
+    assert locks.active_keys() == 0
+
+
+@pytest.mark.asyncio
+async def test_released_on_error():
+    locks = KeyedLock()
+    with pytest.raises(ValueError):
+        async with locks.hold("run_a"):
+            raise ValueError("update failed")
+    assert locks.active_keys() == 0
+    async with locks.hold("run_a"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_holds_file_lock():
+    locks = KeyedLock()
+    other_process = FileLock(lock_path_for_key("run_a"))
+    async with locks.hold("run_a"):
+        assert other_process.acquire(blocking=False) is False
+    assert other_process.acquire(blocking=False) is True
+    other_process.release()
+
+    # Not taken when cross process locking is off
+    async with KeyedLock(cross_process=False).hold("run_a"):
+        assert other_process.acquire(blocking=False) is True
+        other_process.release()
+
+
+@pytest.mark.asyncio
+async def test_waits_for_file_lock_without_blocking_loop():
+    locks = KeyedLock()
+    other_process = FileLock(lock_path_for_key("run_a"))
+    other_process.acquire()
+    events: list[str] = []
+
+    async def release_later():
+        await asyncio.sleep(0.05)
+        events.append("released")
+        other_process.release()
+
+    async def hold():
+        async with locks.hold("run_a"):
+            events.append("held")
+
+    await asyncio.gather(hold(), release_later())
+    assert events == ["released", "held"]
+
+
+@pytest.mark.asyncio
+async def test_file_lock_timeout():
+    locks = KeyedLock()
+    other_process = FileLock(lock_path_for_key("run_a"))
+    with other_process, patch("kiln_server.run_lock.FILE_LOCK_TIMEOUT", 0.05):
+        with pytest.raises(FileLockTimeout):
+            async with locks.hold("run_a"):
+                pass
+    assert locks.active_keys() == 0
+
+
+@pytest.mark.asyncio
+async def test_keys_sharing_a_lock_file():
+    # Lock files are striped, so some keys share one. Holders of those keys take turns, without deadlocking.
+    first_path = lock_path_for_key("run_0")
+    other_key = next(
+        key
+        for key in (f"run_{i}" for i in range(1, 10_000))
+        if lock_path_for_key(key) == first_path
+    )
+    locks = KeyedLock()
+    events: list[str] = []
+
+    async def hold(key: str):
+        async with locks.hold(key):
+            events.append(f"start {key}")
+            await asyncio.sleep(0.02)
+            events.append(f"end {key}")
+
+    await asyncio.gather(hold("run_0"), hold(other_key))
+    assert events == [
+        "start run_0",
+        "end run_0",
+        f"start {other_key}",
+        f"end {other_key}",
+    ]
+    assert locks.active_keys() == 0
+
+
+@pytest.mark.asyncio
+async def test_hold_many():
+    first_path = lock_path_for_key("run_0")
+    shared_key = next(
+        key
+        for key in (f"run_{i}" for i in range(1, 10_000))
+        if lock_path_for_key(key) == first_path
+    )
+    locks = KeyedLock()
+    events: list[str] = []
+    other_process = FileLock(first_path)
+
+    async def hold_many():
+        # Two keys sharing a lock file: taken once, not deadlocked on itself
+        async with locks.hold_many(["run_0", shared_key, "run_0"]):
+            assert other_process.acquire(blocking=False) is False
+            events.append("many start")
+            await asyncio.sleep(0.02)
+            events.append("many end")
+
+    await asyncio.gather(hold_many(), record_hold(locks, shared_key, events, "one"))
+    assert events == ["many start", "many end", "one start", "one end"]
+    assert locks.active_keys() == 0
+    assert other_process.acquire(blocking=False) is True
+    other_process.release()
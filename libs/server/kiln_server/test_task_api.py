@@ -213,6 +213,23 @@ def test_task_from_id_success(project_and_task):
     assert result.description == "This is a test task"
 
 
+def test_task_from_id_remembers_task_path(project_and_task):
+    project, task = project_and_task
+
+    with patch("kiln_server.task_api.project_from_id") as mock_project_from_id:
+        mock_project_from_id.return_value = project
+        assert task_from_id("remembered-project-id", task.id).id == task.id
+        assert task_from_id("remembered-project-id", task.id).id == task.id
+        # Second lookup goes straight to the task file
+        mock_project_from_id.assert_called_once_with("remembered-project-id")
+
+        # Deleted: back to a lookup through the project
+        task.delete()
+        with pytest.raises(HTTPException):
+            task_from_id("remembered-project-id", task.id)
+        assert mock_project_from_id.call_count == 2
+
+
 def test_task_from_id_not_found(project_and_task):
     project, _ = project_and_task
 